@@ -0,0 +1,168 @@
+"""Disk-backed LRU cache of entry audio.
+
+An entry's audio never changes, but the player used to fetch it from Core on
+every play and every seek. The first full download of an entry's audio is
+now written to disk as it streams to the browser, and later requests
+(including Range requests) are served from that file.
+
+Design Decisions:
+1. TEE ON MISS: A full download from Core is written to a temp file chunk by
+   chunk while it is sent to the client. The file joins the cache only if
+   the stream completes (and matches Content-Length when Core sent one); a
+   client that disconnects halfway leaves nothing behind.
+2. SESSION-SCOPED KEYS: Files are keyed by (session_id, entry_id). The
+   session's access to the entry was checked by Core when the file was
+   fetched, and no session can ever be served another session's copy.
+3. LRU BY BYTES: The cache is bounded by total file size, evicting the least
+   recently served files first. Files larger than a quarter of the budget
+   aren't cached so one recording can't flush everything else.
+4. PER-PROCESS DIRECTORY: Each cache instance works in its own fresh
+   directory under AUDIO_CACHE_DIR, removed on shutdown, so workers never
+   share or clobber each other's files and the in-memory index is always
+   complete.
+5. FILE RESPONSES: Hits are served with FileResponse, which handles single
+   and multi-range requests and If-Range itself.
+"""
+
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+
+from app.utils.logger import get_logger
+
+logger = get_logger("audio_cache")
+
+
+@dataclass
+class CachedAudio:
+    """An entry's audio file on disk, with the headers to serve it."""
+
+    path: Path
+    size: int
+    content_type: str
+    headers: dict[str, str]  # Content-Disposition, ETag, Last-Modified as sent by Core
+
+
+class AudioCache:
+    """Size-bounded LRU of entry audio files, keyed by (session_id, entry_id)."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_bytes // 4
+        self.total_bytes = 0
+        self._files: OrderedDict[tuple[str, str], CachedAudio] = OrderedDict()
+        self._filling: set[tuple[str, str]] = set()
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.directory = Path(tempfile.mkdtemp(prefix="audio-", dir=directory))
+
+    def get(self, session_id: str, entry_id: str) -> Optional[CachedAudio]:
+        """Return the cached file and mark it recently used, or None."""
+        key = (session_id, entry_id)
+        cached = self._files.get(key)
+        if cached is None:
+            return None
+        if not cached.path.exists():
+            self._drop(key)
+            return None
+        self._files.move_to_end(key)
+        return cached
+
+    def can_fill(self, session_id: str, entry_id: str, size: Optional[int]) -> bool:
+        """Whether a full download of this size should be teed into the cache."""
+        if self.max_bytes <= 0 or (session_id, entry_id) in self._filling:
+            return False
+        return size is None or size <= self.max_file_bytes
+
+    async def fill(
+        self,
+        session_id: str,
+        entry_id: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str,
+        headers: dict[str, str],
+        expected_size: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        """Pass chunks through while writing them to the cache.
+
+        The file is added to the cache only when the stream is consumed to
+        the end with the expected size.
+        """
+        key = (session_id, entry_id)
+        self._filling.add(key)
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        size = 0
+        complete = False
+        try:
+            with os.fdopen(fd, "wb") as file:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_file_bytes:
+                        break  # Core sent more than it announced; stop caching
+                    await asyncio.to_thread(file.write, chunk)
+                    yield chunk
+                else:
+                    complete = expected_size is None or size == expected_size
+            if size > self.max_file_bytes:
+                # Keep serving the client, just without caching
+                yield chunk
+                async for chunk in chunks:
+                    yield chunk
+        finally:
+            self._filling.discard(key)
+            if complete:
+                self._store(key, Path(temp_name), size, content_type, headers)
+            else:
+                Path(temp_name).unlink(missing_ok=True)
+
+    def invalidate(self, session_id: str, entry_id: str) -> None:
+        """Drop an entry's cached audio (e.g. when the entry is deleted)."""
+        self._drop((session_id, entry_id))
+
+    def close(self) -> None:
+        """Remove the cache directory (app shutdown)."""
+        self._files.clear()
+        self.total_bytes = 0
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _store(
+        self,
+        key: tuple[str, str],
+        temp_path: Path,
+        size: int,
+        content_type: str,
+        headers: dict[str, str],
+    ) -> None:
+        self._drop(key)
+        name = hashlib.blake2b(f"{key[0]}/{key[1]}".encode(), digest_size=16).hexdigest()
+        path = temp_path.rename(self.directory / name)
+        self._files[key] = CachedAudio(path, size, content_type, headers)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and self._files:
+            oldest = next(iter(self._files))
+            self._drop(oldest)
+        logger.debug("Cached entry audio", entry_id=key[1], size=size, total_bytes=self.total_bytes)
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        cached = self._files.pop(key, None)
+        if cached is not None:
+            self.total_bytes -= cached.size
+            cached.path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+def get_audio_cache(request: Request) -> AudioCache:
+    """FastAPI dependency to get the app's AudioCache.
+
+    Created at app startup and stored in app.state.
+    """
+    return request.app.state.audio_cache
@@ -27,6 +27,25 @@ class Settings(BaseSettings):
 
     # Audio validation
     MAX_AUDIO_DURATION_SECONDS: int = 180  # 3 minutes
+    MAX_UPLOAD_BYTES: int = 50 * 1024 * 1024  # 50 MiB, enforced while the upload streams in
+    UPLOAD_STREAM_THROUGH_ENABLED: bool = False  # Forward the file to Core while it is still arriving
+    UPLOAD_DEDUP_ENABLED: bool = True  # Re-uploads of the same file + options reuse the existing jobs
+    AUDIO_PROBE_CONCURRENCY: int = 4  # mutagen worker threads
+    AUDIO_PROBE_TIMEOUT_SECONDS: float = 5.0  # Slower probes count as unknown duration
+    AUDIO_PROBE_PROCESSES: int = 0  # >0 runs mutagen in a process pool instead of threads
+    AUDIO_PROBE_QUEUE_SIZE: int = 32  # Probes waiting for a worker process; more are allowed through
+    AUDIO_PROBE_MAX_TASKS_PER_WORKER: int = 100  # Worker processes are recycled after this many probes
+
+    # Re-encode large WAV/FLAC/WebM uploads to mono 16 kHz Opus with ffmpeg before forwarding
+    AUDIO_TRANSCODE_ENABLED: bool = False
+    AUDIO_TRANSCODE_FFMPEG: str = "ffmpeg"  # Executable name or path
+    AUDIO_TRANSCODE_CONCURRENCY: int = 2  # ffmpeg processes; busier uploads are forwarded as-is
+    AUDIO_TRANSCODE_BITRATE: str = "24k"
+    AUDIO_TRANSCODE_MIN_BYTES: int = 256 * 1024
+
+    # Entry audio cache (GET /api/entries/{id}/audio), 0 bytes disables it
+    AUDIO_CACHE_DIR: str = "./data/audio-cache"
+    AUDIO_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
 
     # Cloudflare Turnstile (CAPTCHA)
     TURNSTILE_ENABLED: bool = False  # Default False for local dev
@@ -37,6 +56,42 @@ class Settings(BaseSettings):
     # CORS origins (comma-separated list)
     CORS_ORIGINS: str = "http://localhost:3000,http://127.0.0.1:3000"
 
+    # Hedged Core API GETs: resend a GET that outlives the observed p95 for its
+    # endpoint and take whichever response arrives first (off by default)
+    CORE_HEDGE_ENABLED: bool = False
+    CORE_HEDGE_PERCENTILE: float = 95.0
+    CORE_HEDGE_MAX_RATIO: float = 0.05  # Max extra load on Core from hedges
+    CORE_HEDGE_MIN_SAMPLES: int = 50  # Observations needed before hedging an endpoint
+
+    # Entry view composition - per-branch timeout for the optional parts
+    # (transcription, cleanup, analyses) of GET /api/entries/{id}
+    ENTRY_VIEW_BRANCH_TIMEOUT_SECONDS: float = 10.0
+    # Cache of composed views whose jobs have all finished (0 disables)
+    ENTRY_VIEW_CACHE_MAX_ENTRIES: int = 1000
+    ENTRY_VIEW_CACHE_TTL_SECONDS: float = 3600.0
+    # Max concurrent Core calls when expanding a page of GET /api/entries?expand=...
+    ENTRIES_EXPAND_CONCURRENCY: int = 8
+
+    # POST /api/batch limits
+    BATCH_MAX_ITEMS: int = 20
+    BATCH_MAX_RESPONSE_BYTES: int = 5 * 1024 * 1024  # 5 MiB of item bodies
+
+    # Job status push (GET /api/jobs/stream): server-side Core polling
+    JOB_POLL_MIN_INTERVAL_SECONDS: float = 0.5
+    JOB_POLL_MAX_INTERVAL_SECONDS: float = 5.0
+    JOB_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    JOB_STREAM_MAX_SECONDS: float = 600.0  # Clients reconnect with Last-Event-ID
+    # Long-poll (?wait=N on transcription, cleanup and analysis GETs)
+    LONG_POLL_MAX_WAIT_SECONDS: float = 30.0
+    LONG_POLL_MAX_HELD: int = 200  # Beyond this, ?wait returns immediately
+    # Retry-After / X-Poll-After hints on non-terminal job GETs
+    JOB_POLL_HINT_MIN_SECONDS: float = 1.0
+    JOB_POLL_HINT_MAX_SECONDS: float = 15.0
+
+    # Metrics - /metrics/core requires "Authorization: Bearer <token>". Without
+    # a token it is disabled (404), except in development
+    METRICS_TOKEN: str = ""
+
     # Analytics (PostHog) - served via /api/config for runtime configuration
     POSTHOG_KEY: str = ""
     POSTHOG_HOST: str = "/ingest"
@@ -1,11 +1,13 @@
 """HTTP client for Core API communication."""
 
+import asyncio
 import time
-from typing import Any
+from typing import Any, Hashable, Optional
 
 import httpx
 from fastapi import HTTPException, Request
 
+from app.metrics import CoreMetrics
 from app.utils.logger import get_logger
 
 logger = get_logger("core_client")
@@ -20,11 +22,82 @@ class CoreAPIError(Exception):
         super().__init__(detail)
 
 
+class HedgeBudget:
+    """Token bucket limiting hedged requests to a fraction of eligible GETs.
+
+    Every eligible GET earns `ratio` tokens (capped at `burst`); sending a
+    hedge spends one. With ratio=0.05 hedging adds at most ~5% extra load
+    to Core over time, no matter how slow Core gets.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = 0.0
+
+    def earn(self) -> None:
+        """Credit one eligible request."""
+        self.tokens = min(self.tokens + self.ratio, self.burst)
+
+    def try_spend(self) -> bool:
+        """Spend a token for a hedge if one is available."""
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
 class CoreAPIClient:
-    """Async HTTP client for Core API."""
+    """Async HTTP client for Core API.
+
+    Design Decision: Single-flight GETs
+    -----------------------------------
+    Several tabs, React double effects and the composite get_entry endpoint
+    often issue the same GET for the same session at the same moment. While
+    one such request is in flight, identical GETs (same method, path, params
+    and access token) wait for it and receive the same response instead of
+    hitting Core again. Nothing is cached after the upstream call completes,
+    so freshness is unchanged. Including the token in the key keeps responses
+    from ever being shared across sessions.
+
+    Design Decision: One instrumented send path
+    -------------------------------------------
+    Every upstream call (auth, proxied requests, uploads, audio streams) goes
+    through _send, which records monotonic latency, status class, bytes in/out
+    and connection pool wait per path template in self.metrics. Routes should
+    use request()/stream() rather than self.client directly so nothing escapes
+    the metrics.
+
+    Design Decision: Optional hedged GETs
+    -------------------------------------
+    When hedging is enabled, a GET that has had no response within the observed
+    p95 (hedge_percentile) for its path template gets a second, identical
+    request; whichever answers first wins and the other is cancelled. Hedging
+    only starts once a template has hedge_min_samples observations, and a
+    HedgeBudget caps hedges at hedge_max_ratio of eligible GETs so a slow Core
+    is never hit with double load. The cancelled attempt is still recorded
+    (status "cancelled", with its elapsed time), otherwise every hedge win
+    would drop a slow sample and drag down the p95 that triggers hedging.
+    """
 
-    def __init__(self, base_url: str, timeout: float = 60.0):
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 60.0,
+        coalesce_gets: bool = True,
+        hedge_gets: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_max_ratio: float = 0.05,
+        hedge_min_samples: int = 50,
+    ):
         self.base_url = base_url
+        self.coalesce_gets = coalesce_gets
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.metrics = CoreMetrics()
+        self.hedge_gets = hedge_gets
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_budget = HedgeBudget(ratio=hedge_max_ratio)
         # Increase connection pool to handle concurrent requests during high load
         # Default is 100 max connections, which can exhaust quickly under parallel tests
         limits = httpx.Limits(max_connections=500, max_keepalive_connections=50)
@@ -47,23 +120,17 @@ class CoreAPIClient:
         Raises:
             CoreAPIError: If registration fails
         """
-        try:
-            response = await self.client.post(
-                "/api/v1/auth/register",
-                json={"email": email, "password": password},
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise CoreAPIError(
-                status_code=e.response.status_code,
-                detail=e.response.text,
-            ) from e
-        except httpx.RequestError as e:
+        response = await self._send(
+            "POST",
+            "/api/v1/auth/register",
+            json={"email": email, "password": password},
+        )
+        if not response.is_success:
             raise CoreAPIError(
-                status_code=503,
-                detail=f"Core API connection error: {e}",
-            ) from e
+                status_code=response.status_code,
+                detail=response.text,
+            )
+        return response.json()
 
     async def login(self, email: str, password: str) -> dict[str, Any]:
         """Login to Core API.
@@ -78,23 +145,17 @@ class CoreAPIClient:
         Raises:
             CoreAPIError: If login fails
         """
-        try:
-            response = await self.client.post(
-                "/api/v1/auth/login",
-                json={"email": email, "password": password},
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise CoreAPIError(
-                status_code=e.response.status_code,
-                detail=e.response.text,
-            ) from e
-        except httpx.RequestError as e:
+        response = await self._send(
+            "POST",
+            "/api/v1/auth/login",
+            json={"email": email, "password": password},
+        )
+        if not response.is_success:
             raise CoreAPIError(
-                status_code=503,
-                detail=f"Core API connection error: {e}",
-            ) from e
+                status_code=response.status_code,
+                detail=response.text,
+            )
+        return response.json()
 
     async def refresh(self, refresh_token: str) -> dict[str, Any]:
         """Refresh access token using refresh token.
@@ -108,29 +169,23 @@ class CoreAPIClient:
         Raises:
             CoreAPIError: If refresh fails
         """
-        try:
-            response = await self.client.post(
-                "/api/v1/auth/refresh",
-                json={"refresh_token": refresh_token},
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise CoreAPIError(
-                status_code=e.response.status_code,
-                detail=e.response.text,
-            ) from e
-        except httpx.RequestError as e:
+        response = await self._send(
+            "POST",
+            "/api/v1/auth/refresh",
+            json={"refresh_token": refresh_token},
+        )
+        if not response.is_success:
             raise CoreAPIError(
-                status_code=503,
-                detail=f"Core API connection error: {e}",
-            ) from e
+                status_code=response.status_code,
+                detail=response.text,
+            )
+        return response.json()
 
     async def request(
         self,
         method: str,
         path: str,
-        access_token: str,
+        access_token: Optional[str],
         **kwargs: Any,
     ) -> httpx.Response:
         """Make an authenticated request to Core API.
@@ -138,44 +193,191 @@ class CoreAPIClient:
         Args:
             method: HTTP method (GET, POST, PUT, DELETE, etc.)
             path: API path (e.g., /api/v1/entries)
-            access_token: Valid access token for authentication
+            access_token: Valid access token for authentication, or None for
+                public endpoints such as /api/v1/options
             **kwargs: Additional arguments passed to httpx.request
 
         Returns:
-            httpx.Response object
+            httpx.Response object. Coalesced GETs return the same, fully read
+            response object to every caller, so treat it as read-only.
 
         Raises:
             CoreAPIError: If request fails
         """
         headers = kwargs.pop("headers", {})
+        if access_token is not None:
+            headers["Authorization"] = f"Bearer {access_token}"
+
+        send = self._send_hedged if self.hedge_gets and method.upper() == "GET" else self._send
+
+        key = self._coalesce_key(method, path, access_token, headers, kwargs)
+        if key is None:
+            return await send(method, path, headers=headers, **kwargs)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(send(method, path, headers=headers, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget_inflight(key, t))
+        else:
+            logger.debug("Core API request coalesced", method=method, path=path)
+
+        # Shield the shared upstream call so one caller disconnecting does not
+        # cancel the request for everyone else waiting on it.
+        return await asyncio.shield(task)
+
+    def _coalesce_key(
+        self,
+        method: str,
+        path: str,
+        access_token: Optional[str],
+        headers: dict[str, str],
+        kwargs: dict[str, Any],
+    ) -> Hashable | None:
+        """Build the single-flight key for a request, or None if it must not be shared.
+
+        Only plain GETs are coalesced; anything carrying a body, extra headers
+        or streaming options always gets its own upstream call.
+        """
+        if not self.coalesce_gets or method.upper() != "GET":
+            return None
+        if set(kwargs) - {"params"} or set(headers) - {"Authorization"}:
+            return None
+
+        params = kwargs.get("params") or {}
+        if not isinstance(params, dict):
+            return None
+        return (
+            "GET",
+            path,
+            tuple(sorted((str(k), str(v)) for k, v in params.items())),
+            access_token,
+        )
+
+    def _forget_inflight(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a finished single-flight task so the next GET goes upstream."""
+        self._inflight.pop(key, None)
+        # Mark the exception as retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        access_token: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Open a streaming authenticated request to Core API.
+
+        The response body is not read. The caller must close it with
+        `await response.aclose()` once the body has been consumed.
+
+        Args:
+            method: HTTP method
+            path: API path (e.g., /api/v1/entries/{id}/audio)
+            access_token: Valid access token for authentication
+            **kwargs: Additional arguments passed to httpx.build_request
+
+        Returns:
+            httpx.Response with an unread body stream
+
+        Raises:
+            CoreAPIError: If the connection fails
+        """
+        headers = kwargs.pop("headers", {})
         headers["Authorization"] = f"Bearer {access_token}"
+        return await self._send(method, path, stream=True, headers=headers, **kwargs)
+
+    async def _send_hedged(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """Send an idempotent request, hedging it if it outlives the observed p95."""
+        self.hedge_budget.earn()
+        delay = self.metrics.latency_percentile(
+            method,
+            path,
+            self.hedge_percentile,
+            min_count=self.hedge_min_samples,
+        )
+        if delay is None:
+            return await self._send(method, path, **kwargs)
 
-        start_time = time.time()
+        primary = asyncio.ensure_future(self._send(method, path, **kwargs))
         try:
-            response = await self.client.request(
-                method,
-                path,
-                headers=headers,
-                **kwargs,
-            )
-            duration_ms = (time.time() - start_time) * 1000
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            # The caller gave up; stop the attempt and let it record its sample
+            primary.cancel()
+            await asyncio.wait({primary})
+            raise
+        if done or not self.hedge_budget.try_spend():
+            return await primary
+
+        logger.debug("Hedging Core API request", method=method, path=path, delay_ms=f"{delay * 1000:.1f}")
+        self.metrics.increment("hedged_requests")
+        hedge = asyncio.ensure_future(self._send(method, path, **kwargs))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.metrics.increment("hedge_wins")
+                        return task.result()
+            # Both attempts failed - surface the original request's error
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                # Let the losers record their elapsed time before returning
+                await asyncio.wait(pending)
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request to Core API, recording metrics and logging the outcome.
 
-            logger.info(
-                "Core API request",
-                method=method,
-                path=path,
-                status=response.status_code,
-                duration_ms=f"{duration_ms:.1f}",
-            )
+        Latency is measured with a monotonic clock up to the response headers
+        (and the full body unless streaming). Pool wait is the time until
+        httpcore reports a connection being opened or reused, taken from the
+        httpx "trace" extension; it is unknown for mocked transports.
+        """
+        start_time = time.monotonic()
+        connection_acquired_at: list[float] = []
+
+        async def trace(event_name: str, info: dict) -> None:
+            if not connection_acquired_at and event_name.endswith(
+                ("connect_tcp.started", "connect_unix_socket.started", "send_request_headers.started")
+            ):
+                connection_acquired_at.append(time.monotonic())
+
+        request = self.client.build_request(
+            method,
+            path,
+            extensions={"trace": trace},
+            **kwargs,
+        )
+        bytes_out = int(request.headers.get("content-length", 0))
 
-            return response
+        try:
+            response = await self.client.send(request, stream=stream)
+        except asyncio.CancelledError:
+            duration = time.monotonic() - start_time
+            self.metrics.record(method, path, None, duration, bytes_out=bytes_out, cancelled=True)
+            raise
         except httpx.RequestError as e:
-            duration_ms = (time.time() - start_time) * 1000
+            duration = time.monotonic() - start_time
+            self.metrics.record(method, path, None, duration, bytes_out=bytes_out)
             logger.error(
                 "Core API connection error",
                 method=method,
                 path=path,
-                duration_ms=f"{duration_ms:.1f}",
+                duration_ms=f"{duration * 1000:.1f}",
                 error=str(e),
             )
             raise CoreAPIError(
@@ -183,6 +385,32 @@ class CoreAPIClient:
                 detail=f"Core API connection error: {e}",
             ) from e
 
+        duration = time.monotonic() - start_time
+        if stream:
+            bytes_in = int(response.headers.get("content-length", 0))
+        else:
+            bytes_in = len(response.content)
+        pool_wait = connection_acquired_at[0] - start_time if connection_acquired_at else None
+
+        self.metrics.record(
+            method,
+            path,
+            response.status_code,
+            duration,
+            bytes_in=bytes_in,
+            bytes_out=bytes_out,
+            pool_wait=pool_wait,
+        )
+        logger.info(
+            "Core API request",
+            method=method,
+            path=path,
+            status=response.status_code,
+            duration_ms=f"{duration * 1000:.1f}",
+        )
+
+        return response
+
     async def close(self) -> None:
         """Close the HTTP client."""
         await self.client.aclose()
@@ -0,0 +1,177 @@
+"""In-memory cache of composed entry views.
+
+Design Decisions:
+1. CACHE ONLY SETTLED VIEWS: A view is cached only when the transcription,
+   the cleanup, and every analysis are in a terminal state (completed,
+   failed or error) and no branch was degraded. Anything still processing changes on
+   its own inside Core, so it is always rebuilt.
+2. TARGETED INVALIDATION: Settled views only change through the wrapper's own
+   write endpoints (user edits, reverts, new cleanups, new analyses, deletes),
+   which drop the affected entry's view by entry, transcription, or cleanup ID.
+   Writes are rare next to reads, so invalidation scans the cache rather than
+   maintaining reverse indexes.
+3. BOUNDED AND PER-PROCESS: LRU-bounded with a TTL as a safety net for changes
+   made outside the wrapper. Each worker keeps its own cache; a cold worker
+   just rebuilds the view from Core.
+4. NO STALE WRITE-BACKS: A write can land while get_entry is still
+   composing a view from Core's earlier state. Invalidations are stamped
+   with a generation number; get_entry reads generation() before it builds,
+   and put() discards the view if the entry (or, for an invalidation by
+   transcription/cleanup ID that matched no cached view, the session) was
+   invalidated since.
+5. BYTES + ETAG: Views are stored as the encoded JSON body plus a strong ETag,
+   so a hit costs no encoding and browsers can revalidate with If-None-Match.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+
+from app.jobs import TERMINAL_STATUSES
+
+
+@dataclass
+class CachedEntryView:
+    """A composed entry view ready to serve."""
+
+    body: bytes
+    etag: str
+    transcription_id: Optional[str]
+    cleanup_id: Optional[str]
+    stored_at: float
+
+
+def is_settled(entry_data: dict) -> bool:
+    """Whether a composed entry view can no longer change on its own."""
+    if entry_data.get("degraded"):
+        return False
+
+    transcription = entry_data.get("primary_transcription") or {}
+    cleanup = entry_data.get("cleanup")
+    if transcription.get("status") not in TERMINAL_STATUSES or not cleanup:
+        return False
+    if cleanup.get("status") not in TERMINAL_STATUSES:
+        return False
+    return all(a.get("status") in TERMINAL_STATUSES for a in entry_data.get("analyses", []))
+
+
+class EntryViewCache:
+    """LRU cache of settled entry views keyed by (session_id, entry_id)."""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._views: OrderedDict[tuple[str, str], CachedEntryView] = OrderedDict()
+        self._generation = 0
+        # (session_id, entry_id or None for the whole session) -> generation
+        # of its last invalidation; bounded, dropped stamps raise _forgotten
+        self._invalidated: OrderedDict[tuple[str, Optional[str]], int] = OrderedDict()
+        self._forgotten = 0
+
+    def get(self, session_id: str, entry_id: str) -> Optional[CachedEntryView]:
+        """Return a fresh cached view, or None."""
+        key = (session_id, entry_id)
+        view = self._views.get(key)
+        if view is None:
+            return None
+        if time.monotonic() - view.stored_at > self.ttl_seconds:
+            del self._views[key]
+            return None
+        self._views.move_to_end(key)
+        return view
+
+    def generation(self) -> int:
+        """Current generation; read before building a view and pass it to put()."""
+        return self._generation
+
+    def put(
+        self,
+        session_id: str,
+        entry_id: str,
+        entry_data: dict,
+        body: bytes,
+        etag: str,
+        generation: int,
+    ) -> None:
+        """Cache a view if it is settled; otherwise drop any stale copy.
+
+        Views built from `generation` are discarded if the entry was
+        invalidated after it.
+        """
+        key = (session_id, entry_id)
+        if self.max_entries <= 0 or not is_settled(entry_data):
+            self._views.pop(key, None)
+            return
+        if self._invalidated_since(session_id, entry_id, generation):
+            return
+
+        self._views[key] = CachedEntryView(
+            body=body,
+            etag=etag,
+            transcription_id=(entry_data.get("primary_transcription") or {}).get("id"),
+            cleanup_id=(entry_data.get("cleanup") or {}).get("id"),
+            stored_at=time.monotonic(),
+        )
+        self._views.move_to_end(key)
+        while len(self._views) > self.max_entries:
+            self._views.popitem(last=False)
+
+    def invalidate(
+        self,
+        session_id: str,
+        entry_id: Optional[str] = None,
+        transcription_id: Optional[str] = None,
+        cleanup_id: Optional[str] = None,
+    ) -> None:
+        """Drop the session's views matching any of the given IDs."""
+        stale = [
+            key
+            for key, view in self._views.items()
+            if key[0] == session_id
+            and (
+                (entry_id is not None and key[1] == entry_id)
+                or (transcription_id is not None and view.transcription_id == transcription_id)
+                or (cleanup_id is not None and view.cleanup_id == cleanup_id)
+            )
+        ]
+        for key in stale:
+            del self._views[key]
+
+        entries = {key[1] for key in stale}
+        if entry_id is not None:
+            entries.add(entry_id)
+        if not entries:
+            entries.add(None)  # A view for these IDs may be mid-build; we can't tell which entry
+        for entry in entries:
+            self._stamp(session_id, entry)
+
+    def _stamp(self, session_id: str, entry_id: Optional[str]) -> None:
+        self._generation += 1
+        key = (session_id, entry_id)
+        self._invalidated[key] = self._generation
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > max(self.max_entries, 1):
+            _, stamp = self._invalidated.popitem(last=False)
+            self._forgotten = max(self._forgotten, stamp)
+
+    def _invalidated_since(self, session_id: str, entry_id: str, generation: int) -> bool:
+        last = max(
+            self._invalidated.get((session_id, entry_id), 0),
+            self._invalidated.get((session_id, None), 0),
+            self._forgotten,
+        )
+        return last > generation
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+
+def get_entry_cache(request: Request) -> EntryViewCache:
+    """FastAPI dependency to get the app's EntryViewCache.
+
+    Created at app startup and stored in app.state.
+    """
+    return request.app.state.entry_cache
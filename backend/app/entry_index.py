@@ -0,0 +1,120 @@
+"""Per-session index of entry -> transcription and latest cleanup IDs.
+
+Core's entry endpoint doesn't say which cleaned entry is the latest one for
+an entry; only the entries list does. Instead of fetching and scanning that
+list on every entry view, the wrapper records the IDs it sees in responses it
+already proxies:
+
+- POST /api/transcribe           entry_id, transcription_id, cleanup_id
+- GET /api/entries               every listed entry and its latest cleanup
+- POST .../cleanup               the new cleanup for the transcription's entry
+- GET /api/entries/{id}          the entry's primary transcription
+
+Writes are SQLite upserts that never clear a known ID, so a payload without
+cleanup info (e.g. a list fetched before cleanup started) can't erase one.
+"""
+
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session as DBSession
+
+from app.models import EntryIndex
+
+
+def _upsert(db: DBSession, session_id: str, rows: list[dict[str, Any]]) -> None:
+    """Insert or update index rows, keeping existing IDs where a row has None."""
+    if not rows:
+        return
+
+    now = datetime.utcnow()
+    stmt = insert(EntryIndex).values([
+        {
+            "session_id": session_id,
+            "entry_id": row["entry_id"],
+            "transcription_id": row.get("transcription_id"),
+            "latest_cleanup_id": row.get("latest_cleanup_id"),
+            "updated_at": now,
+        }
+        for row in rows
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EntryIndex.session_id, EntryIndex.entry_id],
+        set_={
+            "transcription_id": func.coalesce(stmt.excluded.transcription_id, EntryIndex.transcription_id),
+            "latest_cleanup_id": func.coalesce(stmt.excluded.latest_cleanup_id, EntryIndex.latest_cleanup_id),
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+    db.commit()
+
+
+def record_entry(
+    db: DBSession,
+    session_id: str,
+    entry_id: str,
+    transcription_id: Optional[str] = None,
+    cleanup_id: Optional[str] = None,
+) -> None:
+    """Record what we know about one entry."""
+    _upsert(db, session_id, [{
+        "entry_id": str(entry_id),
+        "transcription_id": str(transcription_id) if transcription_id else None,
+        "latest_cleanup_id": str(cleanup_id) if cleanup_id else None,
+    }])
+
+
+def record_entries(db: DBSession, session_id: str, entries: Iterable[dict]) -> None:
+    """Record every entry in a Core entries-list page."""
+    rows = []
+    for entry in entries:
+        if not entry.get("id"):
+            continue
+        transcription = entry.get("primary_transcription") or {}
+        latest_cleaned = entry.get("latest_cleaned_entry") or {}
+        rows.append({
+            "entry_id": str(entry["id"]),
+            "transcription_id": str(transcription["id"]) if transcription.get("id") else None,
+            "latest_cleanup_id": str(latest_cleaned["id"]) if latest_cleaned.get("id") else None,
+        })
+    _upsert(db, session_id, rows)
+
+
+def record_cleanup(db: DBSession, session_id: str, transcription_id: str, cleanup: dict) -> None:
+    """Record a newly triggered cleanup as its entry's latest.
+
+    Uses the cleanup's voice_entry_id when Core includes it, otherwise the
+    entry already indexed for the transcription.
+    """
+    cleanup_id = cleanup.get("id")
+    entry_id = cleanup.get("voice_entry_id") or entry_id_for_transcription(db, session_id, transcription_id)
+    if cleanup_id and entry_id:
+        record_entry(db, session_id, entry_id, transcription_id=transcription_id, cleanup_id=cleanup_id)
+
+
+def lookup_cleanup_id(db: DBSession, session_id: str, entry_id: str) -> Optional[str]:
+    """Latest cleanup ID for an entry, or None if unknown."""
+    row = db.get(EntryIndex, (session_id, entry_id))
+    return row.latest_cleanup_id if row else None
+
+
+def entry_id_for_transcription(db: DBSession, session_id: str, transcription_id: str) -> Optional[str]:
+    """Entry ID that owns a transcription, or None if unknown."""
+    row = (
+        db.query(EntryIndex)
+        .filter(EntryIndex.session_id == session_id, EntryIndex.transcription_id == transcription_id)
+        .first()
+    )
+    return row.entry_id if row else None
+
+
+def forget_entry(db: DBSession, session_id: str, entry_id: str) -> None:
+    """Drop a deleted entry from the index."""
+    db.query(EntryIndex).filter(
+        EntryIndex.session_id == session_id,
+        EntryIndex.entry_id == entry_id,
+    ).delete()
+    db.commit()
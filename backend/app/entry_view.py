@@ -0,0 +1,267 @@
+"""Composition of the full entry view from several Core API calls.
+
+Core's GET /entries/{id} returns entry metadata and a transcription summary,
+but not segments, cleanup, or analyses. The wrapper composes the full view
+from up to five Core calls.
+
+Design Decision: Dependency-aware fan-out
+-----------------------------------------
+The calls form two independent chains:
+
+    entry ─────────────────────> transcription
+    entry index / entries list ──> cleanup_id ──> cleanup
+                                              └─> analyses
+
+Both chains start immediately, and siblings within a chain run concurrently,
+so the view costs about two Core round trips instead of five. The cleanup_id
+normally comes from the per-session entry index (app/entry_index.py) with no
+Core call at all; the entries list is only paged through on an index miss.
+
+Design Decision: Partial-result degradation
+-------------------------------------------
+Only the entry itself is required - its errors propagate to the client as
+before. Every other branch runs under its own timeout; a branch that times
+out, fails to connect, or gets a 5xx from Core is logged, left empty, and
+named in the response's "degraded" list so the frontend can retry later
+instead of showing a spinner until the slowest call finishes.
+"""
+
+import asyncio
+from contextlib import nullcontext
+from typing import Any, Awaitable, Iterable, Optional
+
+from sqlalchemy.orm import Session as DBSession
+
+from app.core_client import CoreAPIClient, CoreAPIError
+from app.entry_index import lookup_cleanup_id, record_entries, record_entry
+from app.utils.logger import get_logger
+
+logger = get_logger("entry_view")
+
+# Entries-list paging on an index miss
+_LIST_PAGE_SIZE = 100  # Core's maximum page size
+_LIST_MAX_PAGES = 20
+
+# Parts of a listed entry that expand_entries can fill in
+EXPANDABLE_PARTS = frozenset({"cleanup", "analyses"})
+
+
+class _EntryView:
+    """State for composing one entry view."""
+
+    def __init__(
+        self,
+        core_api: CoreAPIClient,
+        access_token: str,
+        entry_id: str,
+        branch_timeout: float,
+        db: Optional[DBSession] = None,
+        session_id: Optional[str] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ):
+        self.core_api = core_api
+        self.access_token = access_token
+        self.entry_id = entry_id
+        self.branch_timeout = branch_timeout
+        self.db = db
+        self.session_id = session_id
+        self.semaphore = semaphore
+        self.degraded: list[str] = []
+
+    async def _get_json(self, path: str, **kwargs: Any) -> Optional[dict]:
+        """GET a Core resource; None if Core says it isn't available.
+
+        Raises:
+            CoreAPIError: On connection errors and 5xx responses
+        """
+        response = await self.core_api.request("GET", path, self.access_token, **kwargs)
+        if response.status_code >= 500:
+            raise CoreAPIError(status_code=response.status_code, detail=response.text)
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    async def _branch(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        """Run an optional branch under the branch timeout, degrading on failure.
+
+        With a semaphore, the timeout starts once the branch gets a slot.
+        """
+        try:
+            async with self.semaphore or nullcontext():
+                return await asyncio.wait_for(awaitable, timeout=self.branch_timeout)
+        except (asyncio.TimeoutError, CoreAPIError, ValueError) as e:
+            logger.warning(
+                "Entry view branch degraded",
+                entry_id=self.entry_id,
+                branch=name,
+                error=repr(e) if isinstance(e, asyncio.TimeoutError) else str(e),
+            )
+            self.degraded.append(name)
+            return None
+
+    async def _entry_chain(self) -> dict:
+        """Fetch the entry (required), then its full transcription."""
+        entry_response = await self.core_api.request(
+            "GET",
+            f"/api/v1/entries/{self.entry_id}",
+            self.access_token,
+        )
+        if entry_response.status_code >= 400:
+            raise CoreAPIError(
+                status_code=entry_response.status_code,
+                detail=entry_response.text,
+            )
+        entry_data = entry_response.json()
+
+        primary_transcription = entry_data.get("primary_transcription")
+        if primary_transcription and primary_transcription.get("id"):
+            if self.db is not None:
+                record_entry(self.db, self.session_id, self.entry_id, transcription_id=primary_transcription["id"])
+            full_transcription = await self._branch(
+                "transcription",
+                self._get_json(f"/api/v1/transcriptions/{primary_transcription['id']}"),
+            )
+            if full_transcription is not None:
+                entry_data["primary_transcription"] = full_transcription
+
+        return entry_data
+
+    async def _find_cleanup_id(self) -> Optional[str]:
+        """Find the entry's latest cleanup ID, from the index if possible.
+
+        WORKAROUND: Core's entry endpoint doesn't expose latest_cleaned_entry,
+        but the entries list does. On an index miss we page through the list
+        (indexing every entry we see) until we find the entry.
+        """
+        if self.db is not None:
+            cleanup_id = lookup_cleanup_id(self.db, self.session_id, self.entry_id)
+            if cleanup_id:
+                return cleanup_id
+
+        offset = 0
+        for _ in range(_LIST_MAX_PAGES):
+            list_data = await self._get_json(
+                "/api/v1/entries",
+                params={"limit": _LIST_PAGE_SIZE, "offset": offset},
+            )
+            entries = (list_data or {}).get("entries", [])
+            if self.db is not None:
+                record_entries(self.db, self.session_id, entries)
+
+            for entry in entries:
+                if str(entry.get("id")) == self.entry_id:
+                    latest_cleaned = entry.get("latest_cleaned_entry")
+                    return latest_cleaned.get("id") if latest_cleaned else None
+
+            offset += len(entries)
+            if len(entries) < _LIST_PAGE_SIZE or offset >= list_data.get("total", offset + 1):
+                return None
+        return None
+
+    async def _cleanup_chain(self) -> tuple[Optional[dict], list]:
+        """Find the cleanup ID, then fetch cleanup and analyses concurrently."""
+        cleanup_id = await self._branch("cleanup_lookup", self._find_cleanup_id())
+        if not cleanup_id:
+            return None, []
+        return await self._cleanup_parts(cleanup_id, EXPANDABLE_PARTS)
+
+    async def _cleanup_parts(self, cleanup_id: str, parts: Iterable[str]) -> tuple[Optional[dict], list]:
+        """Fetch the requested parts ("cleanup", "analyses") of a cleanup concurrently."""
+        fetches = {}
+        if "cleanup" in parts:
+            fetches["cleanup"] = self._branch("cleanup", self._get_json(f"/api/v1/cleaned-entries/{cleanup_id}"))
+        if "analyses" in parts:
+            fetches["analyses"] = self._branch(
+                "analyses",
+                self._get_json(f"/api/v1/cleaned-entries/{cleanup_id}/analyses"),
+            )
+
+        results = dict(zip(fetches, await asyncio.gather(*fetches.values())))
+        return results.get("cleanup"), (results.get("analyses") or {}).get("analyses", [])
+
+    async def compose(self) -> dict:
+        """Run both chains and merge the results into the entry payload."""
+        cleanup_chain = asyncio.ensure_future(self._cleanup_chain())
+        try:
+            entry_data = await self._entry_chain()
+        except BaseException:
+            cleanup_chain.cancel()
+            raise
+
+        cleanup_data, analyses = await cleanup_chain
+
+        entry_data["cleanup"] = cleanup_data
+        entry_data["analyses"] = analyses  # All analyses for client-side caching
+        if self.degraded:
+            entry_data["degraded"] = sorted(self.degraded)
+        return entry_data
+
+
+async def compose_entry_view(
+    core_api: CoreAPIClient,
+    access_token: str,
+    entry_id: str,
+    branch_timeout: float,
+    db: Optional[DBSession] = None,
+    session_id: Optional[str] = None,
+) -> dict:
+    """Compose an entry with its full transcription, cleanup, and analyses.
+
+    Args:
+        core_api: Core API client
+        access_token: Session's Core access token
+        entry_id: Entry to fetch
+        branch_timeout: Seconds each optional branch may take
+        db: Database session for the entry index (no index when None)
+        session_id: Wrapper session the index rows belong to
+
+    Returns:
+        Entry payload with primary_transcription, cleanup, and analyses filled
+        in where available, plus a "degraded" list naming any optional parts
+        that failed or timed out
+
+    Raises:
+        CoreAPIError: If the entry itself can't be fetched
+    """
+    view = _EntryView(core_api, access_token, entry_id, branch_timeout, db, session_id)
+    return await view.compose()
+
+
+async def expand_entries(
+    core_api: CoreAPIClient,
+    access_token: str,
+    entries: list[dict],
+    parts: set[str],
+    branch_timeout: float,
+    concurrency: int,
+) -> None:
+    """Fill cleanup and/or analyses into a page of listed entries, in place.
+
+    Each entry's latest_cleaned_entry.id (from the entries list) drives the
+    fetches, so no per-entry lookup is needed. All Core calls for the page
+    share one semaphore, bounding how hard a single list request can hit Core.
+
+    Args:
+        core_api: Core API client
+        access_token: Session's Core access token
+        entries: Entries from Core's entries list (modified in place)
+        parts: Subset of EXPANDABLE_PARTS to fill in
+        branch_timeout: Seconds each Core call may take once it has a slot
+        concurrency: Max concurrent Core calls for the whole page
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def expand_one(entry: dict) -> None:
+        view = _EntryView(core_api, access_token, str(entry.get("id")), branch_timeout, semaphore=semaphore)
+        cleanup_id = (entry.get("latest_cleaned_entry") or {}).get("id")
+        cleanup_data, analyses = (
+            await view._cleanup_parts(cleanup_id, parts) if cleanup_id else (None, [])
+        )
+        if "cleanup" in parts:
+            entry["cleanup"] = cleanup_data
+        if "analyses" in parts:
+            entry["analyses"] = analyses
+        if view.degraded:
+            entry["degraded"] = sorted(view.degraded)
+
+    await asyncio.gather(*(expand_one(entry) for entry in entries))
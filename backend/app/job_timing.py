@@ -0,0 +1,174 @@
+"""Learned job durations and poll-interval hints.
+
+Clients used to poll job status at a fixed cadence regardless of job size.
+The wrapper knows each upload's audio duration and sees when jobs finish, so
+it learns how long jobs take and tells clients when to come back.
+
+Design Decisions:
+1. LINEAR MODEL PER KIND: Time from submission to completion is modelled as
+   a + b * audio_seconds separately for transcriptions, cleanups and analyses,
+   fitted by least squares over completed jobs. Older observations decay so
+   the model follows Core as its load changes. Until a kind has a few
+   observations, conservative priors are used.
+2. HINTS, NOT RULES: Non-terminal status responses carry Retry-After (whole
+   seconds) and X-Poll-After (seconds, fractional). The hint is half the
+   expected remaining time, clamped to [min, max], so clients poll rarely
+   early on and densely near the expected completion. Overdue jobs get the
+   minimum interval.
+3. IN-PROCESS: Pending jobs and fits live in memory per worker. Jobs the
+   worker didn't see submitted (restart, other worker) get the default hint.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+
+# Prior (a, b): seconds = a + b * audio_seconds
+_PRIORS = {
+    "transcription": (5.0, 0.2),
+    "cleanup": (8.0, 0.25),  # Includes waiting for the transcription
+    "analysis": (12.0, 0.25),  # Includes transcription and cleanup
+}
+
+
+class LinearFit:
+    """Exponentially-decayed least-squares fit of y = a + b * x."""
+
+    MIN_OBSERVATIONS = 3
+
+    def __init__(self, prior_a: float, prior_b: float, decay: float = 0.98):
+        self.prior_a = prior_a
+        self.prior_b = prior_b
+        self.decay = decay
+        self.count = 0  # Observations seen (undecayed)
+        self.n = self.sx = self.sy = self.sxx = self.sxy = 0.0
+
+    def add(self, x: float, y: float) -> None:
+        """Add an observation, decaying the weight of earlier ones."""
+        d = self.decay
+        self.count += 1
+        self.n = self.n * d + 1
+        self.sx = self.sx * d + x
+        self.sy = self.sy * d + y
+        self.sxx = self.sxx * d + x * x
+        self.sxy = self.sxy * d + x * y
+
+    @property
+    def coefficients(self) -> tuple[float, float]:
+        """Current (a, b), falling back to the prior without enough data."""
+        if self.count < self.MIN_OBSERVATIONS:
+            return self.prior_a, self.prior_b
+
+        mean_x, mean_y = self.sx / self.n, self.sy / self.n
+        var_x = self.sxx / self.n - mean_x * mean_x
+        if var_x < 1e-6:
+            # All jobs had about the same audio length: keep the prior slope,
+            # limited so the intercept stays non-negative
+            b = min(self.prior_b, mean_y / mean_x) if mean_x > 0 else 0.0
+        else:
+            b = max((self.sxy / self.n - mean_x * mean_y) / var_x, 0.0)
+        a = max(mean_y - b * mean_x, 0.0)
+        return a, b
+
+    def predict(self, x: float) -> float:
+        a, b = self.coefficients
+        return a + b * x
+
+
+@dataclass
+class _PendingJob:
+    kind: str
+    audio_seconds: Optional[float]
+    submitted_at: float
+
+
+class JobTimingModel:
+    """Tracks submitted jobs and learns their durations per kind."""
+
+    def __init__(
+        self,
+        min_hint: float = 1.0,
+        max_hint: float = 15.0,
+        default_hint: float = 2.0,
+        max_pending: int = 10_000,
+    ):
+        self.min_hint = min_hint
+        self.max_hint = max_hint
+        self.default_hint = default_hint
+        self.max_pending = max_pending
+        self.fits = {kind: LinearFit(a, b) for kind, (a, b) in _PRIORS.items()}
+        self._pending: OrderedDict[str, _PendingJob] = OrderedDict()
+        # Audio length by job ID, kept after completion so follow-up jobs
+        # (a re-cleanup, a new analysis) can inherit it from their parent
+        self._audio_seconds: OrderedDict[str, float] = OrderedDict()
+
+    def submitted(
+        self,
+        kind: str,
+        job_id: Optional[str],
+        audio_seconds: Optional[float] = None,
+        parent_id: Optional[str] = None,
+    ) -> None:
+        """Record a job submission.
+
+        Args:
+            kind: transcription, cleanup or analysis
+            job_id: Core job ID
+            audio_seconds: Audio length, if known
+            parent_id: Job to take the audio length from (e.g. the
+                transcription a cleanup runs on) when audio_seconds is None
+        """
+        if not job_id or kind not in self.fits:
+            return
+        if audio_seconds is None and parent_id is not None:
+            audio_seconds = self._audio_seconds.get(parent_id)
+        if audio_seconds is not None:
+            self._audio_seconds[job_id] = audio_seconds
+            while len(self._audio_seconds) > self.max_pending:
+                self._audio_seconds.popitem(last=False)
+        self._pending[job_id] = _PendingJob(kind, audio_seconds, time.monotonic())
+        while len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+
+    def observed(self, job_id: str, status: Optional[str]) -> None:
+        """Record a status observation; completed jobs train the model."""
+        if status not in ("completed", "failed"):
+            return
+        job = self._pending.pop(job_id, None)
+        if job is not None and status == "completed" and job.audio_seconds is not None:
+            self.fits[job.kind].add(job.audio_seconds, time.monotonic() - job.submitted_at)
+
+    def expected_remaining(self, job_id: str) -> Optional[float]:
+        """Expected seconds until the job completes, if it is tracked."""
+        job = self._pending.get(job_id)
+        if job is None or job.audio_seconds is None:
+            return None
+        expected = self.fits[job.kind].predict(job.audio_seconds)
+        return expected - (time.monotonic() - job.submitted_at)
+
+    def poll_after(self, job_id: str) -> float:
+        """Seconds the client should wait before polling the job again."""
+        remaining = self.expected_remaining(job_id)
+        if remaining is None:
+            return self.default_hint
+        return min(max(remaining / 2, self.min_hint), self.max_hint)
+
+    def hint_headers(self, job_id: str) -> dict[str, str]:
+        """Retry-After / X-Poll-After headers for a non-terminal job."""
+        seconds = self.poll_after(job_id)
+        return {
+            "Retry-After": str(math.ceil(seconds)),
+            "X-Poll-After": f"{seconds:.1f}",
+        }
+
+
+def get_job_timing(request: Request) -> JobTimingModel:
+    """FastAPI dependency to get the app's JobTimingModel.
+
+    Created at app startup and stored in app.state.
+    """
+    return request.app.state.job_timing
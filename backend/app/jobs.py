@@ -0,0 +1,296 @@
+"""Server-side watching of Core jobs (transcriptions, cleanups, analyses).
+
+Clients used to poll /api/transcriptions/{id} and /api/analyses/{id} until a
+job finished, so wrapper and Core load scaled with the poll frequency. The
+wrapper now polls Core itself - once per job, however many clients are
+waiting - and pushes status transitions to them (see app/routes/jobs.py).
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from fastapi import Request
+
+from app.core_client import CoreAPIClient, CoreAPIError
+from app.job_timing import JobTimingModel
+from app.utils.logger import get_logger
+
+logger = get_logger("jobs")
+
+# Job kind -> Core path template
+JOB_PATHS = {
+    "transcription": "/api/v1/transcriptions/{}",
+    "cleanup": "/api/v1/cleaned-entries/{}",
+    "analysis": "/api/v1/analyses/{}",
+}
+
+TERMINAL_STATUSES = frozenset({"completed", "failed", "error"})
+
+
+@dataclass(frozen=True)
+class JobRef:
+    """A Core job identified by kind and ID."""
+
+    kind: str
+    id: str
+
+    @property
+    def core_path(self) -> str:
+        return JOB_PATHS[self.kind].format(self.id)
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.id}"
+
+
+@dataclass
+class JobUpdate:
+    """A job's observed status, with Core's body once the job is terminal."""
+
+    job: JobRef
+    status: str
+    body: Optional[bytes] = None  # Raw Core JSON, only for terminal statuses
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_json(self) -> bytes:
+        """Encode as {"kind", "id", "status"[, "body"]} without re-encoding the body."""
+        head = json.dumps({"kind": self.job.kind, "id": self.job.id, "status": self.status})
+        if self.body is None:
+            return head.encode()
+        return head[:-1].encode() + b',"body":' + self.body + b"}"
+
+
+def parse_job_refs(value: str, max_jobs: int) -> list[JobRef]:
+    """Parse "kind:id,kind:id" into job references.
+
+    Raises:
+        ValueError: On unknown kinds, malformed items, or too many jobs
+    """
+    refs = []
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        kind, sep, job_id = item.partition(":")
+        if not sep or not job_id or kind not in JOB_PATHS:
+            raise ValueError(f"Invalid job {item!r}, expected kind:id with kind in {sorted(JOB_PATHS)}")
+        refs.append(JobRef(kind, job_id))
+
+    refs = list(dict.fromkeys(refs))  # Drop duplicates, keep order
+    if not refs:
+        raise ValueError("No jobs given")
+    if len(refs) > max_jobs:
+        raise ValueError(f"Too many jobs ({len(refs)}), max {max_jobs}")
+    return refs
+
+
+async def fetch_job(core_api: CoreAPIClient, access_token: str, job: JobRef) -> Optional[JobUpdate]:
+    """Fetch a job's current status from Core.
+
+    Returns:
+        JobUpdate (with body if terminal; status "error" if Core rejects the
+        job, e.g. 404), or None if Core couldn't be reached or failed
+    """
+    try:
+        response = await core_api.request("GET", job.core_path, access_token)
+    except CoreAPIError as e:
+        logger.warning("Job poll failed", job=str(job), error=e.detail)
+        return None
+
+    if response.status_code >= 500:
+        logger.warning("Job poll failed", job=str(job), status_code=response.status_code)
+        return None
+    if response.status_code >= 400:
+        return JobUpdate(job, "error", _json_body(response))
+
+    try:
+        payload = response.json()
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        # e.g. a proxy's HTML page with a 200; treat like any transient failure
+        logger.warning(
+            "Job poll got a non-JSON body",
+            job=str(job),
+            content_type=response.headers.get("content-type"),
+        )
+        return None
+
+    status = str(payload.get("status", "unknown"))
+    update = JobUpdate(job, status)
+    if update.is_terminal:
+        update.body = response.content
+    return update
+
+
+def _json_body(response: httpx.Response) -> bytes:
+    """Core's body as JSON bytes; non-JSON errors (e.g. a proxy's HTML 404) become a JSON string."""
+    if not response.content:
+        return b"null"
+    if "json" in response.headers.get("content-type", ""):
+        return response.content
+    return json.dumps(response.text).encode()
+
+
+class _JobWatch:
+    """One upstream poll loop and the queues waiting on it."""
+
+    def __init__(self, session_id: str, access_token: str, job: JobRef):
+        self.session_id = session_id
+        self.access_token = access_token
+        self.job = job
+        self.latest: Optional[JobUpdate] = None
+        self.watchers: set[asyncio.Queue] = set()
+        self.task: Optional[asyncio.Task] = None
+
+
+class JobWatchRegistry:
+    """Shares one Core poll loop per (session, job) across all watchers.
+
+    Design Decisions:
+    1. ONE LOOP PER JOB: However many streams, long-polls or tabs wait on a
+       job, a single task polls Core for it and fans each status transition
+       out to every watcher's queue. Watchers arriving late get the latest
+       known status immediately.
+    2. KEYED BY SESSION: Loops are per (session_id, job) and poll with that
+       session's access token, so one session can never observe another
+       session's jobs through the registry. The newest token a watcher brings
+       replaces the loop's token, so a refreshed session keeps working.
+    3. EXPONENTIAL BACKOFF: The interval starts at min_interval, grows 1.5x per
+       unchanged poll up to max_interval, and resets when the status changes.
+    4. LIFECYCLE: A loop ends when its job is terminal or its last watcher
+       leaves; the next watcher starts a fresh one.
+    5. BOUNDED LONG-POLLS: wait_for_change holds at most max_held requests
+       at once, so held connections can't pile up without limit.
+    6. TIMING: Completions seen by the loops are reported to the optional
+       JobTimingModel, which learns job durations for poll hints.
+    """
+
+    BACKOFF = 1.5
+
+    def __init__(
+        self,
+        core_api: CoreAPIClient,
+        min_interval: float = 0.5,
+        max_interval: float = 5.0,
+        max_held: int = 200,
+        timing: Optional[JobTimingModel] = None,
+    ):
+        self.core_api = core_api
+        self.timing = timing
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_held = max_held
+        self.held = 0
+        self._watches: dict[tuple[str, JobRef], _JobWatch] = {}
+
+    def subscribe(
+        self,
+        session_id: str,
+        access_token: str,
+        job: JobRef,
+        queue: "asyncio.Queue[JobUpdate]",
+    ) -> None:
+        """Start receiving a job's updates on queue (latest known one first)."""
+        key = (session_id, job)
+        watch = self._watches.get(key)
+        if watch is None:
+            watch = self._watches[key] = _JobWatch(session_id, access_token, job)
+            watch.task = asyncio.ensure_future(self._poll(watch))
+        watch.access_token = access_token
+        watch.watchers.add(queue)
+        if watch.latest is not None:
+            queue.put_nowait(watch.latest)
+
+    def unsubscribe(self, session_id: str, job: JobRef, queue: asyncio.Queue) -> None:
+        """Stop receiving a job's updates; the poll loop ends with its last watcher."""
+        key = (session_id, job)
+        watch = self._watches.get(key)
+        if watch is None:
+            return
+        watch.watchers.discard(queue)
+        if not watch.watchers:
+            self._stop(key, watch)
+
+    async def wait_for_change(
+        self,
+        session_id: str,
+        access_token: str,
+        job: JobRef,
+        current_status: Optional[str],
+        timeout: float,
+    ) -> Optional[JobUpdate]:
+        """Hold a long-poll until the job leaves current_status.
+
+        At most max_held long-polls are held at once; beyond that this
+        returns immediately so the caller answers with what it already has.
+
+        Returns:
+            The first update with a different status, or None on timeout or
+            when the hold limit is reached
+        """
+        if self.held >= self.max_held:
+            return None
+
+        self.held += 1
+        queue: asyncio.Queue[JobUpdate] = asyncio.Queue()
+        self.subscribe(session_id, access_token, job, queue)
+        try:
+            async with asyncio.timeout(timeout):
+                while True:
+                    update = await queue.get()
+                    if update.status != current_status:
+                        return update
+        except TimeoutError:
+            return None
+        finally:
+            self.unsubscribe(session_id, job, queue)
+            self.held -= 1
+
+    def _stop(self, key: tuple[str, JobRef], watch: _JobWatch) -> None:
+        if self._watches.get(key) is watch:
+            del self._watches[key]
+        if watch.task is not None and watch.task is not asyncio.current_task():
+            watch.task.cancel()
+
+    async def _poll(self, watch: _JobWatch) -> None:
+        interval = self.min_interval
+        while True:
+            update = await fetch_job(self.core_api, watch.access_token, watch.job)
+            if update is not None and (watch.latest is None or update.status != watch.latest.status):
+                watch.latest = update
+                for queue in list(watch.watchers):
+                    queue.put_nowait(update)
+                interval = self.min_interval
+                if update.is_terminal:
+                    if self.timing is not None:
+                        self.timing.observed(watch.job.id, update.status)
+                    self._stop((watch.session_id, watch.job), watch)
+                    return
+            else:
+                interval = min(interval * self.BACKOFF, self.max_interval)
+            await asyncio.sleep(interval)
+
+    @property
+    def active(self) -> int:
+        """Number of running poll loops."""
+        return len(self._watches)
+
+    async def close(self) -> None:
+        """Cancel every poll loop (app shutdown)."""
+        watches = list(self._watches.items())
+        self._watches.clear()
+        for _, watch in watches:
+            if watch.task is not None:
+                watch.task.cancel()
+        await asyncio.gather(*(w.task for _, w in watches if w.task), return_exceptions=True)
+
+
+def get_job_watches(request: Request) -> JobWatchRegistry:
+    """FastAPI dependency to get the app's JobWatchRegistry.
+
+    Created at app startup and stored in app.state.
+    """
+    return request.app.state.job_watches
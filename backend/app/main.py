@@ -7,14 +7,24 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.audio_cache import AudioCache
 from app.config import get_settings
 from app.core_client import CoreAPIClient, CoreAPIError
+from app.entry_cache import EntryViewCache
+from app.job_timing import JobTimingModel
+from app.jobs import JobWatchRegistry
 from app import models  # noqa: F401 - Import models to register them with Base
 from app.middleware.logging import RequestLoggingMiddleware
 from app.rate_limit import RateLimitExceeded
 from app.turnstile import TurnstileError
+from app.routes.batch import router as batch_router
 from app.routes.core import router as core_router
+from app.routes.jobs import router as jobs_router
 from app.routes.local import router as local_router
+from app.routes.metrics import router as metrics_router
+from app.session import set_session_cookie
+from app.transcode import AudioTranscoder
+from app.utils.audio import AudioProbePool, AudioProber
 from app.utils.logger import setup_logging
 
 
@@ -50,6 +60,24 @@ class RateLimitHeaderMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class SessionCookieMiddleware(BaseHTTPMiddleware):
+    """Set the session cookie on responses for newly created sessions.
+
+    get_session stores the new session ID in request.state. Setting the cookie
+    here (rather than on the injected Response) keeps it working for endpoints
+    that return a Response directly, such as the raw byte passthrough proxies.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+
+        new_session_id = getattr(request.state, "new_session_id", None)
+        if new_session_id:
+            set_session_cookie(response, new_session_id)
+
+        return response
+
+
 def run_migrations() -> None:
     """Run Alembic migrations programmatically (upgrade to head)."""
     from alembic import command
@@ -76,11 +104,72 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     run_migrations()
 
     # Initialize Core API client
-    app.state.core_api = CoreAPIClient(base_url=settings.CORE_API_URL)
+    app.state.core_api = CoreAPIClient(
+        base_url=settings.CORE_API_URL,
+        hedge_gets=settings.CORE_HEDGE_ENABLED,
+        hedge_percentile=settings.CORE_HEDGE_PERCENTILE,
+        hedge_max_ratio=settings.CORE_HEDGE_MAX_RATIO,
+        hedge_min_samples=settings.CORE_HEDGE_MIN_SAMPLES,
+    )
+
+    # Composed entry views (settled entries only)
+    app.state.entry_cache = EntryViewCache(
+        max_entries=settings.ENTRY_VIEW_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.ENTRY_VIEW_CACHE_TTL_SECONDS,
+    )
+
+    # Upload duration probing off the event loop (threads, or worker processes)
+    probe_pool = None
+    if settings.AUDIO_PROBE_PROCESSES > 0:
+        probe_pool = AudioProbePool(
+            workers=settings.AUDIO_PROBE_PROCESSES,
+            max_queue=settings.AUDIO_PROBE_QUEUE_SIZE,
+            max_tasks_per_worker=settings.AUDIO_PROBE_MAX_TASKS_PER_WORKER,
+            timeout=settings.AUDIO_PROBE_TIMEOUT_SECONDS,
+        )
+    app.state.audio_prober = AudioProber(
+        concurrency=settings.AUDIO_PROBE_CONCURRENCY,
+        timeout=settings.AUDIO_PROBE_TIMEOUT_SECONDS,
+        pool=probe_pool,
+    )
+
+    # Optional ffmpeg re-encoding of uploads to Opus
+    app.state.audio_transcoder = None
+    if settings.AUDIO_TRANSCODE_ENABLED:
+        app.state.audio_transcoder = AudioTranscoder(
+            ffmpeg=settings.AUDIO_TRANSCODE_FFMPEG,
+            concurrency=settings.AUDIO_TRANSCODE_CONCURRENCY,
+            bitrate=settings.AUDIO_TRANSCODE_BITRATE,
+            min_bytes=settings.AUDIO_TRANSCODE_MIN_BYTES,
+        )
+
+    # Entry audio on disk
+    app.state.audio_cache = AudioCache(
+        directory=settings.AUDIO_CACHE_DIR,
+        max_bytes=settings.AUDIO_CACHE_MAX_BYTES,
+    )
+
+    # Learned job durations for poll-interval hints
+    app.state.job_timing = JobTimingModel(
+        min_hint=settings.JOB_POLL_HINT_MIN_SECONDS,
+        max_hint=settings.JOB_POLL_HINT_MAX_SECONDS,
+    )
+
+    # Shared Core poll loops for job status push / long-poll
+    app.state.job_watches = JobWatchRegistry(
+        app.state.core_api,
+        min_interval=settings.JOB_POLL_MIN_INTERVAL_SECONDS,
+        max_interval=settings.JOB_POLL_MAX_INTERVAL_SECONDS,
+        max_held=settings.LONG_POLL_MAX_HELD,
+        timing=app.state.job_timing,
+    )
 
     yield
 
-    # Cleanup: close Core API client
+    # Cleanup: stop job polling, close Core API client
+    await app.state.job_watches.close()
+    app.state.audio_cache.close()
+    app.state.audio_prober.close()
     await app.state.core_api.close()
 
 
@@ -93,11 +182,15 @@ app = FastAPI(
 
 # Register routers
 app.include_router(core_router)
+app.include_router(batch_router)
+app.include_router(jobs_router)
 app.include_router(local_router)
+app.include_router(metrics_router)
 
 # Register middleware (order matters: CORS outermost, logging innermost)
-# Execution order: CORS -> RateLimit -> Logging -> Route
+# Execution order: CORS -> RateLimit -> SessionCookie -> Logging -> Route
 app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(SessionCookieMiddleware)
 app.add_middleware(RateLimitHeaderMiddleware)
 
 # CORS configuration for frontend access
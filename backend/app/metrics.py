@@ -0,0 +1,214 @@
+"""In-process metrics for upstream Core API calls.
+
+Design Decisions:
+1. HDR-STYLE HISTOGRAMS: Latencies are recorded in microseconds into
+   log-linear buckets (16 linear sub-buckets per power of two), so any
+   percentile is reported within ~6% of the true value with a few hundred
+   integers of memory per series, regardless of how many calls we record.
+2. KEYED BY PATH TEMPLATE: IDs are stripped from paths (/api/v1/entries/{id})
+   so series stay bounded and each Core endpoint gets one latency profile.
+3. NO EXTERNAL DEPENDENCY: Metrics live in memory per process and are exposed
+   as JSON via /metrics/core. They reset on restart.
+"""
+
+import time
+from collections import defaultdict
+from typing import Any, Optional
+
+# Path segments that are part of Core API routes rather than identifiers.
+# Anything else in a path is treated as an ID and replaced with {id}.
+CORE_PATH_SEGMENTS = frozenset({
+    "api",
+    "v1",
+    "auth",
+    "register",
+    "login",
+    "refresh",
+    "options",
+    "upload-transcribe-cleanup",
+    "transcriptions",
+    "cleanup",
+    "entries",
+    "cleaned",
+    "audio",
+    "cleaned-entries",
+    "user-edit",
+    "analyze",
+    "analyses",
+    "analysis-profiles",
+})
+
+
+def normalize_path(path: str) -> str:
+    """Replace ID segments in a Core API path with {id}.
+
+    Example: /api/v1/cleaned-entries/9f2c.../analyses
+          -> /api/v1/cleaned-entries/{id}/analyses
+    """
+    path = path.split("?", 1)[0]
+    return "/".join(
+        segment if not segment or segment in CORE_PATH_SEGMENTS else "{id}"
+        for segment in path.split("/")
+    )
+
+
+def status_class(status_code: Optional[int], cancelled: bool = False) -> str:
+    """Map a status code to "2xx"/"4xx"/...; None means a connection error.
+
+    Calls abandoned before a response (e.g. the losing copy of a hedged
+    GET) are counted as "cancelled".
+    """
+    if cancelled:
+        return "cancelled"
+    if status_code is None:
+        return "error"
+    return f"{status_code // 100}xx"
+
+
+class LatencyHistogram:
+    """Log-linear histogram of durations with bounded relative error."""
+
+    SUB_BUCKET_BITS = 4  # 16 sub-buckets per power of two (~6% error)
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = defaultdict(int)
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def _bucket(self, value_us: int) -> int:
+        """Lower bound of the bucket holding value_us."""
+        shift = max(value_us.bit_length() - self.SUB_BUCKET_BITS - 1, 0)
+        return (value_us >> shift) << shift
+
+    def record(self, seconds: float) -> None:
+        """Record a duration in seconds."""
+        value_us = max(int(seconds * 1_000_000), 0)
+        self.counts[self._bucket(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        self.max_us = max(self.max_us, value_us)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Return the p-th percentile (0-100) in seconds, or None if empty."""
+        if not self.count:
+            return None
+
+        target = max(1, round(self.count * p / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                # Report the bucket's upper edge, never above the observed max
+                width = 1 << max(bucket.bit_length() - self.SUB_BUCKET_BITS - 1, 0)
+                return min(bucket + width - 1, self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    def summary(self) -> dict[str, Any]:
+        """Count plus common percentiles, in milliseconds."""
+
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return round(seconds * 1000, 2) if seconds is not None else None
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total_us / self.count / 1_000_000) if self.count else None,
+            "p50_ms": ms(self.percentile(50)),
+            "p90_ms": ms(self.percentile(90)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99)),
+            "max_ms": ms(self.max_us / 1_000_000) if self.count else None,
+        }
+
+
+class EndpointStats:
+    """Aggregated stats for one (method, path template) series."""
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.pool_wait = LatencyHistogram()
+        self.status_classes: dict[str, int] = defaultdict(int)
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+
+class CoreMetrics:
+    """Registry of per-endpoint Core API call metrics and simple counters."""
+
+    def __init__(self) -> None:
+        self.started_at = time.time()
+        self.endpoints: dict[tuple[str, str], EndpointStats] = defaultdict(EndpointStats)
+        self.counters: dict[str, int] = defaultdict(int)
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        status_code: Optional[int],
+        duration: float,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        pool_wait: Optional[float] = None,
+        cancelled: bool = False,
+    ) -> None:
+        """Record one upstream call.
+
+        Args:
+            method: HTTP method
+            path: Request path (IDs are stripped automatically)
+            status_code: Response status, or None for connection errors
+            duration: Seconds until response headers (or failure)
+            bytes_in: Response body bytes received
+            bytes_out: Request body bytes sent
+            pool_wait: Seconds spent waiting for a pooled connection, if known
+            cancelled: The call was abandoned before a response; duration is
+                the time until then
+        """
+        stats = self.endpoints[(method.upper(), normalize_path(path))]
+        stats.latency.record(duration)
+        stats.status_classes[status_class(status_code, cancelled)] += 1
+        stats.bytes_in += bytes_in
+        stats.bytes_out += bytes_out
+        if pool_wait is not None:
+            stats.pool_wait.record(pool_wait)
+
+    def latency_percentile(
+        self,
+        method: str,
+        path: str,
+        p: float,
+        min_count: int = 1,
+    ) -> Optional[float]:
+        """Observed latency percentile in seconds for an endpoint.
+
+        Returns None until at least min_count calls have been recorded.
+        """
+        stats = self.endpoints.get((method.upper(), normalize_path(path)))
+        if stats is None or stats.latency.count < min_count:
+            return None
+        return stats.latency.percentile(p)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increment a named counter."""
+        self.counters[name] += amount
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-serialisable view of all metrics, slowest p99 first."""
+        endpoints = [
+            {
+                "method": method,
+                "path": path,
+                "latency": stats.latency.summary(),
+                "pool_wait": stats.pool_wait.summary(),
+                "status": dict(stats.status_classes),
+                "bytes_in": stats.bytes_in,
+                "bytes_out": stats.bytes_out,
+            }
+            for (method, path), stats in self.endpoints.items()
+        ]
+        endpoints.sort(key=lambda e: e["latency"]["p99_ms"] or 0, reverse=True)
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "endpoints": endpoints,
+            "counters": dict(self.counters),
+        }
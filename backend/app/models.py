@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
 
 from app.database import Base
 
@@ -64,3 +64,37 @@ class RateLimitEntry(Base):
     ip_address = Column(String, nullable=True)
     action = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class EntryIndex(Base):
+    """Per-session index of entry -> transcription and latest cleanup IDs.
+
+    Lets the entry view find an entry's cleanup without scanning Core's
+    entries list. Populated from Core responses the wrapper already proxies.
+    """
+
+    __tablename__ = "entry_index"
+
+    session_id = Column(String, ForeignKey("sessions.session_id"), primary_key=True)
+    entry_id = Column(String, primary_key=True)
+    transcription_id = Column(String, nullable=True, index=True)
+    latest_cleanup_id = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class UploadDedup(Base):
+    """Per-session index of uploaded audio (content hash + options) -> entry.
+
+    Lets POST /api/transcribe answer a re-upload of the same recording with
+    the same options with the jobs Core already started for it.
+    """
+
+    __tablename__ = "upload_dedup"
+
+    session_id = Column(String, ForeignKey("sessions.session_id"), primary_key=True)
+    content_hash = Column(String, primary_key=True)  # BLAKE2b of the file bytes
+    options_hash = Column(String, primary_key=True)  # BLAKE2b of the options sent to Core
+    entry_id = Column(String, nullable=False, index=True)
+    transcription_id = Column(String, nullable=True)
+    response_body = Column(Text, nullable=False)  # Core's upload response, replayed on a hit
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,232 @@
+"""Batch endpoint for multiplexing proxied reads into one HTTP request.
+
+The demo frontend polls transcription, cleanup and several analyses at once.
+POST /api/batch runs a list of those reads concurrently behind a single
+cookie parse, session lookup and middleware pass.
+
+Design Decisions:
+1. REAL HANDLERS: Each item is dispatched in-process to the wrapper's own
+   GET route, so batched reads get exactly what a direct request gets -
+   ETag/304 handling, poll hints, job timing observations, entry index
+   updates and error mapping - and can't drift from the real routes. Items
+   reuse the batch's session (get_session) and skip the middleware stack.
+2. READ-ONLY ALLOWLIST: Only the GET routes in BATCHABLE_ROUTES can be
+   batched; any other path gets a per-item 404. Writes stay on their own
+   endpoints, so rate limits and Turnstile can't be bypassed through a
+   batch, and streaming routes (audio, SSE) stay off it.
+3. RAW BODIES: JSON response bytes are spliced into the batch response as-is
+   (no decode/re-encode). Non-JSON bodies become JSON strings, 304s null.
+4. LIMITS: BATCH_MAX_ITEMS caps the item count (422 for the whole batch).
+   BATCH_MAX_RESPONSE_BYTES caps the combined body size and is enforced
+   while each item's body arrives: an item whose Content-Length or body
+   would exceed what is left gets a per-item 413 and its bytes are dropped.
+"""
+
+import asyncio
+import json
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+from starlette.datastructures import Headers
+from starlette.routing import Match, Router
+
+from app.config import Settings, get_settings
+from app.models import Session as SessionModel
+from app.session import get_session
+from app.utils.logger import get_logger
+
+logger = get_logger("batch")
+
+router = APIRouter(tags=["batch"])
+
+# Wrapper GET routes (by path template) that may be batched
+BATCHABLE_ROUTES = frozenset({
+    "/api/options",
+    "/api/entries",
+    "/api/entries/{entry_id}",
+    "/api/entries/{entry_id}/cleaned",
+    "/api/transcriptions/{transcription_id}",
+    "/api/cleaned-entries/{cleanup_id}",
+    "/api/cleaned-entries/{cleanup_id}/analyses",
+    "/api/analyses/{analysis_id}",
+    "/api/analysis-profiles",
+})
+
+# Item response headers passed back to the client
+FORWARDED_HEADERS = ("etag", "retry-after", "x-poll-after")
+
+# Request headers that describe the batch POST itself, not its items
+_BATCH_ONLY_HEADERS = frozenset({b"content-length", b"content-type", b"if-none-match", b"transfer-encoding"})
+
+
+class BatchItem(BaseModel):
+    """One read in a batch."""
+
+    id: Optional[str] = None  # Echoed back; defaults to the item's index
+    path: str  # Wrapper route, e.g. /api/transcriptions/{id}?wait=10
+    if_none_match: Optional[str] = None  # ETag from a previous response
+
+
+class BatchRequest(BaseModel):
+    """Request body for POST /api/batch."""
+
+    requests: list[BatchItem]
+
+
+class _ResponseTooLarge(Exception):
+    """Raised from an item's send() when its body no longer fits the budget."""
+
+
+class _ByteBudget:
+    """Response bytes left for the whole batch, shared by concurrent items."""
+
+    def __init__(self, limit: int):
+        self.remaining = limit
+
+
+class _ItemResponse:
+    """Collects one item's ASGI response, charging its body to the budget."""
+
+    def __init__(self, budget: _ByteBudget):
+        self.status = 500
+        self.headers = Headers()
+        self.body = bytearray()
+        self._budget = budget
+
+    async def send(self, message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            self.headers = Headers(raw=message.get("headers", []))
+            length = self.headers.get("content-length", "")
+            if length.isdigit() and int(length) > self._budget.remaining:
+                raise _ResponseTooLarge()
+        elif message["type"] == "http.response.body":
+            chunk = message.get("body", b"")
+            if len(chunk) > self._budget.remaining:
+                self._budget.remaining += len(self.body)  # Give back what this item used
+                self.body.clear()
+                raise _ResponseTooLarge()
+            self._budget.remaining -= len(chunk)
+            self.body += chunk
+
+    def json_body(self) -> bytes:
+        if not self.body or self.status == 304:
+            return b"null"
+        if "json" in self.headers.get("content-type", ""):
+            return bytes(self.body)
+        return json.dumps(self.body.decode("utf-8", "replace")).encode()
+
+
+def match_batchable(app_router: Router, path: str) -> Optional[dict[str, Any]]:
+    """Match a path against the app's GET routes.
+
+    Returns:
+        The route's child scope (endpoint, path params, route), or None if
+        the path isn't a batchable route
+    """
+    scope = {"type": "http", "method": "GET", "path": path, "root_path": ""}
+    for route in app_router.routes:
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return child_scope if getattr(route, "path", None) in BATCHABLE_ROUTES else None
+    return None
+
+
+def _error_body(detail: str) -> bytes:
+    return json.dumps({"detail": detail}).encode()
+
+
+async def _run_item(
+    request: Request,
+    session: SessionModel,
+    item: BatchItem,
+    budget: _ByteBudget,
+) -> tuple[int, dict[str, str], bytes]:
+    """Run one batch item through its route, returning (status, headers, JSON body bytes)."""
+    url = urlsplit(item.path)
+    path = url.path.rstrip("/") or "/"
+    child_scope = match_batchable(request.app.router, path)
+    if child_scope is None:
+        return 404, {}, _error_body(f"Not a batchable route: {item.path}")
+
+    headers = [(name, value) for name, value in request.scope["headers"] if name not in _BATCH_ONLY_HEADERS]
+    if item.if_none_match:
+        headers.append((b"if-none-match", item.if_none_match.encode("latin-1", "replace")))
+    scope = {
+        **request.scope,
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        "state": {**request.scope.get("state", {}), "batch_session": session},
+        **child_scope,
+    }
+
+    request_sent = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Nothing more to read; block until the handler finishes
+        await asyncio.get_running_loop().create_future()
+        return {"type": "http.disconnect"}
+
+    response = _ItemResponse(budget)
+    try:
+        await child_scope["route"].handle(scope, receive, response.send)
+    except _ResponseTooLarge:
+        return 413, {}, _error_body("Batch response size limit reached")
+    except Exception as e:
+        logger.error("Batch item failed", path=path, error=str(e), exc_info=True)
+        return 500, {}, _error_body("Internal Server Error")
+
+    forwarded = {name: response.headers[name] for name in FORWARDED_HEADERS if name in response.headers}
+    return response.status, forwarded, response.json_body()
+
+
+@router.post("/api/batch")
+async def batch(
+    body: BatchRequest,
+    request: Request,
+    session: SessionModel = Depends(get_session),
+    settings: Settings = Depends(get_settings),
+):
+    """Run several read-only GETs concurrently in one request.
+
+    Request: {"requests": [{"id": "t", "path": "/api/transcriptions/{id}",
+    "if_none_match": "\\"etag\\""}, ...]}
+    Response: {"responses": [{"id": "t", "status": 200, "headers": {"etag": ...},
+    "body": {...}}, ...]} in request order. Per-item failures are reported in
+    that item's status and body; the batch itself returns 200.
+    """
+    if len(body.requests) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Too many batch items ({len(body.requests)}), max {settings.BATCH_MAX_ITEMS}",
+        )
+
+    budget = _ByteBudget(settings.BATCH_MAX_RESPONSE_BYTES)
+    results = await asyncio.gather(
+        *(_run_item(request, session, item, budget) for item in body.requests)
+    )
+
+    parts = []
+    for index, (item, (status, headers, item_body)) in enumerate(zip(body.requests, results)):
+        item_id = item.id if item.id is not None else str(index)
+        parts.append(
+            b'{"id":' + json.dumps(item_id).encode()
+            + b',"status":' + str(status).encode()
+            + b',"headers":' + json.dumps(headers).encode()
+            + b',"body":' + item_body + b"}"
+        )
+
+    return Response(
+        content=b'{"responses":[' + b",".join(parts) + b"]}",
+        media_type="application/json",
+    )
@@ -1,23 +1,93 @@
 """Core API proxy endpoints for transcription, entries, cleanup, and analysis."""
 
+import json
 from typing import Optional
 
-from fastapi import APIRouter, Body, Depends, Form, HTTPException, Query, Request, UploadFile
-from fastapi.responses import StreamingResponse
+import httpx
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy.orm import Session as DBSession
 from starlette.background import BackgroundTask
 
+from app.audio_cache import AudioCache, get_audio_cache
 from app.config import Settings, get_settings
 from app.core_client import CoreAPIClient, CoreAPIError, get_core_api
+from app.database import get_db
+from app.entry_cache import EntryViewCache, get_entry_cache
+from app.entry_index import forget_entry, record_cleanup, record_entries, record_entry
+from app.entry_view import EXPANDABLE_PARTS, compose_entry_view, expand_entries
+from app.job_timing import JobTimingModel, get_job_timing
+from app.jobs import TERMINAL_STATUSES, JobRef, JobWatchRegistry, get_job_watches
 from app.models import Session as SessionModel
 from app.rate_limit import RateLimitResult, require_rate_limit
 from app.session import get_session
+from app.transcode import AudioTranscoder, TranscodeError, get_audio_transcoder, opus_filename
 from app.turnstile import require_turnstile
-from app.utils.audio import AudioValidationError, validate_audio_duration
+from app.upload import parse_form_fields, receive_upload
+from app.upload_dedup import forget_entry_uploads, lookup_upload, options_hash, record_upload
+from app.upload_tee import UploadTee
+from app.utils.audio import AudioProber, AudioValidationError, get_audio_prober
+from app.utils.byte_range import ByteRange, content_range, if_range_matches, parse_range, slice_stream
+from app.utils.etag import conditional_response, make_etag
+from app.utils.multipart import content_type, multipart_body, new_boundary
 
 router = APIRouter(tags=["core"])
 
 
+def _passthrough(
+    response: httpx.Response,
+    status_code: int = 200,
+    request: Optional[Request] = None,
+) -> Response:
+    """Forward a Core API response body to the client without re-encoding it.
+
+    Design Decision: Raw byte passthrough
+    -------------------------------------
+    Returning response.json() makes FastAPI decode the body and re-serialise
+    it with jsonable_encoder - two full JSON passes and a large object graph
+    for word-level transcription payloads. Endpoints that don't inspect the
+    body forward Core's bytes and content-type as-is instead. Only endpoints
+    that compose or modify the payload (e.g. get_entry) parse JSON.
+
+    Design Decision: Conditional GET
+    --------------------------------
+    Read endpoints pass their request so the body goes out with a strong ETag
+    and a matching If-None-Match gets 304 instead of the full body - polling
+    a large transcription that hasn't changed costs headers only. Core's own
+    ETag is used when it sends a strong one; otherwise we hash the bytes. The
+    ETag is stored on the httpx response, so callers sharing a coalesced
+    response hash it once.
+
+    Args:
+        response: Successful Core API response (body already read)
+        status_code: Status code to return to the client
+        request: Client request, for ETag / If-None-Match handling (GETs only)
+
+    Returns:
+        Response carrying Core's body bytes, or 304 Not Modified
+    """
+    media_type = response.headers.get("content-type", "application/json")
+    if request is not None and status_code == 200:
+        return conditional_response(request, response.content, _etag_for(response), media_type)
+
+    return Response(
+        content=response.content,
+        status_code=status_code,
+        media_type=media_type,
+    )
+
+
+def _etag_for(response: httpx.Response) -> str:
+    """Strong ETag for a Core response: Core's own if strong, else a body hash."""
+    etag = response.extensions.get("etag")
+    if etag is None:
+        upstream = response.headers.get("etag")
+        etag = upstream if upstream and not upstream.startswith("W/") else make_etag(response.content)
+        response.extensions["etag"] = etag
+    return etag
+
+
 # =============================================================================
 # Options Endpoint (Public)
 # =============================================================================
@@ -25,6 +95,7 @@ router = APIRouter(tags=["core"])
 
 @router.get("/api/options")
 async def get_options(
+    request: Request,
     core_api: CoreAPIClient = Depends(get_core_api),
 ):
     """Get available transcription and LLM options from Core API.
@@ -32,7 +103,7 @@ async def get_options(
     Returns available models, providers, and parameters.
     No authentication required - public endpoint.
     """
-    response = await core_api.client.get("/api/v1/options")
+    response = await core_api.request("GET", "/api/v1/options", None)
 
     if response.status_code >= 400:
         raise CoreAPIError(
@@ -40,7 +111,7 @@ async def get_options(
             detail=response.text,
         )
 
-    return response.json()
+    return _passthrough(response, request=request)
 
 
 # =============================================================================
@@ -69,76 +140,184 @@ class AnalyzeRequest(BaseModel):
     llm_model: Optional[str] = None  # Optional LLM model override
 
 
+class TranscribeForm(BaseModel):
+    """Form fields sent with the audio file to POST /api/transcribe."""
+
+    language: str = "sl"
+    enable_diarization: bool = True
+    speaker_count: int = 2
+    enable_analysis: bool = True
+    analysis_profile: str = "generic-summary"
+    # Cleanup options
+    cleanup_type: str = "clean"  # minimal, clean, edited
+    llm_model: Optional[str] = None  # LLM model for cleanup
+    cleanup_temperature: float = 0.0  # LLM temperature for cleanup (0-2, default 0 for deterministic)
+    # Analysis options (separate from cleanup)
+    analysis_llm_model: Optional[str] = None  # LLM model for analysis
+
+
+# transcribe parses its multipart body itself, so describe it for the docs
+TRANSCRIBE_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        **TranscribeForm.model_json_schema()["properties"],
+                    },
+                }
+            }
+        },
+    }
+}
+
+
 # =============================================================================
 # Transcription Endpoints
 # =============================================================================
 
 
-@router.post("/api/transcribe", status_code=202)
+@router.post("/api/transcribe", status_code=202, openapi_extra=TRANSCRIBE_OPENAPI)
 async def transcribe(
     request: Request,
-    file: UploadFile,
-    language: str = Form("sl"),
-    enable_diarization: bool = Form(True),
-    speaker_count: int = Form(2),
-    enable_analysis: bool = Form(True),
-    analysis_profile: str = Form("generic-summary"),
-    # Cleanup options
-    cleanup_type: str = Form("clean"),  # minimal, clean, edited
-    llm_model: Optional[str] = Form(None),  # LLM model for cleanup
-    cleanup_temperature: float = Form(0.0),  # LLM temperature for cleanup (0-2, default 0 for deterministic)
-    # Analysis options (separate from cleanup)
-    analysis_llm_model: Optional[str] = Form(None),  # LLM model for analysis
     settings: Settings = Depends(get_settings),
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    db: DBSession = Depends(get_db),
+    job_timing: JobTimingModel = Depends(get_job_timing),
+    audio_prober: AudioProber = Depends(get_audio_prober),
+    audio_transcoder: Optional[AudioTranscoder] = Depends(get_audio_transcoder),
     _turnstile: None = Depends(require_turnstile()),
     _rate_limit: RateLimitResult = Depends(require_rate_limit("transcribe")),
 ):
     """Upload audio and start transcription + cleanup + analysis.
 
+    Multipart body: file plus the TranscribeForm fields.
     Returns immediately with entry_id, transcription_id, etc.
     Poll /api/transcriptions/{id} for status.
-    """
-    file_content = await file.read()
 
-    # Validate audio duration before consuming rate limit
+    Re-uploading the same file with the same options returns the original
+    response with 200 instead of starting new jobs (app/upload_dedup.py).
+    """
+    # The body is parsed here rather than through File/Form parameters so
+    # that size and duration limits apply while it streams in (app/upload.py).
+    # The file is spooled to a temp file, never held in memory whole; httpx
+    # streams it on to Core in 64 KB chunks.
+    #
+    # With UPLOAD_STREAM_THROUGH_ENABLED the file goes on to Core while it is
+    # still arriving instead, and that request is aborted if the upload
+    # fails validation or turns out to be a duplicate (app/upload_tee.py).
+    tee = None
+    if settings.UPLOAD_STREAM_THROUGH_ENABLED:
+        tee = UploadTee(core_api, "/api/v1/upload-transcribe-cleanup", session.access_token)
     try:
-        validate_audio_duration(
-            file_content=file_content,
-            filename=file.filename or "unknown",
+        upload = await receive_upload(
+            request.headers,
+            request.stream(),
+            max_bytes=settings.MAX_UPLOAD_BYTES,
             max_duration_seconds=settings.MAX_AUDIO_DURATION_SECONDS,
+            sink=tee,
         )
     except AudioValidationError as e:
+        if tee is not None:
+            await tee.abort()
         raise HTTPException(status_code=422, detail=e.message)
+    except BaseException:
+        if tee is not None:
+            await tee.abort()
+        raise
 
-    # Build form data for Core API
-    files = {"file": (file.filename, file_content, file.content_type)}
-    data = {
-        "language": language,
-        "enable_diarization": str(enable_diarization).lower(),
-        "speaker_count": str(speaker_count),
-        "cleanup_type": cleanup_type,
-        "cleanup_temperature": str(cleanup_temperature),
-    }
-
-    # Add optional LLM model for cleanup
-    if llm_model:
-        data["llm_model"] = llm_model
-
-    # Only include analysis params if analysis is enabled
-    if enable_analysis:
-        data["analysis_profile"] = analysis_profile
-        # Add optional LLM model for analysis (separate from cleanup)
-        if analysis_llm_model:
-            data["analysis_llm_model"] = analysis_llm_model
-
-    response = await core_api.client.post(
-        "/api/v1/upload-transcribe-cleanup",
-        files=files,
-        data=data,
-        headers={"Authorization": f"Bearer {session.access_token}"},
-    )
+    try:
+        form = parse_form_fields(TranscribeForm, upload.fields)
+        file = upload.file
+
+        # Build form data for Core API
+        data = {
+            "language": form.language,
+            "enable_diarization": str(form.enable_diarization).lower(),
+            "speaker_count": str(form.speaker_count),
+            "cleanup_type": form.cleanup_type,
+            "cleanup_temperature": str(form.cleanup_temperature),
+        }
+
+        # Add optional LLM model for cleanup
+        if form.llm_model:
+            data["llm_model"] = form.llm_model
+
+        # Only include analysis params if analysis is enabled
+        if form.enable_analysis:
+            data["analysis_profile"] = form.analysis_profile
+            # Add optional LLM model for analysis (separate from cleanup)
+            if form.analysis_llm_model:
+                data["analysis_llm_model"] = form.analysis_llm_model
+
+        # The same recording with the same options gets the jobs already
+        # started for it, without a rate limit slot (app/upload_dedup.py)
+        dedup_key = options_hash(data)
+        if settings.UPLOAD_DEDUP_ENABLED:
+            replay = await _replay_upload(request, db, core_api, session, upload.content_hash, dedup_key)
+            if replay is not None:
+                if tee is not None:
+                    await tee.abort()
+                return replay
+
+        # Validate audio duration before consuming rate limit
+        audio_seconds = upload.duration
+        if audio_seconds is None:
+            try:
+                audio_seconds = await audio_prober.validate(
+                    audio_file=file.file,
+                    filename=file.filename or "unknown",
+                    max_duration_seconds=settings.MAX_AUDIO_DURATION_SECONDS,
+                )
+            except AudioValidationError as e:
+                raise HTTPException(status_code=422, detail=e.message)
+
+        # Large WAV/FLAC/WebM uploads may be re-encoded to Opus on the way (app/transcode.py)
+        # (not when streaming through, as the original is already being sent)
+        transcode = None
+        transcodable = audio_transcoder is not None and audio_transcoder.should_transcode(upload.format, upload.size)
+        if tee is None and transcodable:
+            transcode = await audio_transcoder.start(file.file, file.filename or "unknown", upload.size)
+
+        if tee is not None:
+            # The file is already on its way; add the fields and wait for Core
+            response = await tee.finish(data)
+        elif transcode is None:
+            files = {"file": (file.filename, file.file, file.content_type)}
+            response = await core_api.request(
+                "POST",
+                "/api/v1/upload-transcribe-cleanup",
+                session.access_token,
+                files=files,
+                data=data,
+            )
+        else:
+            boundary = new_boundary()
+            try:
+                response = await core_api.request(
+                    "POST",
+                    "/api/v1/upload-transcribe-cleanup",
+                    session.access_token,
+                    content=multipart_body(
+                        boundary, data, "file", opus_filename(file.filename), "audio/ogg", transcode.chunks()
+                    ),
+                    headers={"Content-Type": content_type(boundary)},
+                )
+            except TranscodeError:
+                raise HTTPException(status_code=502, detail="Audio transcoding failed")
+            finally:
+                await transcode.close()
+    except BaseException:
+        if tee is not None:
+            await tee.abort()
+        raise
+    finally:
+        await upload.close()
 
     if response.status_code >= 400:
         raise CoreAPIError(
@@ -150,29 +329,145 @@ async def transcribe(
     # This ensures users aren't locked out due to failed requests.
     request.state.rate_limit_db.commit()
 
-    return response.json()
+    created = response.json()
+    if created.get("entry_id"):
+        record_entry(
+            db,
+            session.session_id,
+            created["entry_id"],
+            transcription_id=created.get("transcription_id"),
+            cleanup_id=created.get("cleanup_id"),
+        )
+        if settings.UPLOAD_DEDUP_ENABLED:
+            record_upload(db, session.session_id, upload.content_hash, dedup_key, created, response.content)
+    job_timing.submitted("transcription", created.get("transcription_id"), audio_seconds)
+    job_timing.submitted("cleanup", created.get("cleanup_id"), audio_seconds)
+    job_timing.submitted("analysis", created.get("analysis_id"), audio_seconds)
 
+    result = _passthrough(response, status_code=202)
+    if transcode is not None:
+        core_api.metrics.increment("transcoded_uploads")
+        core_api.metrics.increment("transcode_bytes_saved", transcode.saved_bytes)
+        result.headers["X-Transcode-Bytes-Saved"] = str(transcode.saved_bytes)
+    return result
 
-@router.get("/api/transcriptions/{transcription_id}")
-async def get_transcription(
-    transcription_id: str,
-    session: SessionModel = Depends(get_session),
-    core_api: CoreAPIClient = Depends(get_core_api),
-):
-    """Get transcription status, text, and segments."""
-    response = await core_api.request(
-        "GET",
-        f"/api/v1/transcriptions/{transcription_id}",
-        session.access_token,
-    )
 
+async def _replay_upload(
+    request: Request,
+    db: DBSession,
+    core_api: CoreAPIClient,
+    session: SessionModel,
+    content_hash: str,
+    dedup_key: str,
+) -> Optional[Response]:
+    """Core's response to an earlier upload of the same file and options.
+
+    Returns None (upload normally) unless Core confirms the earlier
+    transcription still exists and hasn't failed.
+    """
+    previous = lookup_upload(db, session.session_id, content_hash, dedup_key)
+    if previous is None or previous.transcription_id is None:
+        return None
+    body = previous.response_body
+
+    try:
+        response = await core_api.request(
+            "GET",
+            f"/api/v1/transcriptions/{previous.transcription_id}",
+            session.access_token,
+        )
+    except CoreAPIError:
+        return None  # Core unreachable, can't confirm; upload as usual
+    if response.status_code >= 400 or response.json().get("status") == "failed":
+        return None
+
+    # Duplicates don't spend a rate limit slot: drop the uncommitted entry
+    request.state.rate_limit_db.rollback()
+    core_api.metrics.increment("dedup_hits")
+    return Response(content=body, status_code=200, media_type="application/json")
+
+
+async def _get_job(
+    request: Request,
+    session: SessionModel,
+    core_api: CoreAPIClient,
+    job_watches: JobWatchRegistry,
+    job_timing: JobTimingModel,
+    job: JobRef,
+    wait: float,
+) -> Response:
+    """Fetch a job, optionally long-polling until its status changes.
+
+    Design Decision: Long-poll via the shared job watcher
+    -----------------------------------------------------
+    With ?wait=N a non-terminal job is held until its status changes or N
+    seconds pass (capped at LONG_POLL_MAX_WAIT_SECONDS). Holding goes through
+    JobWatchRegistry, so any number of held requests for a job share one
+    Core poll loop. A terminal transition is answered from the watcher's
+    payload; other transitions re-fetch the job once. When LONG_POLL_MAX_HELD
+    requests are already held, the current state is returned immediately.
+
+    Non-terminal responses carry Retry-After / X-Poll-After hints derived
+    from the audio length and learned job durations (app/job_timing.py).
+    """
+    response = await core_api.request("GET", job.core_path, session.access_token)
     if response.status_code >= 400:
         raise CoreAPIError(
             status_code=response.status_code,
             detail=response.text,
         )
 
-    return response.json()
+    status = response.json().get("status")
+    if wait > 0 and status not in TERMINAL_STATUSES:
+        update = await job_watches.wait_for_change(
+            session.session_id,
+            session.access_token,
+            job,
+            status,
+            timeout=wait,
+        )
+        if update is not None and update.status in ("completed", "failed"):
+            response = httpx.Response(200, content=update.body, headers={"content-type": "application/json"})
+        elif update is not None:
+            response = await core_api.request("GET", job.core_path, session.access_token)
+            if response.status_code >= 400:
+                raise CoreAPIError(
+                    status_code=response.status_code,
+                    detail=response.text,
+                )
+
+    result = _passthrough(response, request=request)
+    status = response.json().get("status")
+    job_timing.observed(job.id, status)
+    if status not in TERMINAL_STATUSES:
+        result.headers.update(job_timing.hint_headers(job.id))
+    return result
+
+
+@router.get("/api/transcriptions/{transcription_id}")
+async def get_transcription(
+    transcription_id: str,
+    request: Request,
+    wait: float = Query(default=0, ge=0, description="Long-poll: seconds to wait for a status change"),
+    session: SessionModel = Depends(get_session),
+    core_api: CoreAPIClient = Depends(get_core_api),
+    job_watches: JobWatchRegistry = Depends(get_job_watches),
+    job_timing: JobTimingModel = Depends(get_job_timing),
+    settings: Settings = Depends(get_settings),
+):
+    """Get transcription status, text, and segments.
+
+    With ?wait=N, holds the request until the status changes (see _get_job).
+    """
+    return await _get_job(
+        request,
+        session,
+        core_api,
+        job_watches,
+        job_timing,
+        JobRef("transcription", transcription_id),
+        wait=min(wait, settings.LONG_POLL_MAX_WAIT_SECONDS),
+    )
 
 
 # =============================================================================
@@ -182,13 +477,33 @@ async def get_transcription(
 
 @router.get("/api/entries")
 async def list_entries(
+    request: Request,
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     entry_type: Optional[str] = Query(default=None),
+    expand: Optional[str] = Query(default=None, description="Comma-separated: cleanup, analyses"),
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    settings: Settings = Depends(get_settings),
+    db: DBSession = Depends(get_db),
 ):
-    """List all entries for the current session."""
+    """List all entries for the current session.
+
+    With expand=cleanup,analyses each listed entry also gets its latest
+    cleanup and/or all of that cleanup's analyses, fetched server-side with
+    bounded concurrency, so the history sidebar needs one request instead of
+    one per entry. Parts that fail or time out are named in the entry's
+    "degraded" list.
+    """
+    parts = {part.strip() for part in expand.split(",") if part.strip()} if expand else set()
+    unknown = parts - EXPANDABLE_PARTS
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown expand value(s): {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(sorted(EXPANDABLE_PARTS))}",
+        )
+
     params = {"limit": limit, "offset": offset}
     if entry_type:
         params["entry_type"] = entry_type
@@ -206,111 +521,80 @@ async def list_entries(
             detail=response.text,
         )
 
-    return response.json()
+    list_data = response.json()
+    record_entries(db, session.session_id, list_data.get("entries", []))
+
+    if not parts:
+        return _passthrough(response, request=request)
+
+    await expand_entries(
+        core_api,
+        session.access_token,
+        list_data.get("entries", []),
+        parts,
+        branch_timeout=settings.ENTRY_VIEW_BRANCH_TIMEOUT_SECONDS,
+        concurrency=settings.ENTRIES_EXPAND_CONCURRENCY,
+    )
+    body = json.dumps(list_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return conditional_response(request, body, make_etag(body))
 
 
 @router.get("/api/entries/{entry_id}")
 async def get_entry(
     entry_id: str,
+    request: Request,
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    settings: Settings = Depends(get_settings),
+    db: DBSession = Depends(get_db),
+    entry_cache: EntryViewCache = Depends(get_entry_cache),
 ):
     """Get entry details with transcription segments and cleanup.
 
     WORKAROUND: The core API's GET /entries/{id} endpoint returns entry metadata
     and transcription summary, but NOT segments or cleanup data.
 
-    This wrapper composes a full response by:
-    1. Fetching entry details (includes primary_transcription summary)
-    2. Fetching full transcription with segments
-    3. Fetching entries list to find this entry's cleanup_id
-    4. Fetching cleanup details if available
+    This wrapper composes a full response (see app/entry_view.py) from:
+    1. Entry details (includes primary_transcription summary)
+    2. Full transcription with segments
+    3. The session's entry index (or, on a miss, the entries list) to find
+       this entry's cleanup_id
+    4. Cleanup details and analyses if available
+
+    Independent calls run concurrently, so this costs about two Core round
+    trips. Optional parts that fail or time out are listed in "degraded".
+
+    Once every job in the view has finished, the composed body is cached
+    (app/entry_cache.py) until a write endpoint touches the entry. Responses
+    carry an ETag; a matching If-None-Match gets 304 Not Modified.
 
     TODO: This should be fixed in the core API to return all data directly,
     eliminating the need for multiple round-trips.
     """
-    # 1. Fetch entry details (includes primary_transcription summary)
-    entry_response = await core_api.request(
-        "GET",
-        f"/api/v1/entries/{entry_id}",
-        session.access_token,
-    )
-
-    if entry_response.status_code >= 400:
-        raise CoreAPIError(
-            status_code=entry_response.status_code,
-            detail=entry_response.text,
-        )
-
-    entry_data = entry_response.json()
-
-    # 2. Fetch full transcription with segments if we have a transcription_id
-    primary_transcription = entry_data.get("primary_transcription")
-    if primary_transcription and primary_transcription.get("id"):
-        transcription_id = primary_transcription["id"]
-        transcription_response = await core_api.request(
-            "GET",
-            f"/api/v1/transcriptions/{transcription_id}",
-            session.access_token,
-        )
-        if transcription_response.status_code == 200:
-            full_transcription = transcription_response.json()
-            # Merge segments into primary_transcription
-            entry_data["primary_transcription"] = full_transcription
-
-    # 3. Find cleanup_id from entries list (workaround for core API limitation)
-    # The entries list includes latest_cleaned_entry.id which we need
-    list_response = await core_api.request(
-        "GET",
-        "/api/v1/entries",
-        session.access_token,
-        params={"limit": 100},  # Fetch enough to find the entry # TODO: change the dirty fix
-    )
-
-    cleanup_id = None
-    cleanup_data = None
-
-    if list_response.status_code == 200:
-        list_data = list_response.json()
-        for entry in list_data.get("entries", []):
-            if str(entry.get("id")) == entry_id:
-                latest_cleaned = entry.get("latest_cleaned_entry")
-                if latest_cleaned:
-                    cleanup_id = latest_cleaned.get("id")
-                break
-
-    # 4. Fetch cleanup details if we found a cleanup_id
-    if cleanup_id:
-        cleanup_response = await core_api.request(
-            "GET",
-            f"/api/v1/cleaned-entries/{cleanup_id}",
-            session.access_token,
-        )
-        if cleanup_response.status_code == 200:
-            cleanup_data = cleanup_response.json()
-
-    # 5. Fetch ALL analyses for this cleaned entry
-    analyses = []
-    if cleanup_id:
-        analyses_response = await core_api.request(
-            "GET",
-            f"/api/v1/cleaned-entries/{cleanup_id}/analyses",
+    cached = entry_cache.get(session.session_id, entry_id)
+    if cached is not None:
+        body, etag = cached.body, cached.etag
+    else:
+        generation = entry_cache.generation()
+        entry_data = await compose_entry_view(
+            core_api,
             session.access_token,
+            entry_id,
+            branch_timeout=settings.ENTRY_VIEW_BRANCH_TIMEOUT_SECONDS,
+            db=db,
+            session_id=session.session_id,
         )
-        if analyses_response.status_code == 200:
-            analyses_data = analyses_response.json()
-            analyses = analyses_data.get("analyses", [])
-
-    # 6. Compose response with cleanup and analysis data included
-    entry_data["cleanup"] = cleanup_data
-    entry_data["analyses"] = analyses  # All analyses for client-side caching
+        body = json.dumps(entry_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = make_etag(body)
+        entry_cache.put(session.session_id, entry_id, entry_data, body, etag, generation)
 
-    return entry_data
+    return conditional_response(request, body, etag)
 
 
 @router.get("/api/entries/{entry_id}/cleaned")
 async def list_cleaned_entries(
     entry_id: str,
+    request: Request,
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
 ):
@@ -331,7 +615,7 @@ async def list_cleaned_entries(
             detail=response.text,
         )
 
-    return response.json()
+    return _passthrough(response, request=request)
 
 
 @router.delete("/api/entries/{entry_id}")
@@ -339,6 +623,9 @@ async def delete_entry(
     entry_id: str,
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    entry_cache: EntryViewCache = Depends(get_entry_cache),
+    audio_cache: AudioCache = Depends(get_audio_cache),
+    db: DBSession = Depends(get_db),
 ):
     """Delete an entry and all associated data."""
     response = await core_api.request(
@@ -353,34 +640,73 @@ async def delete_entry(
             detail=response.text,
         )
 
-    return response.json()
+    forget_entry(db, session.session_id, entry_id)
+    forget_entry_uploads(db, session.session_id, entry_id)
+    entry_cache.invalidate(session.session_id, entry_id=entry_id)
+    audio_cache.invalidate(session.session_id, entry_id)
+
+    return _passthrough(response)
 
 
 @router.get("/api/entries/{entry_id}/audio")
 async def get_entry_audio(
     entry_id: str,
+    request: Request,
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    audio_cache: AudioCache = Depends(get_audio_cache),
 ):
     """Stream the audio file for an entry.
 
     Captures headers from Core API response to ensure correct Content-Type
     and filename regardless of whether audio preprocessing is enabled.
+
+    Design Decision: Range requests
+    -------------------------------
+    The audio player seeks with Range requests. Range and If-Range are
+    forwarded to Core and a 206 from Core is passed through. If Core ignores
+    the range and sends the whole file, the range is cut out of that stream
+    here (reading stops once it has been sent), so the player still gets a
+    206 instead of re-downloading from byte 0. Multi-range requests get the
+    full file, which RFC 9110 allows.
+
+    Design Decision: Disk cache (app/audio_cache.py)
+    ------------------------------------------------
+    Full downloads (no Range, or "bytes=0-" which is how players start) are
+    written to the session's disk cache as they stream. Later plays and
+    seeks are served from the file with FileResponse.
     """
-    auth_headers = {"Authorization": f"Bearer {session.access_token}"}
+    cached = audio_cache.get(session.session_id, entry_id)
+    if cached is not None:
+        return FileResponse(cached.path, media_type=cached.content_type, headers=cached.headers)
+
+    byte_range = parse_range(request.headers.get("range"))
+    if_range = request.headers.get("if-range")
+    full_download = byte_range is None or byte_range == ByteRange(0, None)
+    upstream_headers = {}
+    if not full_download:
+        upstream_headers["Range"] = request.headers["range"]
+        if if_range:
+            upstream_headers["If-Range"] = if_range
 
     # Start streaming request to Core API
     # We'll capture headers from the response before streaming body
-    client_stream = core_api.client.stream(
+    response = await core_api.stream(
         "GET",
         f"/api/v1/entries/{entry_id}/audio",
-        headers=auth_headers,
+        session.access_token,
+        headers=upstream_headers,
     )
 
-    response = await client_stream.__aenter__()
+    if response.status_code == 416:
+        await response.aclose()
+        return Response(
+            status_code=416,
+            headers={"Content-Range": response.headers.get("content-range", "bytes */*")},
+        )
 
     if response.status_code >= 400:
-        await client_stream.__aexit__(None, None, None)
+        await response.aclose()
         raise CoreAPIError(
             status_code=response.status_code,
             detail=f"Failed to fetch audio: {response.status_code}",
@@ -393,23 +719,64 @@ async def get_entry_audio(
         "content-disposition",
         f"inline; filename={entry_id}",
     )
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+
+    # Build response headers - pass through from Core API
+    response_headers = {
+        "Content-Disposition": content_disposition,
+        "Accept-Ranges": "bytes",
+    }
+    if etag:
+        response_headers["ETag"] = etag
+    if last_modified:
+        response_headers["Last-Modified"] = last_modified
+
+    status_code = 200
+    chunks = response.aiter_bytes()
+    expected_size = int(content_length) if content_length else None
+    if (
+        full_download
+        and response.status_code == 200
+        and audio_cache.can_fill(session.session_id, entry_id, expected_size)
+    ):
+        cache_headers = {k: v for k, v in response_headers.items() if k != "Accept-Ranges"}
+        chunks = audio_cache.fill(
+            session.session_id,
+            entry_id,
+            chunks,
+            content_type=content_type,
+            headers=cache_headers,
+            expected_size=expected_size,
+        )
+
+    if response.status_code == 206:
+        status_code = 206
+        response_headers["Content-Range"] = response.headers.get("content-range", "")
+    elif byte_range is not None and content_length and if_range_matches(if_range, etag, last_modified):
+        # Core sent the whole file: serve the requested range from it
+        total = int(content_length)
+        resolved = byte_range.resolve(total)
+        if resolved is None:
+            await response.aclose()
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{total}"})
+        start, end = resolved
+        status_code = 206
+        if (start, end) != (0, total - 1):
+            chunks = slice_stream(chunks, start, end)
+        content_length = str(end - start + 1)
+        response_headers["Content-Range"] = content_range(start, end, total)
 
     # Stream the body - no cleanup in finally block to avoid
     # "anext(): asynchronous generator is already running" error
     # when client disconnects during streaming
     async def stream_audio():
-        async for chunk in response.aiter_bytes():
+        async for chunk in chunks:
             yield chunk
 
     # Cleanup function runs as background task after response completes
     async def cleanup():
-        await client_stream.__aexit__(None, None, None)
-
-    # Build response headers - pass through from Core API
-    response_headers = {
-        "Content-Disposition": content_disposition,
-        "Accept-Ranges": "bytes",
-    }
+        await response.aclose()
 
     # Add Content-Length if available - helps browser calculate duration
     if content_length:
@@ -417,6 +784,7 @@ async def get_entry_audio(
 
     return StreamingResponse(
         stream_audio(),
+        status_code=status_code,
         media_type=content_type,
         headers=response_headers,
         background=BackgroundTask(cleanup),
@@ -434,6 +802,9 @@ async def trigger_cleanup(
     body: CleanupRequest = Body(default=CleanupRequest()),
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    entry_cache: EntryViewCache = Depends(get_entry_cache),
+    db: DBSession = Depends(get_db),
+    job_timing: JobTimingModel = Depends(get_job_timing),
     _turnstile: None = Depends(require_turnstile()),
 ):
     """Trigger LLM cleanup for a completed transcription.
@@ -461,29 +832,38 @@ async def trigger_cleanup(
             detail=response.text,
         )
 
-    return response.json()
+    cleanup = response.json()
+    record_cleanup(db, session.session_id, transcription_id, cleanup)
+    job_timing.submitted("cleanup", cleanup.get("id"), parent_id=transcription_id)
+    entry_cache.invalidate(session.session_id, transcription_id=transcription_id)
+
+    return _passthrough(response, status_code=202)
 
 
 @router.get("/api/cleaned-entries/{cleanup_id}")
 async def get_cleaned_entry(
     cleanup_id: str,
+    request: Request,
+    wait: float = Query(default=0, ge=0, description="Long-poll: seconds to wait for a status change"),
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    job_watches: JobWatchRegistry = Depends(get_job_watches),
+    job_timing: JobTimingModel = Depends(get_job_timing),
+    settings: Settings = Depends(get_settings),
 ):
-    """Get cleanup details including cleaned text and segments."""
-    response = await core_api.request(
-        "GET",
-        f"/api/v1/cleaned-entries/{cleanup_id}",
-        session.access_token,
-    )
+    """Get cleanup details including cleaned text and segments.
 
-    if response.status_code >= 400:
-        raise CoreAPIError(
-            status_code=response.status_code,
-            detail=response.text,
-        )
-
-    return response.json()
+    With ?wait=N, holds the request until the status changes (see _get_job).
+    """
+    return await _get_job(
+        request,
+        session,
+        core_api,
+        job_watches,
+        job_timing,
+        JobRef("cleanup", cleanup_id),
+        wait=min(wait, settings.LONG_POLL_MAX_WAIT_SECONDS),
+    )
 
 
 @router.put("/api/cleaned-entries/{cleanup_id}/user-edit")
@@ -492,6 +872,7 @@ async def update_user_edit(
     body: UserEditRequest,
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    entry_cache: EntryViewCache = Depends(get_entry_cache),
 ):
     """Save user edits to cleaned text."""
     response = await core_api.request(
@@ -507,7 +888,9 @@ async def update_user_edit(
             detail=response.text,
         )
 
-    return response.json()
+    entry_cache.invalidate(session.session_id, cleanup_id=cleanup_id)
+
+    return _passthrough(response)
 
 
 @router.delete("/api/cleaned-entries/{cleanup_id}/user-edit")
@@ -515,6 +898,7 @@ async def revert_user_edit(
     cleanup_id: str,
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    entry_cache: EntryViewCache = Depends(get_entry_cache),
 ):
     """Revert to AI-generated cleaned text."""
     response = await core_api.request(
@@ -529,7 +913,9 @@ async def revert_user_edit(
             detail=response.text,
         )
 
-    return response.json()
+    entry_cache.invalidate(session.session_id, cleanup_id=cleanup_id)
+
+    return _passthrough(response)
 
 
 # =============================================================================
@@ -539,6 +925,7 @@ async def revert_user_edit(
 
 @router.get("/api/analysis-profiles")
 async def list_analysis_profiles(
+    request: Request,
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
 ):
@@ -555,7 +942,7 @@ async def list_analysis_profiles(
             detail=response.text,
         )
 
-    return response.json()
+    return _passthrough(response, request=request)
 
 
 @router.post("/api/cleaned-entries/{cleanup_id}/analyze")
@@ -565,6 +952,8 @@ async def trigger_analysis(
     body: AnalyzeRequest = Body(default=AnalyzeRequest()),
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    entry_cache: EntryViewCache = Depends(get_entry_cache),
+    job_timing: JobTimingModel = Depends(get_job_timing),
     _rate_limit: RateLimitResult = Depends(require_rate_limit("analyze")),
 ):
     """Trigger analysis on a cleaned entry."""
@@ -582,16 +971,20 @@ async def trigger_analysis(
             detail=response.text,
         )
 
+    entry_cache.invalidate(session.session_id, cleanup_id=cleanup_id)
+    job_timing.submitted("analysis", response.json().get("id"), parent_id=cleanup_id)
+
     # Commit rate limit entry only after successful Core API call.
     # This ensures users aren't locked out due to failed requests.
     request.state.rate_limit_db.commit()
 
-    return response.json()
+    return _passthrough(response)
 
 
 @router.get("/api/cleaned-entries/{cleanup_id}/analyses")
 async def list_analyses(
     cleanup_id: str,
+    request: Request,
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
 ):
@@ -608,26 +1001,30 @@ async def list_analyses(
             detail=response.text,
         )
 
-    return response.json()
+    return _passthrough(response, request=request)
 
 
 @router.get("/api/analyses/{analysis_id}")
 async def get_analysis(
     analysis_id: str,
+    request: Request,
+    wait: float = Query(default=0, ge=0, description="Long-poll: seconds to wait for a status change"),
     session: SessionModel = Depends(get_session),
     core_api: CoreAPIClient = Depends(get_core_api),
+    job_watches: JobWatchRegistry = Depends(get_job_watches),
+    job_timing: JobTimingModel = Depends(get_job_timing),
+    settings: Settings = Depends(get_settings),
 ):
-    """Get analysis status and results."""
-    response = await core_api.request(
-        "GET",
-        f"/api/v1/analyses/{analysis_id}",
-        session.access_token,
-    )
+    """Get analysis status and results.
 
-    if response.status_code >= 400:
-        raise CoreAPIError(
-            status_code=response.status_code,
-            detail=response.text,
-        )
-
-    return response.json()
+    With ?wait=N, holds the request until the status changes (see _get_job).
+    """
+    return await _get_job(
+        request,
+        session,
+        core_api,
+        job_watches,
+        job_timing,
+        JobRef("analysis", analysis_id),
+        wait=min(wait, settings.LONG_POLL_MAX_WAIT_SECONDS),
+    )
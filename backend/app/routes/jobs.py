@@ -0,0 +1,128 @@
+"""Job status push endpoints.
+
+GET /api/jobs/stream is a Server-Sent Events stream that replaces client-side
+polling of transcription, cleanup and analysis status. The wrapper polls Core
+with adaptive intervals, one shared loop per job (app/jobs.py JobWatchRegistry),
+and pushes one "job" event per status transition; terminal events carry
+Core's final payload.
+
+Event stream format:
+    event: job       data: {"kind", "id", "status"[, "body"]}
+    event: done      data: {} - every job is terminal; close the EventSource
+    : heartbeat      comment every JOB_STREAM_HEARTBEAT_SECONDS
+
+Reconnection: every event's id encodes the status of each job (in ids order),
+so a reconnecting EventSource's Last-Event-ID tells us what the client has
+already seen; only newer transitions are sent. The stream ends after
+JOB_STREAM_MAX_SECONDS and the browser reconnects the same way.
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.config import Settings, get_settings
+from app.jobs import (
+    JobRef,
+    JobUpdate,
+    JobWatchRegistry,
+    TERMINAL_STATUSES,
+    get_job_watches,
+    parse_job_refs,
+)
+from app.models import Session as SessionModel
+from app.session import get_session
+
+router = APIRouter(tags=["jobs"])
+
+MAX_STREAM_JOBS = 20
+_UNKNOWN = "-"
+
+
+def _sse(event: str, data: bytes, event_id: str) -> bytes:
+    """Encode one SSE event. Multi-line data is split into data: lines."""
+    lines = b"".join(b"data: " + line + b"\n" for line in data.split(b"\n"))
+    return f"id: {event_id}\nevent: {event}\n".encode() + lines + b"\n"
+
+
+def _event_id(jobs: list[JobRef], statuses: dict[JobRef, Optional[str]]) -> str:
+    """Encode every job's last sent status, e.g. "completed,processing,-"."""
+    return ",".join(statuses[job] or _UNKNOWN for job in jobs)
+
+
+def _parse_event_id(jobs: list[JobRef], last_event_id: Optional[str]) -> dict[JobRef, Optional[str]]:
+    """Statuses the client already has, from Last-Event-ID (ignored if it doesn't fit)."""
+    parts = (last_event_id or "").split(",")
+    if len(parts) != len(jobs):
+        return {job: None for job in jobs}
+    return {job: None if status == _UNKNOWN else status for job, status in zip(jobs, parts)}
+
+
+async def job_event_stream(
+    registry: JobWatchRegistry,
+    session: SessionModel,
+    jobs: list[JobRef],
+    statuses: dict[JobRef, Optional[str]],
+    settings: Settings,
+) -> AsyncIterator[bytes]:
+    """Yield SSE events for the jobs until all are terminal or time runs out."""
+    queue: asyncio.Queue[JobUpdate] = asyncio.Queue()
+    watched = [job for job in jobs if statuses[job] not in TERMINAL_STATUSES]
+    for job in watched:
+        registry.subscribe(session.session_id, session.access_token, job, queue)
+    deadline = time.monotonic() + settings.JOB_STREAM_MAX_SECONDS
+
+    try:
+        yield b"retry: 3000\n\n"
+        while any(statuses[job] not in TERMINAL_STATUSES for job in watched):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return  # Client reconnects with Last-Event-ID
+            try:
+                update = await asyncio.wait_for(
+                    queue.get(),
+                    timeout=min(settings.JOB_STREAM_HEARTBEAT_SECONDS, remaining),
+                )
+            except asyncio.TimeoutError:
+                yield b": heartbeat\n\n"
+                continue
+            if update.status == statuses[update.job]:
+                continue  # Client already has it (e.g. after Last-Event-ID)
+            statuses[update.job] = update.status
+            yield _sse("job", update.to_json(), _event_id(jobs, statuses))
+
+        yield _sse("done", b"{}", _event_id(jobs, statuses))
+    finally:
+        for job in watched:
+            registry.unsubscribe(session.session_id, job, queue)
+
+
+@router.get("/api/jobs/stream")
+async def stream_jobs(
+    ids: str = Query(..., description="Comma-separated kind:id, kind in transcription, cleanup, analysis"),
+    last_event_id: Optional[str] = Header(default=None),
+    session: SessionModel = Depends(get_session),
+    registry: JobWatchRegistry = Depends(get_job_watches),
+    settings: Settings = Depends(get_settings),
+):
+    """Stream status transitions for transcription, cleanup and analysis jobs.
+
+    Example: /api/jobs/stream?ids=transcription:abc,analysis:def
+    """
+    try:
+        jobs = parse_job_refs(ids, MAX_STREAM_JOBS)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    statuses = _parse_event_id(jobs, last_event_id)
+    return StreamingResponse(
+        job_event_stream(registry, session, jobs, statuses, settings),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Don't let nginx buffer the stream
+        },
+    )
@@ -0,0 +1,46 @@
+"""Operational metrics endpoints.
+
+Exposes in-process metrics for upstream Core API calls so we can see which
+Core endpoint dominates tail latency. Not proxied by the frontend.
+"""
+
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.config import Settings, get_settings
+from app.core_client import CoreAPIClient, get_core_api
+
+router = APIRouter(tags=["metrics"])
+
+
+def require_metrics_token(
+    authorization: Optional[str] = Header(default=None),
+    settings: Settings = Depends(get_settings),
+) -> None:
+    """Require the METRICS_TOKEN bearer token.
+
+    Fails closed: with no token configured the endpoint doesn't exist (404),
+    except in development, where it is open for local profiling.
+    """
+    if not settings.METRICS_TOKEN:
+        if settings.ENVIRONMENT == "development":
+            return
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not authorization or not secrets.compare_digest(authorization, expected):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+
+@router.get("/metrics/core")
+async def get_core_metrics(
+    core_api: CoreAPIClient = Depends(get_core_api),
+    _auth: None = Depends(require_metrics_token),
+):
+    """Latency histograms, status classes, bytes and pool wait per Core endpoint.
+
+    Endpoints are keyed by method and path template (IDs replaced with {id})
+    and sorted by p99 latency, slowest first.
+    """
+    return core_api.metrics.snapshot()
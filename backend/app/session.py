@@ -135,7 +135,7 @@ async def _refresh_session_tokens(
     return session
 
 
-def _set_session_cookie(
+def set_session_cookie(
     response: Response,
     session_id: str,
 ) -> None:
@@ -157,7 +157,6 @@ def _set_session_cookie(
 
 async def get_or_create_session(
     request: Request,
-    response: Response,
     db: DBSession = Depends(get_db),
     settings: Settings = Depends(get_settings),
     core_api: CoreAPIClient = Depends(get_core_api),
@@ -174,7 +173,6 @@ async def get_or_create_session(
 
     Args:
         request: FastAPI request object
-        response: FastAPI response object
         db: Database session
         settings: Application settings
         core_api: CoreAPIClient instance
@@ -182,6 +180,11 @@ async def get_or_create_session(
     Returns:
         SessionModel instance (existing or newly created)
     """
+    # Items of POST /api/batch run with the batch's session (app/routes/batch.py)
+    batch_session = getattr(request.state, "batch_session", None)
+    if batch_session is not None:
+        return batch_session
+
     session_id = request.cookies.get(SESSION_COOKIE_NAME)
     ip_address = request.client.host if request.client else None
 
@@ -212,7 +215,10 @@ async def get_or_create_session(
         settings=settings,
         ip_address=ip_address,
     )
-    _set_session_cookie(response, session.session_id)
+    # The cookie is set by SessionCookieMiddleware so it also reaches clients
+    # when an endpoint returns a Response directly (FastAPI only merges the
+    # injected response's cookies into responses it builds itself).
+    request.state.new_session_id = session.session_id
 
     return session
 
@@ -0,0 +1,207 @@
+"""Optional re-encoding of uploads to compact Opus before they go to Core.
+
+Browser recordings arrive as WAV or high-bitrate WebM, and transcribe used
+to forward them to Core byte for byte. With AUDIO_TRANSCODE_ENABLED, large
+uploads in those formats are piped through a local ffmpeg into mono 16 kHz
+Opus (plenty for speech recognition), which is typically a tenth of the size
+or less.
+
+Design Decisions:
+1. STREAMED, NOT SPOOLED: ffmpeg's stdout is sent to Core as it is produced,
+   inside a streamed multipart body (app/utils/multipart.py). Nothing is
+   written to disk.
+2. FALL BACK BEFORE SENDING: The first output chunk is read before the Core
+   request starts. If ffmpeg is missing, every slot is busy, or ffmpeg
+   fails before producing output, the original file is forwarded instead.
+   A failure after output has started aborts the Core request (502), since
+   part of the body has already been sent.
+3. BOUNDED CONCURRENCY: At most `concurrency` ffmpeg processes run at once.
+   Uploads beyond that are forwarded untouched rather than queued.
+4. PATHS WHEN POSSIBLE: Uploads spooled to disk are read by ffmpeg from
+   their temp file path; small in-memory spools are fed through stdin.
+5. ONLY WHERE IT PAYS: Already-compressed formats (MP3, AAC, M4A, Ogg) and
+   files under `min_bytes` are forwarded as-is.
+"""
+
+import asyncio
+import shutil
+from pathlib import PurePath
+from typing import AsyncIterator, BinaryIO, Callable, Optional
+
+from fastapi import Request
+
+from app.utils.audio import upload_path
+from app.utils.logger import get_logger
+
+logger = get_logger("transcode")
+
+CHUNK_SIZE = 64 * 1024
+
+# Sniffed formats worth re-encoding (uncompressed, lossless or high bitrate)
+TRANSCODE_FORMATS = frozenset({"wav", "flac", "webm"})
+
+
+class TranscodeError(Exception):
+    """Raised when ffmpeg fails after its output has started streaming."""
+
+
+class Transcode:
+    """A running ffmpeg process whose Opus output is being streamed."""
+
+    def __init__(
+        self,
+        process: asyncio.subprocess.Process,
+        feeder: Optional[asyncio.Task],
+        release: Callable[[], None],
+        original_size: int,
+        filename: str,
+    ):
+        self.size = 0  # Output bytes streamed so far
+        self.original_size = original_size
+        self.filename = filename
+        self._process = process
+        self._feeder = feeder
+        self._release: Optional[Callable[[], None]] = release
+        self._first_chunk = b""
+
+    async def started(self) -> bool:
+        """Wait for the first output chunk; False if ffmpeg produced none."""
+        self._first_chunk = await self._process.stdout.read(CHUNK_SIZE)
+        return bool(self._first_chunk)
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yield ffmpeg's output to the end.
+
+        Raises:
+            TranscodeError: If ffmpeg exits with an error
+        """
+        try:
+            chunk = self._first_chunk
+            while chunk:
+                self.size += len(chunk)
+                yield chunk
+                chunk = await self._process.stdout.read(CHUNK_SIZE)
+            if await self._process.wait() != 0:
+                stderr = await self._process.stderr.read()
+                raise TranscodeError(stderr.decode("utf-8", "replace").strip() or "ffmpeg failed")
+            logger.info(
+                "Upload transcoded",
+                filename=self.filename,
+                original_bytes=self.original_size,
+                opus_bytes=self.size,
+                saved_bytes=self.saved_bytes,
+            )
+        finally:
+            await self.close()
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_size - self.size
+
+    async def close(self) -> None:
+        """Stop ffmpeg if it is still running and free its slot."""
+        if self._feeder is not None:
+            self._feeder.cancel()
+        if self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        if self._release is not None:
+            self._release()
+            self._release = None
+
+
+class AudioTranscoder:
+    """Runs ffmpeg to re-encode uploads as mono 16 kHz Opus."""
+
+    def __init__(
+        self,
+        ffmpeg: str = "ffmpeg",
+        concurrency: int = 2,
+        bitrate: str = "24k",
+        min_bytes: int = 256 * 1024,
+    ):
+        self.ffmpeg = shutil.which(ffmpeg)
+        self.bitrate = bitrate
+        self.min_bytes = min_bytes
+        self._semaphore = asyncio.Semaphore(concurrency)
+        if self.ffmpeg is None:
+            logger.warning("ffmpeg not found, uploads will be forwarded as-is", ffmpeg=ffmpeg)
+
+    def should_transcode(self, audio_format: Optional[str], size: int) -> bool:
+        return self.ffmpeg is not None and audio_format in TRANSCODE_FORMATS and size >= self.min_bytes
+
+    def _command(self, path: Optional[str]) -> list[str]:
+        source = ["-nostdin", "-i", path] if path else ["-i", "pipe:0"]
+        return [
+            self.ffmpeg, "-hide_banner", "-loglevel", "error",
+            *source,
+            "-vn", "-ac", "1", "-ar", "16000",
+            "-c:a", "libopus", "-b:a", self.bitrate, "-application", "voip",
+            "-f", "ogg", "pipe:1",
+        ]
+
+    async def start(self, file_obj: BinaryIO, filename: str, size: int) -> Optional[Transcode]:
+        """Start transcoding an upload of `size` bytes.
+
+        Returns:
+            A Transcode with its first output chunk already read, or None if
+            the upload should be forwarded as-is
+        """
+        if self.ffmpeg is None or self._semaphore.locked():
+            return None
+        await self._semaphore.acquire()
+
+        file_obj.flush()
+        path = upload_path(file_obj)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._command(path),
+                stdin=asyncio.subprocess.DEVNULL if path else asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            self._semaphore.release()
+            logger.warning("Could not start ffmpeg, forwarding as-is", filename=filename, error=str(e))
+            return None
+
+        feeder = None if path else asyncio.ensure_future(_feed(process, file_obj))
+        transcode = Transcode(process, feeder, self._semaphore.release, size, filename)
+        if not await transcode.started():
+            await transcode.close()
+            stderr = await process.stderr.read()
+            logger.warning(
+                "ffmpeg produced no output, forwarding as-is",
+                filename=filename,
+                error=stderr.decode("utf-8", "replace").strip(),
+            )
+            return None
+        return transcode
+
+
+async def _feed(process: asyncio.subprocess.Process, file_obj: BinaryIO) -> None:
+    """Write an in-memory upload to ffmpeg's stdin."""
+    file_obj.seek(0)
+    try:
+        while chunk := file_obj.read(CHUNK_SIZE):
+            process.stdin.write(chunk)
+            await process.stdin.drain()
+        process.stdin.close()
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # ffmpeg exited early; its exit code tells the story
+    finally:
+        file_obj.seek(0)
+
+
+def opus_filename(filename: Optional[str]) -> str:
+    """The upload's filename with an .opus extension."""
+    return f"{PurePath(filename or 'upload').stem}.opus"
+
+
+def get_audio_transcoder(request: Request) -> Optional[AudioTranscoder]:
+    """FastAPI dependency to get the app's AudioTranscoder.
+
+    Created at app startup and stored in app.state; None unless
+    AUDIO_TRANSCODE_ENABLED.
+    """
+    return request.app.state.audio_transcoder
@@ -0,0 +1,322 @@
+"""Streaming receiver for audio uploads (POST /api/transcribe).
+
+Declaring UploadFile/Form parameters makes FastAPI read and spool the whole
+multipart body before the endpoint runs, so size and duration limits could
+only be checked after the last byte had arrived. transcribe parses the body
+itself with receive_upload(), which enforces the limits while the body is
+still streaming in.
+
+Design Decisions:
+1. FAIL FAST ON SIZE: A Content-Length that can't fit MAX_UPLOAD_BYTES is
+   rejected with 413 before anything is read. Otherwise the body is counted
+   as it arrives and the request fails with 413 as soon as the file passes
+   the limit. The rest of the body is never read.
+2. EARLY FORMAT AND DURATION CHECKS: As soon as the first HEADER_PROBE_BYTES
+   of the file have arrived, its format is sniffed from the magic bytes and,
+   for WAV and FLAC, its duration read from the headers. Unrecognised content
+   and over-long files fail with 422 right there. Formats without duration
+   headers are probed once the upload is complete (AudioProber).
+3. SAME SPOOLING AS STARLETTE: The file is written to a SpooledTemporaryFile
+   wrapped in an UploadFile (in memory up to 1 MB, then on disk), so the
+   rest of the upload path is unchanged. The on-disk file is a named temp
+   file, so probe worker processes can open it by path (AudioProbePool).
+4. HASHED ON THE WAY IN: The file bytes are fed to BLAKE2b as they arrive,
+   so deduplication (app/upload_dedup.py) never re-reads the file.
+5. CHEAP CHECKS FIRST: With no body parameters on the endpoint, FastAPI
+   resolves the Turnstile and rate-limit dependencies before any of the
+   body is read.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from io import BytesIO
+from tempfile import NamedTemporaryFile, SpooledTemporaryFile
+from typing import AsyncIterator, Optional, Protocol, TypeVar
+
+from fastapi import HTTPException, UploadFile
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from python_multipart import MultipartParser
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import parse_options_header
+from starlette.datastructures import Headers
+
+from app.utils.audio import (
+    HEADER_PROBE_BYTES,
+    check_duration_limit,
+    header_duration,
+    require_audio_format,
+)
+from app.utils.logger import get_logger
+
+logger = get_logger("upload")
+
+SPOOL_MAX_SIZE = 1024 * 1024  # Same as Starlette's form parser
+FORM_OVERHEAD_BYTES = 64 * 1024  # Boundaries, part headers and text fields
+MAX_FIELD_BYTES = 64 * 1024
+MAX_FIELDS = 50
+
+FormModel = TypeVar("FormModel", bound=BaseModel)
+
+
+class UploadSink(Protocol):
+    """Receives the file part while it is still arriving (e.g. UploadTee)."""
+
+    def start(self, filename: str, content_type: str) -> None: ...
+
+    async def write(self, data: bytes) -> None: ...
+
+
+@dataclass
+class ReceivedUpload:
+    """A received multipart upload: one file plus text fields."""
+
+    file: Optional[UploadFile] = None
+    fields: dict[str, str] = field(default_factory=dict)
+    size: int = 0  # File bytes received
+    format: Optional[str] = None  # Sniffed audio format
+    duration: Optional[float] = None  # From the early header probe, if it could tell
+    content_hash: Optional[str] = None  # BLAKE2b hex digest of the file bytes
+
+    async def close(self) -> None:
+        if self.file is not None:
+            await self.file.close()
+
+
+class NamedSpooledTemporaryFile(SpooledTemporaryFile):
+    """SpooledTemporaryFile (binary) that rolls over to a named temp file.
+
+    Only the documented parts of SpooledTemporaryFile are relied on:
+    rollover() and the _file attribute (a BytesIO until rollover). Its
+    private rolled flag is left alone, so UploadFile keeps writing to the
+    file inline after rollover instead of through the threadpool; the
+    writes are single multipart chunks to a local temp file.
+    """
+
+    def rollover(self) -> None:
+        memory = self._file
+        if not isinstance(memory, BytesIO):
+            return  # Already on disk
+        self._file = NamedTemporaryFile(mode="w+b")
+        self._file.write(memory.getvalue())
+        self._file.seek(memory.tell())
+        memory.close()
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large (max {max_bytes / (1024 * 1024):.0f} MB)",
+    )
+
+
+class _Part:
+    """The multipart part currently being parsed."""
+
+    def __init__(self) -> None:
+        self.headers: list[tuple[bytes, bytes]] = []
+        self.name = ""
+        self.is_file = False
+        self.data = bytearray()  # Text fields only
+
+
+class _UploadReceiver:
+    """python-multipart callbacks enforcing the upload limits."""
+
+    def __init__(self, file_field: str, max_bytes: int, max_duration_seconds: float):
+        self.file_field = file_field
+        self.max_bytes = max_bytes
+        self.max_duration_seconds = max_duration_seconds
+        self.upload = ReceivedUpload()
+        self.pending: list[bytes] = []  # File data to write after each chunk
+        self._part = _Part()
+        self._header_name = b""
+        self._header_value = b""
+        self._head = bytearray()
+        self._hash = hashlib.blake2b()
+        self._probed = False
+        self._fields = 0
+
+    @property
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._part = _Part()
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._part.headers.append((self._header_name.lower(), self._header_value))
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(dict(self._part.headers).get(b"content-disposition", b""))
+        self._part.name = options.get(b"name", b"").decode("utf-8", "replace")
+
+        if b"filename" not in options:
+            self._fields += 1
+            if self._fields > MAX_FIELDS:
+                raise HTTPException(status_code=422, detail="Too many form fields")
+            return
+
+        if self._part.name != self.file_field or self.upload.file is not None:
+            raise HTTPException(status_code=422, detail=f"Unexpected file field {self._part.name!r}")
+        self._part.is_file = True
+        self.upload.file = UploadFile(
+            file=NamedSpooledTemporaryFile(max_size=SPOOL_MAX_SIZE),
+            size=0,
+            filename=options[b"filename"].decode("utf-8", "replace"),
+            headers=Headers(raw=self._part.headers),
+        )
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        if not self._part.is_file:
+            if len(self._part.data) + len(chunk) > MAX_FIELD_BYTES:
+                raise HTTPException(status_code=422, detail=f"Form field {self._part.name!r} too large")
+            self._part.data += chunk
+            return
+
+        self.upload.size += len(chunk)
+        if self.upload.size > self.max_bytes:
+            raise _too_large(self.max_bytes)
+        if not self._probed:
+            self._head += chunk[: HEADER_PROBE_BYTES - len(self._head)]
+            if len(self._head) >= HEADER_PROBE_BYTES:
+                self._probe(file_size=None)
+        self._hash.update(chunk)
+        self.pending.append(chunk)
+
+    def on_part_end(self) -> None:
+        if self._part.is_file:
+            if not self._probed:
+                self._probe(file_size=self.upload.size)  # The whole file fit in the head
+            self.upload.content_hash = self._hash.hexdigest()
+        else:
+            self.upload.fields[self._part.name] = self._part.data.decode("utf-8", "replace")
+
+    @property
+    def probed(self) -> bool:
+        return self._probed
+
+    def _probe(self, file_size: Optional[int]) -> None:
+        """Format and header-only duration checks on the start of the file."""
+        self._probed = True
+        head, self._head = bytes(self._head), bytearray()
+        filename = self.upload.file.filename or "unknown"
+        self.upload.format = require_audio_format(head, filename)
+        duration = header_duration(head, file_size)
+        if duration is not None:
+            self.upload.duration = check_duration_limit(duration, filename, self.max_duration_seconds)
+
+
+async def receive_upload(
+    headers: Headers,
+    stream: AsyncIterator[bytes],
+    max_bytes: int,
+    max_duration_seconds: float,
+    file_field: str = "file",
+    sink: Optional[UploadSink] = None,
+) -> ReceivedUpload:
+    """Receive a multipart upload, enforcing limits while it streams in.
+
+    Args:
+        headers: Request headers
+        stream: Request body chunks (request.stream())
+        max_bytes: Maximum file size
+        max_duration_seconds: Maximum audio duration (checked early for
+            formats with duration headers)
+        file_field: Name of the file field
+        sink: Also gets the file bytes as they arrive, starting once the
+            format check on the first HEADER_PROBE_BYTES has passed
+
+    Returns:
+        ReceivedUpload with the file rewound to offset 0. The caller must
+        close() it.
+
+    Raises:
+        HTTPException: 413 when the upload is too large, 415/400/422 for
+            malformed bodies
+        AudioValidationError: When the file isn't a recognised audio format
+            or its headers show it is too long
+        RequestValidationError: When the file field is missing
+    """
+    max_body = max_bytes + FORM_OVERHEAD_BYTES
+    content_length = headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_body:
+        raise _too_large(max_bytes)
+
+    content_type, params = parse_options_header(headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=415, detail="Expected a multipart/form-data upload")
+
+    receiver = _UploadReceiver(file_field, max_bytes, max_duration_seconds)
+    parser = MultipartParser(params[b"boundary"], receiver.callbacks)
+    received = 0
+    unsent: list[bytes] = []  # File data held back from the sink until the format check
+    sink_started = False
+    try:
+        async for chunk in stream:
+            received += len(chunk)
+            if received > max_body:
+                raise _too_large(max_bytes)
+            parser.write(chunk)
+            for data in receiver.pending:
+                await receiver.upload.file.write(data)
+            if sink is not None:
+                unsent.extend(receiver.pending)
+                if receiver.probed and unsent:
+                    if not sink_started:
+                        file = receiver.upload.file
+                        sink.start(file.filename or "upload", file.content_type or "application/octet-stream")
+                        sink_started = True
+                    for data in unsent:
+                        await sink.write(data)
+                    unsent.clear()
+            receiver.pending.clear()
+        parser.finalize()
+    except MultipartParseError as e:
+        await receiver.upload.close()
+        raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}")
+    except BaseException:
+        await receiver.upload.close()
+        raise
+
+    upload = receiver.upload
+    if upload.file is None:
+        raise RequestValidationError(
+            [{"type": "missing", "loc": ("body", file_field), "msg": "Field required", "input": None}]
+        )
+    await upload.file.seek(0)
+    return upload
+
+
+def parse_form_fields(model: type[FormModel], fields: dict[str, str]) -> FormModel:
+    """Validate text form fields like FastAPI's Form() parameters would.
+
+    Empty values fall back to the field default, and errors become the usual
+    422 response with ("body", field) locations.
+
+    Raises:
+        RequestValidationError: If a field fails validation
+    """
+    try:
+        return model.model_validate({name: value for name, value in fields.items() if value != ""})
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
@@ -0,0 +1,81 @@
+"""Per-session deduplication of audio uploads.
+
+Users often upload the same recording again after a failed request or a page
+refresh. Each of those spent a rate-limit slot and a full Core transcription.
+POST /api/transcribe now hashes the file while it streams in and looks the
+(content hash, options) pair up here before calling Core.
+
+Design Decisions:
+1. SESSION-SCOPED: Rows are keyed by (session_id, content_hash, options_hash).
+   A hit only ever returns entries the same session created, so an upload
+   can't reveal that another user has the same recording.
+2. OPTIONS ARE PART OF THE KEY: The options hash covers every field sent to
+   Core (language, diarization, cleanup and analysis settings). The same
+   file with different options is a new transcription.
+3. REPLAY THE ORIGINAL RESPONSE: A hit returns Core's upload response as
+   first sent (with 200 rather than 202). The status fields in it may be
+   stale; clients poll the job IDs as usual.
+4. ONLY LIVE ENTRIES: Before replaying, the route checks the transcription
+   with Core. If the entry is gone or its transcription failed, the upload
+   goes through normally (and its row is overwritten on success), so
+   re-uploading after a failure still retries.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session as DBSession
+
+from app.models import UploadDedup
+
+
+def options_hash(options: dict[str, str]) -> str:
+    """Stable hash of the form fields sent to Core."""
+    encoded = json.dumps(options, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def lookup_upload(db: DBSession, session_id: str, content_hash: str, options: str) -> Optional[UploadDedup]:
+    """Previous upload of the same file with the same options, or None."""
+    return db.get(UploadDedup, (session_id, content_hash, options))
+
+
+def record_upload(
+    db: DBSession,
+    session_id: str,
+    content_hash: str,
+    options: str,
+    created: dict,
+    response_body: bytes,
+) -> None:
+    """Record a successful upload and Core's response to it."""
+    values = {
+        "entry_id": str(created["entry_id"]),
+        "transcription_id": str(created["transcription_id"]) if created.get("transcription_id") else None,
+        "response_body": response_body.decode(),
+        "created_at": datetime.utcnow(),
+    }
+    stmt = insert(UploadDedup).values(
+        session_id=session_id,
+        content_hash=content_hash,
+        options_hash=options,
+        **values,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UploadDedup.session_id, UploadDedup.content_hash, UploadDedup.options_hash],
+        set_=values,
+    )
+    db.execute(stmt)
+    db.commit()
+
+
+def forget_entry_uploads(db: DBSession, session_id: str, entry_id: str) -> None:
+    """Drop every upload row pointing at a deleted entry."""
+    db.query(UploadDedup).filter(
+        UploadDedup.session_id == session_id,
+        UploadDedup.entry_id == entry_id,
+    ).delete()
+    db.commit()
@@ -0,0 +1,118 @@
+"""Forwarding an upload to Core while it is still being received.
+
+transcribe used to receive the whole upload, validate it, and only then send
+it to Core, so the client's upload time and Core's ingest time added up.
+With UPLOAD_STREAM_THROUGH_ENABLED the body is consumed once: each file
+chunk is spooled and hashed (receive_upload), probed, and handed to an
+UploadTee, which streams it into the Core request right away.
+
+Design Decisions:
+1. FILE FIRST, FIELDS LAST: The frontend appends the file before the other
+   form fields, and the fields can only be validated once the whole body is
+   in. The outgoing body therefore carries the file part first and the text
+   fields after it; part order doesn't matter to Core's form parser.
+2. ABORT = INCOMPLETE BODY: If validation fails partway (size, format,
+   duration, form fields) or the upload turns out to be a duplicate, the
+   Core request is cancelled. The connection closes before the closing
+   boundary, so Core never sees a complete upload and creates no entry.
+3. FORMAT CHECK BEFORE FORWARDING: Nothing is sent until the format sniff
+   on the first HEADER_PROBE_BYTES has passed (receive_upload holds the
+   bytes back until then).
+4. BACKPRESSURE: At most `max_buffered_chunks` chunks wait for Core. A slow
+   Core slows down reading the client's body rather than growing memory.
+5. EARLY CORE ERRORS: If the Core request ends before the body is complete
+   (e.g. a connection error), chunks are dropped while the upload is still
+   received and validated, and finish() reports Core's outcome.
+"""
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from app.core_client import CoreAPIClient
+from app.utils.multipart import closing, content_type, field_part, file_part_header, new_boundary
+
+
+class UploadTee:
+    """Streams an upload's file part into a Core request as it arrives.
+
+    Implements the UploadSink protocol of receive_upload().
+    """
+
+    def __init__(
+        self,
+        core_api: CoreAPIClient,
+        path: str,
+        access_token: str,
+        file_field: str = "file",
+        max_buffered_chunks: int = 16,
+    ):
+        self.bytes_sent = 0
+        self._core_api = core_api
+        self._path = path
+        self._access_token = access_token
+        self._file_field = file_field
+        self._boundary = new_boundary()
+        self._queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(max_buffered_chunks)
+        self._fields: asyncio.Future[dict[str, str]] = asyncio.get_running_loop().create_future()
+        self._upstream: Optional[asyncio.Task] = None
+
+    @property
+    def started(self) -> bool:
+        return self._upstream is not None
+
+    def start(self, filename: str, media_type: str) -> None:
+        """Open the Core request; the body follows as write() is called."""
+        self._upstream = asyncio.ensure_future(
+            self._core_api.request(
+                "POST",
+                self._path,
+                self._access_token,
+                content=self._body(filename, media_type),
+                headers={"Content-Type": content_type(self._boundary)},
+            )
+        )
+
+    async def write(self, data: bytes) -> None:
+        await self._put(data)
+
+    async def finish(self, fields: dict[str, str]) -> httpx.Response:
+        """Send the text fields, complete the body and wait for Core's response.
+
+        Raises:
+            CoreAPIError: If Core couldn't be reached
+        """
+        self._fields.set_result(fields)
+        await self._put(None)
+        return await self._upstream
+
+    async def abort(self) -> None:
+        """Abandon the Core request, leaving its body incomplete."""
+        if self._upstream is None:
+            return
+        if self._upstream.done():
+            if not self._upstream.cancelled():
+                self._upstream.exception()  # Mark as retrieved
+            return
+        self._upstream.cancel()
+        await asyncio.wait({self._upstream})
+
+    async def _put(self, item: Optional[bytes]) -> None:
+        """Queue an item for the body, unless the Core request already ended."""
+        if self._upstream.done():
+            return
+        put = asyncio.ensure_future(self._queue.put(item))
+        await asyncio.wait({put, self._upstream}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+
+    async def _body(self, filename: str, media_type: str) -> AsyncIterator[bytes]:
+        yield file_part_header(self._boundary, self._file_field, filename, media_type)
+        while (chunk := await self._queue.get()) is not None:
+            self.bytes_sent += len(chunk)
+            yield chunk
+        yield b"\r\n"
+        for name, value in (await self._fields).items():
+            yield field_part(self._boundary, name, value)
+        yield closing(self._boundary)
@@ -1,14 +1,48 @@
 """Audio file validation utilities using mutagen."""
 
+import asyncio
+import io
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
+from fastapi import Request
 from mutagen import File as MutagenFile
+from mutagen.aac import AAC
+from mutagen.flac import FLAC
+from mutagen.mp3 import MP3
+from mutagen.mp4 import MP4
+from mutagen.oggflac import OggFLAC
+from mutagen.oggopus import OggOpus
+from mutagen.oggvorbis import OggVorbis
+from mutagen.wave import WAVE
 
 from app.utils.logger import get_logger
 
 logger = get_logger("audio")
 
+# Bytes read for header-only probing
+HEADER_PROBE_BYTES = 64 * 1024
+
+# Sniffed format -> mutagen parsers to try (WebM/Matroska has none)
+MUTAGEN_PARSERS = {
+    "mp3": [MP3],
+    "aac": [AAC],
+    "wav": [WAVE],
+    "ogg": [OggOpus, OggVorbis, OggFLAC],
+    "flac": [FLAC],
+    "mp4": [MP4],
+    "webm": [],
+}
+
+# ISO-BMFF major brands that can hold an audio track mutagen's MP4 parser
+# reads (plus any 3gp*); HEIC images, QuickTime video etc. are rejected
+MP4_AUDIO_BRANDS = frozenset({b"M4A ", b"M4B ", b"isom", b"iso2", b"mp41", b"mp42", b"dash"})
+
 
 class AudioValidationError(Exception):
     """Raised when audio validation fails."""
@@ -19,22 +53,129 @@ class AudioValidationError(Exception):
         super().__init__(message)
 
 
-def get_audio_duration(file_content: bytes, filename: str) -> Optional[float]:
-    """Extract duration from audio file bytes.
-
-    Args:
-        file_content: Raw audio file bytes
-        filename: Original filename (used for format detection)
+def sniff_audio_format(head: bytes) -> Optional[str]:
+    """Identify an audio container from its magic bytes.
 
     Returns:
-        Duration in seconds, or None if duration cannot be determined
+        A MUTAGEN_PARSERS key, or None if the content isn't a format we accept
+    """
+    if head[:3] == b"ID3":
+        # ID3v2 tag: usually MP3, occasionally prepended to FLAC or AAC
+        tag_size = 10 + sum((b & 0x7F) << (7 * (3 - i)) for i, b in enumerate(head[6:10]))
+        if head[5:6] and head[5] & 0x10:
+            tag_size += 10  # Footer
+        inner = sniff_audio_format(head[tag_size:]) if len(head) > tag_size + 4 else None
+        return inner if inner in ("flac", "aac") else "mp3"
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[4:8] == b"ftyp":
+        # ISO-BMFF also covers HEIC images and QuickTime video; the major brand says which
+        brand = head[8:12]
+        return "mp4" if brand in MP4_AUDIO_BRANDS or brand.startswith(b"3gp") else None
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0:
+        # MPEG frame sync: layer bits 00 mean ADTS AAC, anything else MP3
+        return "aac" if head[1] & 0x06 == 0 else "mp3"
+    return None
+
+
+def require_audio_format(head: bytes, filename: str) -> str:
+    """Sniff the format, rejecting content that isn't audio we accept.
 
     Raises:
-        AudioValidationError: If the file is corrupt or unreadable
+        AudioValidationError: If the format isn't recognised
     """
+    audio_format = sniff_audio_format(head)
+    if audio_format is None:
+        logger.warning("Rejected upload with unrecognised format", filename=filename)
+        raise AudioValidationError(
+            message="Unsupported audio format (expected MP3, WAV, OGG/Opus, FLAC, M4A or WebM)",
+            error_type="unsupported_format",
+        )
+    return audio_format
+
+
+def _read_head(file_obj: BinaryIO) -> bytes:
+    file_obj.seek(0)
+    head = file_obj.read(HEADER_PROBE_BYTES)
+    file_obj.seek(0)
+    return head
+
+
+def _file_size(file_obj: BinaryIO) -> int:
+    file_obj.seek(0, os.SEEK_END)
+    return file_obj.tell()
+
+
+def _wav_duration(head: bytes, file_size: Optional[int]) -> Optional[float]:
+    """Duration of a RIFF/WAVE file from its fmt and data chunk headers.
+
+    file_size, when known, corrects data sizes that overrun the file.
+    """
+    if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return None
+
+    pos, byte_rate = 12, 0
+    while pos + 8 <= len(head):
+        chunk_id = head[pos : pos + 4]
+        size = int.from_bytes(head[pos + 4 : pos + 8], "little")
+        body = pos + 8
+        if chunk_id == b"fmt " and body + 12 <= len(head):
+            byte_rate = int.from_bytes(head[body + 8 : body + 12], "little")
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            # Streamed recordings may leave the size unset (0 or 0xFFFFFFFF)
+            if file_size is not None and (size in (0, 0xFFFFFFFF) or body + size > file_size):
+                size = file_size - body
+            elif size in (0, 0xFFFFFFFF):
+                return None
+            return size / byte_rate
+        pos = body + size + (size & 1)  # Chunks are word-aligned
+    return None
+
+
+def _flac_duration(head: bytes) -> Optional[float]:
+    """Duration of a FLAC file from its STREAMINFO block."""
+    if len(head) < 42 or head[:4] != b"fLaC" or head[4] & 0x7F != 0:
+        return None
+    # STREAMINFO bytes 10-17: sample rate (20 bits), channels (3),
+    # bits per sample (5), total samples (36)
+    packed = int.from_bytes(head[18:26], "big")
+    sample_rate = packed >> 44
+    total_samples = packed & ((1 << 36) - 1)
+    if not sample_rate or not total_samples:
+        return None
+    return total_samples / sample_rate
+
+
+def header_duration(head: bytes, file_size: Optional[int] = None) -> Optional[float]:
+    """Duration from the first bytes of a file, for formats that store it in
+    their headers (WAV, FLAC); None for other formats or missing headers.
+
+    Args:
+        head: The first bytes of the file (HEADER_PROBE_BYTES is plenty)
+        file_size: Total file size, if known
+    """
+    duration = _wav_duration(head, file_size) or _flac_duration(head)
+    return duration if duration and duration > 0 else None
+
+
+def _mutagen_duration(file_obj: BinaryIO, filename: str, audio_format: str) -> Optional[float]:
+    """Extract duration by parsing the file with the format's mutagen parser."""
+    parsers = MUTAGEN_PARSERS[audio_format]
+    if not parsers:
+        logger.info("No duration parser for format", filename=filename, format=audio_format)
+        return None
+
     try:
-        file_obj = BytesIO(file_content)
-        audio = MutagenFile(file_obj, filename=filename)
+        file_obj.seek(0)
+        audio = MutagenFile(file_obj, filename=filename, options=parsers)
 
         if audio is None:
             logger.warning(
@@ -72,23 +213,50 @@ def get_audio_duration(file_content: bytes, filename: str) -> Optional[float]:
         return None
 
 
-def validate_audio_duration(
-    file_content: bytes,
+def get_audio_duration(audio_file: Union[bytes, BinaryIO], filename: str) -> Optional[float]:
+    """Extract duration from audio file bytes or a seekable file.
+
+    Sniffs the format from its magic bytes, tries the header-only probe and
+    falls back to the format's mutagen parser.
+
+    Args:
+        audio_file: Raw audio file bytes, or a seekable binary file (e.g. an
+            upload's spooled temp file). Files are probed in place, not read
+            into memory, and are left positioned at offset 0.
+        filename: Original filename (used for format detection)
+
+    Returns:
+        Duration in seconds, or None if the format isn't recognised or the
+        duration cannot be determined
+    """
+    file_obj = BytesIO(audio_file) if isinstance(audio_file, bytes) else audio_file
+    try:
+        head = _read_head(file_obj)
+        audio_format = sniff_audio_format(head)
+        if audio_format is None:
+            logger.warning("Could not identify audio format", filename=filename)
+            return None
+        duration = header_duration(head, _file_size(file_obj))
+        if duration is not None:
+            return duration
+        return _mutagen_duration(file_obj, filename, audio_format)
+    finally:
+        file_obj.seek(0)
+
+
+def check_duration_limit(
+    duration: Optional[float],
     filename: str,
     max_duration_seconds: float,
-) -> None:
-    """Validate that audio file duration is within limits.
+) -> Optional[float]:
+    """Check a probed duration against the limit.
 
-    Args:
-        file_content: Raw audio file bytes
-        filename: Original filename
-        max_duration_seconds: Maximum allowed duration in seconds
+    Returns:
+        The duration, or None if it couldn't be determined
 
     Raises:
-        AudioValidationError: If file exceeds duration limit or is unreadable
+        AudioValidationError: If the duration exceeds the limit
     """
-    duration = get_audio_duration(file_content, filename)
-
     if duration is None:
         # Cannot determine duration - allow file through
         # Core API will do further validation
@@ -96,7 +264,7 @@ def validate_audio_duration(
             "Audio duration unknown, allowing file",
             filename=filename,
         )
-        return
+        return None
 
     if duration > max_duration_seconds:
         max_minutes = max_duration_seconds / 60
@@ -112,3 +280,301 @@ def validate_audio_duration(
         duration_seconds=f"{duration:.2f}",
         max_seconds=max_duration_seconds,
     )
+    return duration
+
+
+def validate_audio_duration(
+    audio_file: Union[bytes, BinaryIO],
+    filename: str,
+    max_duration_seconds: float,
+) -> Optional[float]:
+    """Validate that audio file duration is within limits.
+
+    Args:
+        audio_file: Raw audio file bytes or a seekable binary file
+        filename: Original filename
+        max_duration_seconds: Maximum allowed duration in seconds
+
+    Returns:
+        Duration in seconds, or None if it couldn't be determined
+
+    Raises:
+        AudioValidationError: If the format isn't recognised or the file
+            exceeds the duration limit
+    """
+    file_obj = BytesIO(audio_file) if isinstance(audio_file, bytes) else audio_file
+    require_audio_format(_read_head(file_obj), filename)
+    duration = get_audio_duration(file_obj, filename)
+    return check_duration_limit(duration, filename, max_duration_seconds)
+
+
+class _PositionalReader(io.RawIOBase):
+    """Read-only view of a file descriptor with its own position (os.pread).
+
+    Lets a worker thread parse an upload while the request keeps using the
+    original file object, without the two fighting over one file offset.
+    The descriptor is duplicated, so it stays valid (and can't be reused for
+    another file) if the request closes the upload while a timed-out probe
+    is still reading; close() releases the duplicate.
+    """
+
+    def __init__(self, fd: int):
+        self._fd = os.dup(fd)
+        self._pos = 0
+
+    def close(self) -> None:
+        if not self.closed:
+            os.close(self._fd)
+        super().close()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = os.pread(self._fd, len(buffer), self._pos)
+        buffer[: len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += os.fstat(self._fd).st_size
+        self._pos = max(offset, 0)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def _independent_handle(audio_file: Union[bytes, BinaryIO]) -> BinaryIO:
+    """A handle on the same bytes that doesn't share audio_file's position."""
+    if isinstance(audio_file, bytes):
+        return BytesIO(audio_file)
+    try:
+        # Spooled uploads roll over to disk here, which is what we want
+        return _PositionalReader(audio_file.fileno())
+    except (AttributeError, OSError):
+        # Purely in-memory file (e.g. BytesIO): snapshot it
+        audio_file.seek(0)
+        snapshot = BytesIO(audio_file.read())
+        audio_file.seek(0)
+        return snapshot
+
+
+def upload_path(file_obj: BinaryIO) -> Optional[str]:
+    """Path another process can open to read file_obj, if it has one.
+
+    Uploads spooled to disk by app/upload.py are named files; in-memory
+    spools and anonymous temp files have no path.
+    """
+    name = getattr(file_obj, "name", None)
+    return name if isinstance(name, str) and os.path.isfile(name) else None
+
+
+def _memory_contents(file_obj: BinaryIO) -> bytes:
+    """Bytes of an upload that has no path, read without rolling a spool over to disk."""
+    buffer = getattr(file_obj, "_file", file_obj)  # SpooledTemporaryFile's documented _file is a BytesIO until rollover
+    if isinstance(buffer, BytesIO):
+        return buffer.getvalue()
+    with _independent_handle(file_obj) as handle:  # Anonymous temp file
+        return handle.read()
+
+
+def _probe_file(source: Union[str, bytes], filename: str, audio_format: str) -> Optional[float]:
+    """Process pool job: mutagen duration of a file path (or a small in-memory upload)."""
+    if isinstance(source, bytes):
+        return _mutagen_duration(BytesIO(source), filename, audio_format)
+    with open(source, "rb") as file_obj:
+        return _mutagen_duration(file_obj, filename, audio_format)
+
+
+def _run_with_deadline(job, deadline: float, *args):
+    """Process pool job wrapper: the worker dies of SIGALRM if job overruns deadline.
+
+    SIGALRM's default action terminates the process, even while mutagen is
+    stuck inside a single call, so the pool never has to reach into its
+    workers to stop a probe.
+    """
+    signal.setitimer(signal.ITIMER_REAL, deadline)
+    try:
+        return job(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _probe_and_close(file_obj: BinaryIO, filename: str, audio_format: str) -> Optional[float]:
+    """Thread job: mutagen duration of an independent handle, closed when the parse returns."""
+    with file_obj:
+        return _mutagen_duration(file_obj, filename, audio_format)
+
+
+class AudioProbePool:
+    """Worker processes for mutagen probes.
+
+    mutagen is pure Python and holds the GIL while it parses, so under a
+    burst of uploads probe threads compete with the event loop serving
+    polls. The pool moves that CPU work into separate processes.
+
+    Design Decisions:
+    1. PATHS, NOT BYTES: Uploads spooled to disk are sent to the worker as
+       their temp file path and reopened there, so the audio is never copied
+       through a pipe. In-memory spools (at most 1 MB) are sent as bytes
+       straight from their buffer, without rolling them over to disk.
+    2. BOUNDED QUEUE: At most `workers + max_queue` probes are in flight.
+       Beyond that a probe returns None straight away, which like a timeout
+       means the file is allowed through and Core validates it.
+    3. TIMEOUT KILLS THE WORKER: Unlike a thread, a process stuck on a
+       pathological file can be stopped. Each probe runs under a SIGALRM
+       deadline of `timeout` in its worker, so a stuck worker kills itself.
+       When a running probe times out, the pool is replaced and the old one
+       shut down; other probes still on it return None.
+    4. WORKER RECYCLING: Each worker exits after `max_tasks_per_worker`
+       probes so parser memory growth can't accumulate. This needs the
+       forkserver (or spawn) start method rather than fork.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int = 32,
+        max_tasks_per_worker: int = 100,
+        timeout: float = 5.0,
+    ):
+        self.workers = workers
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(workers + max_queue)
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(method),
+            max_tasks_per_child=self.max_tasks_per_worker,
+        )
+
+    async def duration(self, audio_file: Union[bytes, BinaryIO], filename: str, audio_format: str) -> Optional[float]:
+        """Probe a file's duration in a worker (None if unknown, too slow or the queue is full)."""
+        if self._slots.locked():
+            logger.warning("Audio probe queue full, allowing through", filename=filename)
+            return None
+
+        async with self._slots:
+            if isinstance(audio_file, bytes):
+                source: Union[str, bytes] = audio_file
+            else:
+                audio_file.flush()
+                source = upload_path(audio_file) or _memory_contents(audio_file)
+
+            executor = self._executor
+            try:
+                future = executor.submit(_run_with_deadline, _probe_file, self.timeout, source, filename, audio_format)
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Audio probe timed out, allowing through", filename=filename, timeout=self.timeout)
+                if future.running():
+                    self._recycle(executor)
+                return None
+            except (BrokenProcessPool, RuntimeError) as e:
+                logger.warning("Audio probe worker failed, allowing through", filename=filename, error=str(e))
+                self._recycle(executor)
+                return None
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Replace the pool and shut down the old one (a probe on it is stuck or it broke)."""
+        if executor is not self._executor:
+            return  # Another probe already replaced it
+        self._executor = self._new_executor()
+        # The stuck worker exits at its deadline (_run_with_deadline)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AudioProber:
+    """Probes upload durations without blocking the event loop.
+
+    Design Decisions:
+    1. HEADERS FIRST: The format is sniffed from the first HEADER_PROBE_BYTES
+       inline; WAV and FLAC also carry their duration there.
+    2. MUTAGEN IN A THREAD: MP3, AAC, OGG and M4A are parsed by the sniffed
+       format's mutagen parser in a worker thread, at most `concurrency` at a
+       time. WebM has no mutagen parser, so its duration is left to Core.
+    3. TIMEOUT = UNKNOWN: A probe that takes longer than `timeout` (queueing
+       included) is treated like an unknown duration - the file is allowed
+       through and Core does its own validation. The thread can't be killed,
+       so it keeps its concurrency slot until it finishes, and it reads from
+       an independent handle so the upload can be forwarded meanwhile.
+    4. OPTIONAL PROCESS POOL: With a `pool`, mutagen runs in worker processes
+       instead (AudioProbePool), which owns the timeout and can kill a stuck
+       probe.
+    """
+
+    def __init__(self, concurrency: int = 4, timeout: float = 5.0, pool: Optional[AudioProbePool] = None):
+        self.timeout = timeout
+        self.pool = pool
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def duration(self, audio_file: Union[bytes, BinaryIO], filename: str) -> Optional[float]:
+        """Probe an upload's duration (None if unknown or too slow to tell)."""
+        file_obj = BytesIO(audio_file) if isinstance(audio_file, bytes) else audio_file
+        head = _read_head(file_obj)
+        audio_format = sniff_audio_format(head)
+        if audio_format is None:
+            return None
+        duration = header_duration(head, _file_size(file_obj))
+        file_obj.seek(0)
+        if duration is not None or not MUTAGEN_PARSERS[audio_format]:
+            return duration
+
+        if self.pool is not None:
+            return await self.pool.duration(audio_file, filename, audio_format)
+
+        probe = asyncio.ensure_future(
+            self._probe_in_thread(_independent_handle(audio_file), filename, audio_format)
+        )
+        try:
+            return await asyncio.wait_for(asyncio.shield(probe), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Audio probe timed out, allowing through", filename=filename, timeout=self.timeout)
+            return None
+
+    async def validate(
+        self,
+        audio_file: Union[bytes, BinaryIO],
+        filename: str,
+        max_duration_seconds: float,
+    ) -> Optional[float]:
+        """Async validate_audio_duration.
+
+        Raises:
+            AudioValidationError: If the format isn't recognised or the file
+                exceeds the duration limit
+        """
+        file_obj = BytesIO(audio_file) if isinstance(audio_file, bytes) else audio_file
+        require_audio_format(_read_head(file_obj), filename)
+        duration = await self.duration(file_obj, filename)
+        return check_duration_limit(duration, filename, max_duration_seconds)
+
+    async def _probe_in_thread(self, file_obj: BinaryIO, filename: str, audio_format: str) -> Optional[float]:
+        async with self._semaphore:
+            return await asyncio.to_thread(_probe_and_close, file_obj, filename, audio_format)
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+
+
+def get_audio_prober(request: Request) -> AudioProber:
+    """FastAPI dependency to get the app's AudioProber.
+
+    Created at app startup and stored in app.state.
+    """
+    return request.app.state.audio_prober
@@ -0,0 +1,73 @@
+"""HTTP Range helpers (RFC 9110 14) for audio downloads."""
+
+import re
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+_RANGE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+@dataclass(frozen=True)
+class ByteRange:
+    """A single byte range as requested: bytes=start-end, start- or -suffix."""
+
+    start: Optional[int]  # None for a suffix range
+    end: Optional[int]  # Inclusive; None for open-ended; suffix length for suffix ranges
+
+    def resolve(self, total: int) -> Optional[tuple[int, int]]:
+        """Inclusive (start, end) within a body of `total` bytes, or None if unsatisfiable."""
+        if self.start is None:
+            if not self.end or total == 0:
+                return None
+            return max(total - self.end, 0), total - 1
+        if self.start >= total:
+            return None
+        end = total - 1 if self.end is None else min(self.end, total - 1)
+        return self.start, end
+
+
+def parse_range(value: Optional[str]) -> Optional[ByteRange]:
+    """Parse a Range header.
+
+    Only single ranges are supported; multi-range and malformed headers
+    return None, and the caller serves the full body (RFC 9110 allows a
+    server to ignore Range).
+    """
+    match = _RANGE.match(value or "")
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    start = int(match.group(1)) if match.group(1) else None
+    end = int(match.group(2)) if match.group(2) else None
+    if start is not None and end is not None and end < start:
+        return None
+    return ByteRange(start, end)
+
+
+def if_range_matches(if_range: Optional[str], etag: Optional[str], last_modified: Optional[str]) -> bool:
+    """Whether an If-Range precondition holds (true when there is none).
+
+    ETags use strong comparison as RFC 9110 13.1.5 requires, so weak ETags
+    never match; dates must match Last-Modified exactly.
+    """
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(("W/", '"')):
+        return etag is not None and not etag.startswith("W/") and if_range == etag
+    return last_modified is not None and if_range == last_modified
+
+
+def content_range(start: int, end: int, total: int) -> str:
+    return f"bytes {start}-{end}/{total}"
+
+
+async def slice_stream(chunks: AsyncIterator[bytes], start: int, end: int) -> AsyncIterator[bytes]:
+    """Yield bytes start..end (inclusive) of a chunked body, then stop reading."""
+    position = 0
+    async for chunk in chunks:
+        chunk_end = position + len(chunk)
+        if chunk_end > start:
+            yield chunk[max(start - position, 0) : end + 1 - position]
+        position = chunk_end
+        if position > end:
+            return
@@ -0,0 +1,46 @@
+"""ETag helpers for conditional GETs."""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body (quoted, 128-bit BLAKE2b)."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag.
+
+    Uses weak comparison (RFC 9110 13.1.2), which is what If-None-Match asks
+    for: W/"x" matches "x".
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == target
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_response(
+    request: Request,
+    content: bytes,
+    etag: str,
+    media_type: str = "application/json",
+) -> Response:
+    """Return content with its ETag, or 304 Not Modified if the client has it.
+
+    Cache-Control: private, no-cache lets the browser keep the body but makes
+    it revalidate every time, so polling clients get a 304 until it changes.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
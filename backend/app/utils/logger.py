@@ -203,6 +203,14 @@ def setup_logging(settings: "Settings") -> None:
     print("CORE API")
     print("=" * 60)
     print(f"CORE_API_URL:              {settings.CORE_API_URL}")
+    print(f"CORE_HEDGE_ENABLED:        {settings.CORE_HEDGE_ENABLED}")
+    print(f"ENTRY_VIEW_BRANCH_TIMEOUT: {settings.ENTRY_VIEW_BRANCH_TIMEOUT_SECONDS}s")
+    print(f"ENTRY_VIEW_CACHE:          {settings.ENTRY_VIEW_CACHE_MAX_ENTRIES} views, {settings.ENTRY_VIEW_CACHE_TTL_SECONDS}s TTL")
+    print(f"ENTRIES_EXPAND_CONCURRENCY: {settings.ENTRIES_EXPAND_CONCURRENCY}")
+    print(f"BATCH_MAX_ITEMS:           {settings.BATCH_MAX_ITEMS}")
+    print(f"JOB_POLL_INTERVAL:         {settings.JOB_POLL_MIN_INTERVAL_SECONDS}s-{settings.JOB_POLL_MAX_INTERVAL_SECONDS}s")
+    print(f"LONG_POLL:                 max {settings.LONG_POLL_MAX_WAIT_SECONDS}s, {settings.LONG_POLL_MAX_HELD} held")
+    print(f"JOB_POLL_HINT:             {settings.JOB_POLL_HINT_MIN_SECONDS}s-{settings.JOB_POLL_HINT_MAX_SECONDS}s")
     print("=" * 60)
     print("SESSION")
     print("=" * 60)
@@ -220,6 +228,22 @@ def setup_logging(settings: "Settings") -> None:
     print(f"RATE_LIMIT_LLM_IP_DAY:     {settings.RATE_LIMIT_LLM_IP_DAY}")
     print(f"RATE_LIMIT_LLM_GLOBAL_DAY: {settings.RATE_LIMIT_LLM_GLOBAL_DAY}")
     print("=" * 60)
+    print("AUDIO VALIDATION")
+    print("=" * 60)
+    print(f"MAX_AUDIO_DURATION:        {settings.MAX_AUDIO_DURATION_SECONDS}s")
+    print(f"MAX_UPLOAD_BYTES:          {settings.MAX_UPLOAD_BYTES}")
+    print(f"UPLOAD_STREAM_THROUGH:     {settings.UPLOAD_STREAM_THROUGH_ENABLED}")
+    print(f"UPLOAD_DEDUP_ENABLED:      {settings.UPLOAD_DEDUP_ENABLED}")
+    if settings.AUDIO_PROBE_PROCESSES > 0:
+        print(f"AUDIO_PROBE:               {settings.AUDIO_PROBE_PROCESSES} processes (queue {settings.AUDIO_PROBE_QUEUE_SIZE}), {settings.AUDIO_PROBE_TIMEOUT_SECONDS}s timeout")
+    else:
+        print(f"AUDIO_PROBE:               {settings.AUDIO_PROBE_CONCURRENCY} threads, {settings.AUDIO_PROBE_TIMEOUT_SECONDS}s timeout")
+    if settings.AUDIO_TRANSCODE_ENABLED:
+        print(f"AUDIO_TRANSCODE:           {settings.AUDIO_TRANSCODE_FFMPEG}, {settings.AUDIO_TRANSCODE_CONCURRENCY} processes, {settings.AUDIO_TRANSCODE_BITRATE}")
+    else:
+        print("AUDIO_TRANSCODE:           disabled")
+    print(f"AUDIO_CACHE:               {settings.AUDIO_CACHE_DIR}, {settings.AUDIO_CACHE_MAX_BYTES} bytes")
+    print("=" * 60)
     print("CORS")
     print("=" * 60)
     print(f"CORS_ORIGINS:              {settings.CORS_ORIGINS}")
@@ -231,6 +255,10 @@ def setup_logging(settings: "Settings") -> None:
     print(f"TURNSTILE_SECRET_KEY:      {mask(settings.TURNSTILE_SECRET_KEY)}")
     print(f"TURNSTILE_ACTIVE:          {turnstile_active}")
     print("=" * 60)
+    print("METRICS")
+    print("=" * 60)
+    print(f"METRICS_TOKEN:             {mask(settings.METRICS_TOKEN)}")
+    print("=" * 60)
     print("ANALYTICS (POSTHOG)")
     print("=" * 60)
     print(f"POSTHOG_KEY:               {mask(settings.POSTHOG_KEY)}")
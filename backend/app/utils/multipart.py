@@ -0,0 +1,51 @@
+"""Streamed multipart/form-data request bodies for Core uploads.
+
+httpx builds multipart bodies from sync file objects only. Uploads that are
+produced as they go (ffmpeg output, a body still arriving from the client)
+are sent as an async iterator of these pieces instead.
+"""
+
+import secrets
+from typing import AsyncIterator
+
+
+def new_boundary() -> str:
+    return secrets.token_hex(16)
+
+
+def content_type(boundary: str) -> str:
+    return f"multipart/form-data; boundary={boundary}"
+
+
+def field_part(boundary: str, name: str, value: str) -> bytes:
+    return f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+
+
+def file_part_header(boundary: str, field: str, filename: str, media_type: str) -> bytes:
+    """Headers of a file part; the file bytes and a CRLF follow."""
+    quoted = filename.replace("\\", "\\\\").replace('"', "%22")
+    return (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{quoted}"\r\n'
+        f"Content-Type: {media_type}\r\n\r\n"
+    ).encode()
+
+
+def closing(boundary: str) -> bytes:
+    return f"--{boundary}--\r\n".encode()
+
+
+async def multipart_body(
+    boundary: str,
+    fields: dict[str, str],
+    file_field: str,
+    filename: str,
+    media_type: str,
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[bytes]:
+    """multipart/form-data body with text fields and one streamed file part."""
+    for name, value in fields.items():
+        yield field_part(boundary, name, value)
+    yield file_part_header(boundary, file_field, filename, media_type)
+    async for chunk in chunks:
+        yield chunk
+    yield b"\r\n" + closing(boundary)
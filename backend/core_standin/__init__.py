@@ -0,0 +1,12 @@
+"""Local stand-in for the Core API, for load tests and performance work.
+
+Implements the Core endpoints the wrapper uses with in-memory state,
+scripted job progressions, configurable latency, error injection and
+realistic words-first payload sizes. Not shipped in the production image.
+
+Usage:
+    STANDIN_PROFILE=realistic uvicorn core_standin.server:app --port 8000
+
+Then point the wrapper at it with CORE_API_URL=http://localhost:8000.
+See core_standin/profiles.py for the available profiles and overrides.
+"""
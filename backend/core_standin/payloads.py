@@ -0,0 +1,134 @@
+"""Synthetic Core API payloads with realistic sizes."""
+
+import random
+import struct
+
+WORDS = (
+    "dober dan danes bomo govorili o projektu ki ga pripravljamo že nekaj "
+    "mesecev in mislim da smo zelo blizu cilja vendar je treba še marsikaj "
+    "postoriti preden ga lahko predstavimo strankam"
+).split()
+
+
+def build_transcription_data(
+    audio_seconds: float,
+    words_per_second: float = 2.6,
+    speaker_count: int = 2,
+    seed: int | str = 42,
+) -> dict:
+    """Build words-first transcription data (text, segments, words).
+
+    Produces a word token plus a spacing token per spoken word, the way
+    ElevenLabs output is stored by Core, and switches speakers every ~15s.
+
+    Args:
+        audio_seconds: Length of the simulated recording
+        words_per_second: Speaking rate
+        speaker_count: Number of speakers to rotate through
+        seed: Seed for deterministic output
+
+    Returns:
+        Dict with text, segments and words keys
+    """
+    rng = random.Random(seed)
+    words = []
+    segments = []
+    t = 0.0
+    speaker = 0
+    segment_start = 0.0
+    segment_words: list[str] = []
+    step = 1 / words_per_second
+
+    while t < audio_seconds:
+        length = rng.uniform(0.4, 0.9) * step
+        text = rng.choice(WORDS)
+        words.append({
+            "id": len(words),
+            "text": text,
+            "start": round(t, 3),
+            "end": round(t + length, 3),
+            "type": "word",
+            "speaker_id": speaker,
+            "logprob": round(rng.uniform(-0.5, 0.0), 4),
+        })
+        words.append({
+            "id": len(words),
+            "text": " ",
+            "start": round(t + length, 3),
+            "end": round(t + step, 3),
+            "type": "spacing",
+            "speaker_id": speaker,
+        })
+        segment_words.append(text)
+        t += step
+
+        if t - segment_start > 15 or t >= audio_seconds:
+            segments.append({
+                "id": str(len(segments)),
+                "start": round(segment_start, 3),
+                "end": round(t, 3),
+                "text": " ".join(segment_words),
+                "speaker": speaker,
+            })
+            speaker = (speaker + 1) % max(speaker_count, 1)
+            segment_start = t
+            segment_words = []
+
+    return {
+        "text": " ".join(s["text"] for s in segments),
+        "segments": segments,
+        "words": words,
+    }
+
+
+def build_cleaned_segments(transcription_data: dict) -> list[dict]:
+    """Derive cleaned segments from transcription segments."""
+    return [
+        {
+            "id": segment["id"],
+            "raw_segment_id": segment["id"],
+            "start": segment["start"],
+            "end": segment["end"],
+            "text": segment["text"].capitalize() + ".",
+            "speaker": segment["speaker"],
+            "spellcheck_errors": [],
+        }
+        for segment in transcription_data["segments"]
+    ]
+
+
+def build_analysis_result(profile_id: str, transcription_data: dict) -> dict:
+    """Build an analysis result for a profile."""
+    text = transcription_data["text"]
+    topics = sorted(set(text.split()))[:5]
+    result = {
+        "summary": text[:400],
+        "topics": topics,
+        "key_points": [s["text"][:120] for s in transcription_data["segments"][:5]],
+    }
+    if profile_id == "action-items":
+        result["action_items"] = result.pop("key_points")
+        result["decisions"] = topics[:2]
+    return result
+
+
+def build_wav(duration_seconds: float, sample_rate: int = 8000) -> bytes:
+    """Build a silent 16-bit mono WAV file."""
+    num_samples = int(sample_rate * duration_seconds)
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + num_samples * 2,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        1,
+        sample_rate,
+        sample_rate * 2,
+        2,
+        16,
+        b"data",
+        num_samples * 2,
+    )
+    return header + b"\x00\x00" * num_samples
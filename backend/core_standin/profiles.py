@@ -0,0 +1,146 @@
+"""Behaviour profiles for the Core API stand-in.
+
+A profile controls per-request latency, error injection, how long jobs take
+to move through pending -> processing -> completed/failed, and payload sizes.
+
+Presets (STANDIN_PROFILE):
+    instant    No latency, jobs complete immediately. For functional tests.
+    realistic  ~30ms median request latency, transcription at ~0.15x audio
+               length, cleanup and analysis a few seconds each.
+    slow-tail  Like realistic, but with a heavy latency tail (p99 ~1s).
+    flaky      Like realistic, with 5% of requests failing with 500/503.
+
+Overrides (environment variables, applied on top of the preset):
+    STANDIN_LATENCY       "fixed:MS", "uniform:MIN_MS:MAX_MS" or
+                          "lognormal:MEDIAN_MS:SIGMA"
+    STANDIN_ERROR_RATE    Fraction of requests that fail (0-1)
+    STANDIN_JOB_FAILURE_RATE  Fraction of jobs that end in "failed"
+    STANDIN_TIME_SCALE    Multiplier for all job durations
+    STANDIN_AUDIO_SECONDS Duration assumed when an upload can't be parsed
+    STANDIN_AUDIO_RANGES  "true"/"false" - honour Range on audio downloads
+    STANDIN_SEED          Seed for latency, error and job-failure sampling
+"""
+
+import math
+import os
+import random
+from dataclasses import dataclass, field, replace
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """Per-request latency distribution, in milliseconds."""
+
+    kind: str = "fixed"  # fixed, uniform, lognormal
+    a: float = 0.0  # fixed: value, uniform: min, lognormal: median
+    b: float = 0.0  # uniform: max, lognormal: sigma
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Parse "fixed:MS", "uniform:MIN:MAX" or "lognormal:MEDIAN:SIGMA"."""
+        kind, *params = spec.split(":")
+        values = [float(p) for p in params]
+        if kind == "fixed" and len(values) == 1:
+            return cls("fixed", values[0])
+        if kind in ("uniform", "lognormal") and len(values) == 2:
+            return cls(kind, values[0], values[1])
+        raise ValueError(f"Invalid latency spec: {spec!r}")
+
+    def sample(self, rng: random.Random) -> float:
+        """Sample a latency in seconds."""
+        if self.kind == "uniform":
+            ms = rng.uniform(self.a, self.b)
+        elif self.kind == "lognormal":
+            ms = rng.lognormvariate(math.log(max(self.a, 1e-3)), self.b)
+        else:
+            ms = self.a
+        return max(ms, 0.0) / 1000
+
+
+@dataclass(frozen=True)
+class JobTiming:
+    """How long a job spends pending and processing, in seconds."""
+
+    pending: float = 0.0
+    base: float = 0.0
+    per_audio_second: float = 0.0
+
+    def processing_seconds(self, audio_seconds: float) -> float:
+        """Processing time for a job over audio of the given length."""
+        return self.base + self.per_audio_second * audio_seconds
+
+
+@dataclass(frozen=True)
+class StandinProfile:
+    """Complete stand-in behaviour configuration."""
+
+    name: str = "instant"
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0
+    error_statuses: tuple[int, ...] = (500, 503)
+    job_failure_rate: float = 0.0
+    transcription: JobTiming = field(default_factory=JobTiming)
+    cleanup: JobTiming = field(default_factory=JobTiming)
+    analysis: JobTiming = field(default_factory=JobTiming)
+    time_scale: float = 1.0
+    words_per_second: float = 2.6
+    default_audio_seconds: float = 180.0
+    audio_ranges: bool = True
+    audio_chunk_size: int = 64 * 1024
+    seed: int | None = None
+
+
+_REALISTIC = StandinProfile(
+    name="realistic",
+    latency=LatencyDistribution("lognormal", 30.0, 0.4),
+    transcription=JobTiming(pending=0.5, base=3.0, per_audio_second=0.15),
+    cleanup=JobTiming(pending=0.5, base=2.0, per_audio_second=0.02),
+    analysis=JobTiming(pending=0.5, base=2.5),
+)
+
+PROFILES: dict[str, StandinProfile] = {
+    "instant": StandinProfile(),
+    "realistic": _REALISTIC,
+    "slow-tail": replace(
+        _REALISTIC,
+        name="slow-tail",
+        latency=LatencyDistribution("lognormal", 40.0, 1.4),
+    ),
+    "flaky": replace(_REALISTIC, name="flaky", error_rate=0.05),
+}
+
+
+def _env_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def profile_from_env(environ: dict[str, str] | None = None) -> StandinProfile:
+    """Build a profile from STANDIN_* environment variables.
+
+    Raises:
+        ValueError: If the preset name or an override is invalid
+    """
+    env = os.environ if environ is None else environ
+
+    name = env.get("STANDIN_PROFILE", "realistic")
+    if name not in PROFILES:
+        raise ValueError(f"Unknown stand-in profile {name!r}, expected one of {sorted(PROFILES)}")
+    profile = PROFILES[name]
+
+    overrides: dict = {}
+    if "STANDIN_LATENCY" in env:
+        overrides["latency"] = LatencyDistribution.parse(env["STANDIN_LATENCY"])
+    if "STANDIN_ERROR_RATE" in env:
+        overrides["error_rate"] = float(env["STANDIN_ERROR_RATE"])
+    if "STANDIN_JOB_FAILURE_RATE" in env:
+        overrides["job_failure_rate"] = float(env["STANDIN_JOB_FAILURE_RATE"])
+    if "STANDIN_TIME_SCALE" in env:
+        overrides["time_scale"] = float(env["STANDIN_TIME_SCALE"])
+    if "STANDIN_AUDIO_SECONDS" in env:
+        overrides["default_audio_seconds"] = float(env["STANDIN_AUDIO_SECONDS"])
+    if "STANDIN_AUDIO_RANGES" in env:
+        overrides["audio_ranges"] = _env_bool(env["STANDIN_AUDIO_RANGES"])
+    if "STANDIN_SEED" in env:
+        overrides["seed"] = int(env["STANDIN_SEED"])
+
+    return replace(profile, **overrides)
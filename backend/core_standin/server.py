@@ -0,0 +1,647 @@
+"""ASGI app emulating the Core API endpoints used by the wrapper.
+
+State is kept in memory per process. Jobs don't run anywhere: their status
+is derived from the time elapsed since they were scheduled, following the
+profile's JobTiming, so a transcription moves pending -> processing ->
+completed (or failed) on its own while clients poll it.
+"""
+
+import asyncio
+import random
+import re
+import secrets
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from io import BytesIO
+from typing import Optional
+
+from fastapi import Body, Depends, FastAPI, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from mutagen import File as MutagenFile
+
+from core_standin.payloads import (
+    build_analysis_result,
+    build_cleaned_segments,
+    build_transcription_data,
+    build_wav,
+)
+from core_standin.profiles import JobTiming, StandinProfile, profile_from_env
+
+ANALYSIS_PROFILES = [
+    {
+        "id": "generic-summary",
+        "label": "Summary",
+        "intent": "summarize",
+        "description": "Summary, topics and key points",
+        "is_default": True,
+        "outputs": ["summary", "topics", "key_points"],
+    },
+    {
+        "id": "action-items",
+        "label": "Action Items & Decisions",
+        "intent": "extract",
+        "description": "Identifies tasks and decisions",
+        "is_default": False,
+        "outputs": ["summary", "action_items", "decisions"],
+    },
+]
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+# =============================================================================
+# Jobs
+# =============================================================================
+
+
+@dataclass
+class Job:
+    """A scripted background job whose status follows wall-clock time."""
+
+    id: str
+    user_id: str
+    created_at: datetime
+    starts_at: float  # time.monotonic() when the job leaves the queue
+    pending_seconds: float
+    processing_seconds: float
+    fails: bool
+
+    @property
+    def finishes_at(self) -> float:
+        return self.starts_at + self.pending_seconds + self.processing_seconds
+
+    def status(self) -> str:
+        """Current status derived from elapsed time."""
+        elapsed = time.monotonic() - self.starts_at
+        if elapsed < self.pending_seconds:
+            return "pending"
+        if elapsed < self.pending_seconds + self.processing_seconds:
+            return "processing"
+        return "failed" if self.fails else "completed"
+
+
+@dataclass
+class Transcription(Job):
+    entry_id: str = ""
+    language: str = "sl"
+    speaker_count: int = 2
+    audio_seconds: float = 0.0
+
+
+@dataclass
+class Cleanup(Job):
+    entry_id: str = ""
+    transcription_id: str = ""
+    cleanup_type: str = "clean"
+    llm_model: str = "llama-3.3-70b-versatile"
+    temperature: Optional[float] = None
+    edited_data: Optional[dict] = None
+    user_edited_at: Optional[datetime] = None
+
+
+@dataclass
+class Analysis(Job):
+    cleaned_entry_id: str = ""
+    profile_id: str = "generic-summary"
+    llm_model: str = "llama-3.3-70b-versatile"
+
+
+@dataclass
+class Entry:
+    id: str
+    user_id: str
+    original_filename: str
+    content_type: str
+    audio: bytes
+    duration_seconds: float
+    uploaded_at: datetime
+    transcription_id: str
+    cleanup_ids: list[str] = field(default_factory=list)
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() + "Z" if value else None
+
+
+def _probe_duration(content: bytes, filename: str) -> Optional[float]:
+    try:
+        audio = MutagenFile(BytesIO(content), filename=filename)
+        return float(audio.info.length) if audio is not None and audio.info.length else None
+    except Exception:
+        return None
+
+
+# =============================================================================
+# State
+# =============================================================================
+
+
+class CoreStandin:
+    """In-memory Core API state and payload rendering."""
+
+    def __init__(self, profile: StandinProfile):
+        self.profile = profile
+        self.rng = random.Random(profile.seed)
+        self.users: dict[str, dict] = {}  # email -> user
+        self.access_tokens: dict[str, str] = {}  # token -> user_id
+        self.refresh_tokens: dict[str, str] = {}  # token -> user_id
+        self.entries: dict[str, Entry] = {}
+        self.transcriptions: dict[str, Transcription] = {}
+        self.cleanups: dict[str, Cleanup] = {}
+        self.analyses: dict[str, Analysis] = {}
+        self._transcription_data: dict[str, dict] = {}
+
+    # -- scheduling -----------------------------------------------------------
+
+    def _job_fields(self, user_id: str, timing: JobTiming, audio_seconds: float, after: float) -> dict:
+        scale = self.profile.time_scale
+        return {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "created_at": datetime.utcnow(),
+            "starts_at": max(after, time.monotonic()),
+            "pending_seconds": timing.pending * scale,
+            "processing_seconds": timing.processing_seconds(audio_seconds) * scale,
+            "fails": self.rng.random() < self.profile.job_failure_rate,
+        }
+
+    def schedule_cleanup(self, transcription: Transcription, **options) -> Cleanup:
+        cleanup = Cleanup(
+            **self._job_fields(
+                transcription.user_id,
+                self.profile.cleanup,
+                transcription.audio_seconds,
+                after=transcription.finishes_at,
+            ),
+            entry_id=transcription.entry_id,
+            transcription_id=transcription.id,
+            **{k: v for k, v in options.items() if v is not None},
+        )
+        self.cleanups[cleanup.id] = cleanup
+        self.entries[transcription.entry_id].cleanup_ids.append(cleanup.id)
+        return cleanup
+
+    def schedule_analysis(self, cleanup: Cleanup, profile_id: str, llm_model: Optional[str]) -> Analysis:
+        transcription = self.transcriptions[cleanup.transcription_id]
+        analysis = Analysis(
+            **self._job_fields(
+                cleanup.user_id,
+                self.profile.analysis,
+                transcription.audio_seconds,
+                after=cleanup.finishes_at,
+            ),
+            cleaned_entry_id=cleanup.id,
+            profile_id=profile_id,
+            **({"llm_model": llm_model} if llm_model else {}),
+        )
+        self.analyses[analysis.id] = analysis
+        return analysis
+
+    def transcription_data(self, transcription: Transcription) -> dict:
+        data = self._transcription_data.get(transcription.id)
+        if data is None:
+            data = build_transcription_data(
+                transcription.audio_seconds,
+                words_per_second=self.profile.words_per_second,
+                speaker_count=transcription.speaker_count,
+                seed=transcription.id,
+            )
+            self._transcription_data[transcription.id] = data
+        return data
+
+    # -- rendering ------------------------------------------------------------
+
+    def transcription_summary(self, t: Transcription) -> dict:
+        status = t.status()
+        return {
+            "id": t.id,
+            "status": status,
+            "language_code": t.language,
+            "error_message": "Stand-in job failure" if status == "failed" else None,
+            "created_at": _iso(t.created_at),
+        }
+
+    def transcription_detail(self, t: Transcription) -> dict:
+        body = {**self.transcription_summary(t), "voice_entry_id": t.entry_id, "language": t.language}
+        if body["status"] == "completed":
+            body.update(self.transcription_data(t))
+        return body
+
+    def cleanup_detail(self, c: Cleanup) -> dict:
+        status = c.status()
+        completed = status == "completed"
+        segments = build_cleaned_segments(self.transcription_data(self.transcriptions[c.transcription_id])) if completed else None
+        entry = self.entries[c.entry_id]
+        return {
+            "id": c.id,
+            "voice_entry_id": c.entry_id,
+            "transcription_id": c.transcription_id,
+            "user_id": c.user_id,
+            "cleaned_text": " ".join(s["text"] for s in segments) if segments else None,
+            "status": status,
+            "llm_provider": "groq",
+            "llm_model": c.llm_model,
+            "temperature": c.temperature,
+            "error_message": "Stand-in job failure" if status == "failed" else None,
+            "is_primary": bool(entry.cleanup_ids) and entry.cleanup_ids[-1] == c.id,
+            "created_at": _iso(c.created_at),
+            "prompt_name": f"sl-{c.cleanup_type}-v1",
+            "cleanup_type": c.cleanup_type,
+            "cleaned_segments": segments,
+            "cleanup_data_edited": c.edited_data,
+            "user_edited_at": _iso(c.user_edited_at),
+        }
+
+    def cleanup_list_summary(self, c: Cleanup) -> dict:
+        detail = self.cleanup_detail(c)
+        return {
+            "id": c.id,
+            "status": detail["status"],
+            "cleaned_text_preview": (detail["cleaned_text"] or "")[:200] or None,
+            "error_message": detail["error_message"],
+            "created_at": detail["created_at"],
+            "user_edited_text_preview": None,
+        }
+
+    def analysis_detail(self, a: Analysis) -> dict:
+        status = a.status()
+        cleanup = self.cleanups[a.cleaned_entry_id]
+        result = None
+        if status == "completed":
+            data = self.transcription_data(self.transcriptions[cleanup.transcription_id])
+            result = build_analysis_result(a.profile_id, data)
+        label = next((p["label"] for p in ANALYSIS_PROFILES if p["id"] == a.profile_id), a.profile_id)
+        return {
+            "id": a.id,
+            "cleaned_entry_id": a.cleaned_entry_id,
+            "user_id": a.user_id,
+            "profile_id": a.profile_id,
+            "profile_label": label,
+            "result": result,
+            "status": status,
+            "llm_provider": "groq",
+            "llm_model": a.llm_model,
+            "error_message": "Stand-in job failure" if status == "failed" else None,
+            "created_at": _iso(a.created_at),
+        }
+
+    def entry_summary(self, e: Entry) -> dict:
+        latest = self.cleanups[e.cleanup_ids[-1]] if e.cleanup_ids else None
+        return {
+            "id": e.id,
+            "original_filename": e.original_filename,
+            "saved_filename": f"{e.id}-{e.original_filename}",
+            "entry_type": "journal",
+            "duration_seconds": e.duration_seconds,
+            "uploaded_at": _iso(e.uploaded_at),
+            "primary_transcription": self.transcription_summary(self.transcriptions[e.transcription_id]),
+            "latest_cleaned_entry": self.cleanup_list_summary(latest) if latest else None,
+        }
+
+    # -- lookups --------------------------------------------------------------
+
+    def owned(self, store: dict, item_id: str, user_id: str, label: str):
+        item = store.get(item_id)
+        if item is None or item.user_id != user_id:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        return item
+
+
+def _issue_tokens(standin: CoreStandin, user: dict) -> dict:
+    access_token = f"standin-access-{secrets.token_urlsafe(16)}"
+    refresh_token = f"standin-refresh-{secrets.token_urlsafe(16)}"
+    standin.access_tokens[access_token] = user["id"]
+    standin.refresh_tokens[refresh_token] = user["id"]
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "user": {k: v for k, v in user.items() if k != "password"},
+    }
+
+
+# =============================================================================
+# App
+# =============================================================================
+
+
+def create_app(profile: Optional[StandinProfile] = None) -> FastAPI:
+    """Create a stand-in Core API app for the given profile (default: from env)."""
+    profile = profile or profile_from_env()
+    standin = CoreStandin(profile)
+
+    app = FastAPI(title="Core API stand-in", description=f"Profile: {profile.name}")
+    app.state.standin = standin
+
+    @app.middleware("http")
+    async def latency_and_errors(request: Request, call_next):
+        """Apply the profile's latency distribution and error injection."""
+        delay = profile.latency.sample(standin.rng)
+        if delay:
+            await asyncio.sleep(delay)
+        if profile.error_rate and standin.rng.random() < profile.error_rate:
+            status = standin.rng.choice(profile.error_statuses)
+            return JSONResponse(status_code=status, content={"detail": "Injected stand-in error"})
+        return await call_next(request)
+
+    def current_user(request: Request) -> str:
+        auth = request.headers.get("authorization", "")
+        user_id = standin.access_tokens.get(auth.removeprefix("Bearer "))
+        if user_id is None:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        return user_id
+
+    # -- auth -----------------------------------------------------------------
+
+    @app.post("/api/v1/auth/register", status_code=201)
+    async def register(body: dict = Body(...)):
+        if body["email"] in standin.users:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        user = {
+            "id": str(uuid.uuid4()),
+            "email": body["email"],
+            "password": body["password"],
+            "is_active": True,
+            "role": "user",
+            "created_at": _iso(datetime.utcnow()),
+        }
+        standin.users[body["email"]] = user
+        return {k: v for k, v in user.items() if k != "password"}
+
+    @app.post("/api/v1/auth/login")
+    async def login(body: dict = Body(...)):
+        user = standin.users.get(body["email"])
+        if user is None or user["password"] != body["password"]:
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+        return _issue_tokens(standin, user)
+
+    @app.post("/api/v1/auth/refresh")
+    async def refresh(body: dict = Body(...)):
+        user_id = standin.refresh_tokens.pop(body["refresh_token"], None)
+        user = next((u for u in standin.users.values() if u["id"] == user_id), None)
+        if user is None:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+        return _issue_tokens(standin, user)
+
+    # -- public ---------------------------------------------------------------
+
+    @app.get("/api/v1/options")
+    async def options():
+        return {
+            "transcription": {"providers": ["elevenlabs"], "languages": ["sl", "en"]},
+            "llm": {"providers": ["groq"], "models": ["llama-3.3-70b-versatile"]},
+        }
+
+    @app.get("/api/v1/analysis-profiles")
+    async def analysis_profiles(user_id: str = Depends(current_user)):
+        return {"profiles": ANALYSIS_PROFILES, "count": len(ANALYSIS_PROFILES)}
+
+    # -- upload and transcriptions -------------------------------------------
+
+    @app.post("/api/v1/upload-transcribe-cleanup", status_code=202)
+    async def upload_transcribe_cleanup(
+        file: UploadFile,
+        language: str = Form("sl"),
+        speaker_count: int = Form(2),
+        cleanup_type: str = Form("clean"),
+        llm_model: Optional[str] = Form(None),
+        cleanup_temperature: Optional[float] = Form(None),
+        analysis_profile: Optional[str] = Form(None),
+        analysis_llm_model: Optional[str] = Form(None),
+        user_id: str = Depends(current_user),
+    ):
+        content = await file.read()
+        filename = file.filename or "upload"
+        duration = _probe_duration(content, filename) or profile.default_audio_seconds
+
+        entry_id = str(uuid.uuid4())
+        transcription = Transcription(
+            **standin._job_fields(user_id, profile.transcription, duration, after=0.0),
+            entry_id=entry_id,
+            language=language,
+            speaker_count=speaker_count,
+            audio_seconds=duration,
+        )
+        standin.transcriptions[transcription.id] = transcription
+        standin.entries[entry_id] = Entry(
+            id=entry_id,
+            user_id=user_id,
+            original_filename=filename,
+            content_type=file.content_type or "application/octet-stream",
+            audio=content,
+            duration_seconds=duration,
+            uploaded_at=datetime.utcnow(),
+            transcription_id=transcription.id,
+        )
+        cleanup = standin.schedule_cleanup(
+            transcription,
+            cleanup_type=cleanup_type,
+            llm_model=llm_model,
+            temperature=cleanup_temperature,
+        )
+        analysis = (
+            standin.schedule_analysis(cleanup, analysis_profile, analysis_llm_model)
+            if analysis_profile
+            else None
+        )
+
+        return {
+            "entry_id": entry_id,
+            "original_filename": filename,
+            "saved_filename": f"{entry_id}-{filename}",
+            "duration_seconds": duration,
+            "entry_type": "journal",
+            "uploaded_at": _iso(standin.entries[entry_id].uploaded_at),
+            "transcription_id": transcription.id,
+            "transcription_status": transcription.status(),
+            "transcription_language": language,
+            "cleanup_id": cleanup.id,
+            "cleanup_status": cleanup.status(),
+            "cleanup_model": cleanup.llm_model,
+            "analysis_id": analysis.id if analysis else None,
+            "analysis_status": analysis.status() if analysis else None,
+            "analysis_profile": analysis_profile,
+            "message": "Upload successful, processing started",
+        }
+
+    @app.get("/api/v1/transcriptions/{transcription_id}")
+    async def get_transcription(transcription_id: str, user_id: str = Depends(current_user)):
+        t = standin.owned(standin.transcriptions, transcription_id, user_id, "Transcription")
+        return standin.transcription_detail(t)
+
+    @app.post("/api/v1/transcriptions/{transcription_id}/cleanup", status_code=202)
+    async def trigger_cleanup(
+        transcription_id: str,
+        body: dict = Body(default={}),
+        user_id: str = Depends(current_user),
+    ):
+        t = standin.owned(standin.transcriptions, transcription_id, user_id, "Transcription")
+        cleanup = standin.schedule_cleanup(
+            t,
+            cleanup_type=body.get("type"),
+            llm_model=body.get("llm_model"),
+            temperature=body.get("temperature"),
+        )
+        return {
+            "id": cleanup.id,
+            "voice_entry_id": cleanup.entry_id,
+            "transcription_id": t.id,
+            "status": cleanup.status(),
+            "message": "Cleanup started",
+        }
+
+    # -- entries --------------------------------------------------------------
+
+    @app.get("/api/v1/entries")
+    async def list_entries(
+        limit: int = Query(default=20, ge=1, le=100),
+        offset: int = Query(default=0, ge=0),
+        entry_type: Optional[str] = Query(default=None),
+        user_id: str = Depends(current_user),
+    ):
+        entries = sorted(
+            (e for e in standin.entries.values() if e.user_id == user_id),
+            key=lambda e: e.uploaded_at,
+            reverse=True,
+        )
+        if entry_type and entry_type != "journal":
+            entries = []
+        page = entries[offset:offset + limit]
+        return {
+            "entries": [standin.entry_summary(e) for e in page],
+            "total": len(entries),
+            "limit": limit,
+            "offset": offset,
+        }
+
+    @app.get("/api/v1/entries/{entry_id}")
+    async def get_entry(entry_id: str, user_id: str = Depends(current_user)):
+        entry = standin.owned(standin.entries, entry_id, user_id, "Entry")
+        summary = standin.entry_summary(entry)
+        summary.pop("latest_cleaned_entry")
+        return summary
+
+    @app.delete("/api/v1/entries/{entry_id}")
+    async def delete_entry(entry_id: str, user_id: str = Depends(current_user)):
+        entry = standin.owned(standin.entries, entry_id, user_id, "Entry")
+        del standin.entries[entry_id]
+        standin.transcriptions.pop(entry.transcription_id, None)
+        standin._transcription_data.pop(entry.transcription_id, None)
+        for cleanup_id in entry.cleanup_ids:
+            standin.cleanups.pop(cleanup_id, None)
+        for analysis_id in [a.id for a in standin.analyses.values() if a.cleaned_entry_id in entry.cleanup_ids]:
+            del standin.analyses[analysis_id]
+        return {"message": "Entry deleted successfully", "deleted_id": entry_id}
+
+    @app.get("/api/v1/entries/{entry_id}/cleaned")
+    async def list_entry_cleanups(entry_id: str, user_id: str = Depends(current_user)):
+        entry = standin.owned(standin.entries, entry_id, user_id, "Entry")
+        summaries = []
+        for cleanup_id in entry.cleanup_ids:
+            detail = standin.cleanup_detail(standin.cleanups[cleanup_id])
+            summaries.append({
+                "id": detail["id"],
+                "llm_provider": detail["llm_provider"],
+                "llm_model": detail["llm_model"],
+                "prompt_name": detail["prompt_name"],
+                "cleanup_type": detail["cleanup_type"],
+                "temperature": detail["temperature"],
+                "status": detail["status"],
+                "is_primary": detail["is_primary"],
+            })
+        return summaries
+
+    @app.get("/api/v1/entries/{entry_id}/audio")
+    async def get_entry_audio(entry_id: str, request: Request, user_id: str = Depends(current_user)):
+        entry = standin.owned(standin.entries, entry_id, user_id, "Entry")
+        audio = entry.audio or build_wav(entry.duration_seconds)
+        total = len(audio)
+        start, end, status = 0, total - 1, 200
+
+        range_header = request.headers.get("range")
+        match = RANGE_PATTERN.match(range_header or "") if profile.audio_ranges else None
+        if match and (match.group(1) or match.group(2)):
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), total - 1) if match.group(2) else total - 1
+            else:
+                start = max(total - int(match.group(2)), 0)
+            if start > end or start >= total:
+                return Response(status_code=416, headers={"Content-Range": f"bytes */{total}"})
+            status = 206
+
+        chunk_size = profile.audio_chunk_size
+
+        async def body():
+            for offset in range(start, end + 1, chunk_size):
+                yield audio[offset:min(offset + chunk_size, end + 1)]
+
+        headers = {
+            "Content-Length": str(end - start + 1),
+            "Content-Disposition": f"inline; filename={entry.original_filename}",
+        }
+        if profile.audio_ranges:
+            headers["Accept-Ranges"] = "bytes"
+        if status == 206:
+            headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+        return StreamingResponse(body(), status_code=status, media_type=entry.content_type, headers=headers)
+
+    # -- cleaned entries ------------------------------------------------------
+
+    @app.get("/api/v1/cleaned-entries/{cleanup_id}")
+    async def get_cleaned_entry(cleanup_id: str, user_id: str = Depends(current_user)):
+        return standin.cleanup_detail(standin.owned(standin.cleanups, cleanup_id, user_id, "Cleaned entry"))
+
+    @app.put("/api/v1/cleaned-entries/{cleanup_id}/user-edit")
+    async def update_user_edit(cleanup_id: str, body: dict = Body(...), user_id: str = Depends(current_user)):
+        cleanup = standin.owned(standin.cleanups, cleanup_id, user_id, "Cleaned entry")
+        cleanup.edited_data = body.get("edited_data")
+        cleanup.user_edited_at = datetime.utcnow()
+        return standin.cleanup_detail(cleanup)
+
+    @app.delete("/api/v1/cleaned-entries/{cleanup_id}/user-edit")
+    async def revert_user_edit(cleanup_id: str, user_id: str = Depends(current_user)):
+        cleanup = standin.owned(standin.cleanups, cleanup_id, user_id, "Cleaned entry")
+        cleanup.edited_data = None
+        cleanup.user_edited_at = None
+        return standin.cleanup_detail(cleanup)
+
+    @app.post("/api/v1/cleaned-entries/{cleanup_id}/analyze")
+    async def analyze(cleanup_id: str, body: dict = Body(default={}), user_id: str = Depends(current_user)):
+        cleanup = standin.owned(standin.cleanups, cleanup_id, user_id, "Cleaned entry")
+        analysis = standin.schedule_analysis(
+            cleanup,
+            body.get("profile_id", "generic-summary"),
+            body.get("llm_model"),
+        )
+        detail = standin.analysis_detail(analysis)
+        return {
+            "id": analysis.id,
+            "cleaned_entry_id": cleanup.id,
+            "profile_id": analysis.profile_id,
+            "profile_label": detail["profile_label"],
+            "status": detail["status"],
+            "created_at": detail["created_at"],
+            "message": "Analysis started",
+        }
+
+    @app.get("/api/v1/cleaned-entries/{cleanup_id}/analyses")
+    async def list_analyses(cleanup_id: str, user_id: str = Depends(current_user)):
+        standin.owned(standin.cleanups, cleanup_id, user_id, "Cleaned entry")
+        analyses = [
+            standin.analysis_detail(a)
+            for a in standin.analyses.values()
+            if a.cleaned_entry_id == cleanup_id
+        ]
+        return {"analyses": analyses, "count": len(analyses)}
+
+    @app.get("/api/v1/analyses/{analysis_id}")
+    async def get_analysis(analysis_id: str, user_id: str = Depends(current_user)):
+        return standin.analysis_detail(standin.owned(standin.analyses, analysis_id, user_id, "Analysis"))
+
+    return app
+
+
+app = create_app()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON re-encoding vs raw byte passthrough for proxied Core responses
+
+Compares the two ways the wrapper can return a Core API body:
+  - reencode:    response.json() -> FastAPI jsonable_encoder -> JSONResponse
+  - passthrough: forward Core's bytes as-is (routes/core.py _passthrough)
+
+The payload is a synthetic 3-minute, two-speaker transcription in the
+words-first format (words + spacing tokens + segments), roughly what Core
+returns from GET /api/v1/transcriptions/{id}.
+
+Usage:
+    python scripts/benchmark_passthrough.py [audio_seconds] [iterations]
+    python scripts/benchmark_passthrough.py 180 200
+"""
+
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.routes.core import _passthrough  # noqa: E402
+
+WORDS = (
+    "dober dan danes bomo govorili o projektu ki ga pripravljamo že nekaj "
+    "mesecev in mislim da smo zelo blizu cilja vendar je treba še marsikaj "
+    "postoriti preden ga lahko predstavimo strankam"
+).split()
+
+
+def build_transcription(audio_seconds: float, words_per_second: float = 2.6) -> dict:
+    """Build a realistic words-first transcription payload."""
+    rng = random.Random(42)
+    words = []
+    segments = []
+    t = 0.0
+    speaker = 0
+    segment_start = 0.0
+    segment_words: list[str] = []
+
+    while t < audio_seconds:
+        length = rng.uniform(0.15, 0.6)
+        text = rng.choice(WORDS)
+        words.append({
+            "id": len(words),
+            "text": text,
+            "start": round(t, 3),
+            "end": round(t + length, 3),
+            "type": "word",
+            "speaker_id": speaker,
+            "logprob": round(rng.uniform(-0.5, 0.0), 4),
+        })
+        words.append({
+            "id": len(words),
+            "text": " ",
+            "start": round(t + length, 3),
+            "end": round(t + length + 0.05, 3),
+            "type": "spacing",
+            "speaker_id": speaker,
+        })
+        segment_words.append(text)
+        t += length + 1 / words_per_second - 0.3
+
+        # Switch speakers every ~15 seconds
+        if t - segment_start > 15:
+            segments.append({
+                "id": len(segments),
+                "start": round(segment_start, 3),
+                "end": round(t, 3),
+                "text": " ".join(segment_words),
+                "speaker": f"Speaker {speaker + 1}",
+                "speaker_id": speaker,
+            })
+            speaker = 1 - speaker
+            segment_start = t
+            segment_words = []
+
+    text = " ".join(s["text"] for s in segments)
+    return {
+        "id": "2b1f6d9e-8c1a-4f0e-9d55-3f4a9b1c7e21",
+        "voice_entry_id": "9f2c4b8a-1d3e-4a6b-8c7d-5e0f1a2b3c4d",
+        "status": "completed",
+        "language": "sl",
+        "text": text,
+        "segments": segments,
+        "words": words,
+        "created_at": "2026-01-01T00:00:00Z",
+        "completed_at": "2026-01-01T00:00:31Z",
+    }
+
+
+def reencode(response: httpx.Response) -> bytes:
+    """What the routes did before: decode, jsonable_encoder, JSONResponse."""
+    return JSONResponse(content=jsonable_encoder(response.json())).body
+
+
+def passthrough(response: httpx.Response) -> bytes:
+    """Forward Core's bytes unchanged."""
+    return _passthrough(response).body
+
+
+def measure(fn, response: httpx.Response, iterations: int) -> tuple[list[float], int]:
+    """Return per-call durations (ms) and peak traced memory (bytes) for fn."""
+    fn(response)  # warm up
+
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(response)
+        durations.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    fn(response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return durations, peak
+
+
+def main():
+    audio_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 180.0
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    body = json.dumps(build_transcription(audio_seconds)).encode()
+    response = httpx.Response(
+        200,
+        content=body,
+        headers={"content-type": "application/json"},
+    )
+
+    print(f"\n{'='*60}")
+    print(f"Payload: {audio_seconds:.0f}s audio | {len(body) / 1024:.0f} KiB | {iterations} iterations")
+    print(f"{'='*60}")
+
+    for name, fn in (("reencode", reencode), ("passthrough", passthrough)):
+        durations, peak = measure(fn, response, iterations)
+        durations.sort()
+        p50 = statistics.median(durations)
+        p99 = durations[int(len(durations) * 0.99) - 1]
+        print(f"{name:12} p50={p50:8.3f} ms  p99={p99:8.3f} ms  peak_alloc={peak / 1024:8.0f} KiB")
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: poll latency while uploads are probed in threads vs processes
+
+mutagen is pure Python and holds the GIL while it parses. With the default
+thread probes, a burst of uploads slows down every other request the event
+loop is serving. This script polls a minimal endpoint (through the ASGI
+stack, like a job status poll) every 10 ms while N uploads are probed
+concurrently, and reports the poll latencies for:
+
+  - idle:      no probes running (baseline)
+  - threads:   AudioProber with AUDIO_PROBE_CONCURRENCY threads (default)
+  - processes: AudioProber with an AudioProbePool (AUDIO_PROBE_PROCESSES)
+
+The uploads are multiplexed Ogg Opus files, which mutagen has to walk page
+by page to find the duration - its slowest path, and the one a hostile
+upload would pick.
+
+Usage:
+    python scripts/benchmark_probe_isolation.py [uploads] [pages_per_file] [workers]
+    python scripts/benchmark_probe_isolation.py 20 100000 4
+"""
+
+import asyncio
+import statistics
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from mutagen.ogg import OggPage  # noqa: E402
+from starlette.applications import Starlette  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from app.utils.audio import AudioProbePool, AudioProber  # noqa: E402
+
+POLL_INTERVAL = 0.01
+
+
+def muxed_opus(pages: int) -> bytes:
+    """Ogg Opus (20 ms pages) multiplexed with a second stream that ends last."""
+
+    def page(serial: int, sequence: int, packet: bytes, position: int, first: bool = False) -> bytes:
+        ogg_page = OggPage()
+        ogg_page.serial, ogg_page.sequence, ogg_page.packets = serial, sequence, [packet]
+        ogg_page.position, ogg_page.first = position, first
+        return ogg_page.write()
+
+    opus_head = b"OpusHead" + bytes([1, 1]) + struct.pack("<HIhB", 0, 48000, 0, 0)
+    out = [page(1, 0, opus_head, 0, first=True), page(1, 1, b"OpusTags" + b"\x00" * 8, 0)]
+    for i in range(pages):
+        out.append(page(1, 2 + i, b"\x00" * 100, (i + 1) * 960))
+        out.append(page(2, i, b"\x00" * 20, i))
+    return b"".join(out)
+
+
+async def job_status(request):
+    return JSONResponse({"id": "job-1", "status": "processing"})
+
+
+async def poll(client: httpx.AsyncClient, stop: asyncio.Event) -> list[float]:
+    """Poll until stopped; return per-poll latencies (ms).
+
+    Latency runs from when the poll was due, not from when the event loop
+    got around to sending it: a poll arriving at a busy server waits for
+    the loop as well as for the handler.
+    """
+    latencies = []
+    due = time.perf_counter()
+    while not stop.is_set():
+        await client.get("/api/transcriptions/job-1")
+        done = time.perf_counter()
+        latencies.append((done - due) * 1000)
+        due = done + POLL_INTERVAL
+        await asyncio.sleep(POLL_INTERVAL)
+    return latencies
+
+
+async def run(label: str, prober: AudioProber | None, paths: list[Path], client: httpx.AsyncClient) -> None:
+    stop = asyncio.Event()
+    poller = asyncio.ensure_future(poll(client, stop))
+    start = time.perf_counter()
+
+    if prober is None:
+        await asyncio.sleep(1.0)
+        durations = []
+    else:
+        files = [open(path, "rb") for path in paths]
+        try:
+            durations = await asyncio.gather(*(prober.duration(f, f.name) for f in files))
+        finally:
+            for f in files:
+                f.close()
+
+    elapsed = time.perf_counter() - start
+    stop.set()
+    latencies = sorted(await poller)
+    p50 = statistics.median(latencies)
+    p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+    probed = sum(d is not None for d in durations)
+    print(
+        f"{label:10} polls={len(latencies):5}  p50={p50:7.2f} ms  p99={p99:7.2f} ms  "
+        f"max={latencies[-1]:7.2f} ms  wall={elapsed:5.2f} s  probed={probed}/{len(durations)}"
+    )
+
+
+async def main():
+    uploads = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    app = Starlette(routes=[Route("/api/transcriptions/{id}", job_status)])
+    transport = httpx.ASGITransport(app=app)
+
+    with tempfile.TemporaryDirectory() as directory:
+        data = muxed_opus(pages)
+        paths = []
+        for i in range(uploads):
+            path = Path(directory) / f"upload-{i}.opus"
+            path.write_bytes(data)
+            paths.append(path)
+
+        print(f"\n{'='*90}")
+        print(f"{uploads} concurrent uploads | {len(data) / 1024 / 1024:.1f} MiB each | {workers} threads/processes")
+        print(f"{'='*90}")
+
+        pool = AudioProbePool(workers=workers, max_queue=uploads, timeout=120.0)
+        # Start the workers outside the measurement
+        await asyncio.gather(*(pool.duration(muxed_opus(1), "warmup.opus", "ogg") for _ in range(workers)))
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await run("idle", None, paths, client)
+            await run("threads", AudioProber(concurrency=workers, timeout=120.0), paths, client)
+            await run("processes", AudioProber(timeout=120.0, pool=pool), paths, client)
+
+        pool.close()
+    print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,7 +16,7 @@ from app.database import Base, get_db
 
 
 @pytest.fixture
-def test_settings() -> Settings:
+def test_settings(tmp_path) -> Settings:
     """Override settings for testing."""
     return Settings(
         CORE_API_URL="http://core-api:8000",
@@ -31,6 +31,7 @@ def test_settings() -> Settings:
         RATE_LIMIT_LLM_GLOBAL_DAY=10000,
         # Audio validation
         MAX_AUDIO_DURATION_SECONDS=180,
+        AUDIO_CACHE_DIR=str(tmp_path / "audio-cache"),
         DATABASE_URL="sqlite://",  # in-memory
     )
 
@@ -1,13 +1,25 @@
 """Tests for audio duration validation."""
 
+import asyncio
 import io
+import os
 import struct
+import threading
+import time
 
 import pytest
 
+from app.utils import audio as audio_module
+from app.upload import NamedSpooledTemporaryFile
 from app.utils.audio import (
+    HEADER_PROBE_BYTES,
+    AudioProbePool,
+    AudioProber,
     AudioValidationError,
     get_audio_duration,
+    header_duration,
+    require_audio_format,
+    sniff_audio_format,
     validate_audio_duration,
 )
 
@@ -45,6 +57,34 @@ def create_wav_bytes(duration_seconds: float, sample_rate: int = 8000) -> bytes:
     return header + samples
 
 
+def create_muxed_opus_bytes(pages: int) -> bytes:
+    """Ogg Opus at 20 ms per page, multiplexed with a second stream.
+
+    The second stream's page comes last, so mutagen has to walk every page
+    to find the Opus stream's end - the slow path.
+    """
+    from mutagen.ogg import OggPage
+
+    def page(serial: int, sequence: int, packet: bytes, position: int, first: bool = False) -> bytes:
+        ogg_page = OggPage()
+        ogg_page.serial, ogg_page.sequence, ogg_page.packets = serial, sequence, [packet]
+        ogg_page.position, ogg_page.first = position, first
+        return ogg_page.write()
+
+    opus_head = b"OpusHead" + bytes([1, 1]) + struct.pack("<HIhB", 0, 48000, 0, 0)
+    out = [page(1, 0, opus_head, 0, first=True), page(1, 1, b"OpusTags" + b"\x00" * 8, 0)]
+    for i in range(pages):
+        out.append(page(1, 2 + i, b"\x00" * 100, (i + 1) * 960))
+        out.append(page(2, i, b"\x00" * 20, i))
+    return b"".join(out)
+
+
+def _stuck_probe(source, filename, audio_format):
+    with open(f"{source}.pid", "w") as pid_file:
+        pid_file.write(str(os.getpid()))
+    time.sleep(60)
+
+
 @pytest.fixture
 def short_wav_bytes():
     """10 second WAV file (under typical limit)."""
@@ -83,6 +123,16 @@ class TestGetAudioDuration:
         assert duration is not None
         assert 9.5 < duration < 10.5  # Allow small variance
 
+    def test_probes_file_object_in_place(self, short_wav_bytes):
+        """Seekable files should be probed without copying and left rewound."""
+        file_obj = io.BytesIO(short_wav_bytes)
+        file_obj.seek(100)
+
+        duration = get_audio_duration(file_obj, "test.wav")
+
+        assert duration == pytest.approx(10.0, abs=0.1)
+        assert file_obj.tell() == 0
+
     def test_returns_none_for_unknown_format(self):
         """Unknown file formats should return None, not raise."""
         content = b"not audio data at all"
@@ -114,7 +164,8 @@ class TestValidateAudioDuration:
     def test_passes_when_under_limit(self, short_wav_bytes):
         """Audio under limit should pass without raising."""
         # 10 second audio, 180 second limit - should not raise
-        validate_audio_duration(short_wav_bytes, "test.wav", 180)
+        duration = validate_audio_duration(short_wav_bytes, "test.wav", 180)
+        assert duration == pytest.approx(10.0, abs=0.1)
 
     def test_passes_at_exact_limit(self, exact_limit_wav_bytes):
         """Audio exactly at limit should pass."""
@@ -140,9 +191,15 @@ class TestValidateAudioDuration:
 
     def test_allows_unknown_duration(self):
         """Files where duration cannot be determined should be allowed."""
-        content = b"unknown format data"
+        content = b"\x1a\x45\xdf\xa3webm without a duration parser"
         # Should not raise
-        validate_audio_duration(content, "test.xyz", 180)
+        assert validate_audio_duration(content, "test.webm", 180) is None
+
+    def test_rejects_unknown_format(self):
+        """Content that isn't a recognised audio format should be rejected."""
+        with pytest.raises(AudioValidationError) as exc_info:
+            validate_audio_duration(b"unknown format data", "test.mp3", 180)
+        assert exc_info.value.error_type == "unsupported_format"
 
     def test_configurable_limit(self, short_wav_bytes):
         """Limit should be configurable."""
@@ -151,6 +208,225 @@ class TestValidateAudioDuration:
             validate_audio_duration(short_wav_bytes, "test.wav", 5)
 
 
+class _CountingReader(io.BytesIO):
+    """BytesIO that records how many bytes were read."""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def create_flac_header(sample_rate: int, total_samples: int) -> bytes:
+    """fLaC marker plus a last-block STREAMINFO carrying rate and sample count."""
+    packed = (sample_rate << 44) | (0 << 41) | (15 << 36) | total_samples  # mono, 16 bit
+    streaminfo = b"\x00" * 10 + packed.to_bytes(8, "big") + b"\x00" * 16
+    return b"fLaC" + bytes([0x80, 0, 0, 34]) + streaminfo
+
+
+class TestSniffAudioFormat:
+    """Tests for magic-byte format detection."""
+
+    @pytest.mark.parametrize(
+        "head, expected",
+        [
+            (b"ID3\x04\x00\x00\x00\x00\x00\x00" + b"\xff\xfb\x90\x00", "mp3"),
+            (b"\xff\xfb\x90\x00", "mp3"),
+            (b"\xff\xf1\x50\x80", "aac"),
+            (b"RIFF\x00\x00\x00\x00WAVEfmt ", "wav"),
+            (b"OggS\x00\x02", "ogg"),
+            (b"fLaC\x00\x00\x00\x22", "flac"),
+            (b"\x00\x00\x00\x20ftypM4A ", "mp4"),
+            (b"\x00\x00\x00\x18ftypmp42", "mp4"),
+            (b"\x00\x00\x00\x18ftyp3gp5", "mp4"),
+            (b"\x00\x00\x00\x18ftypheic", None),
+            (b"\x00\x00\x00\x14ftypqt  ", None),
+            (b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81", "webm"),
+            (b"ID3\x04\x00\x00\x00\x00\x00\x00fLaC\x00\x00\x00\x22", "flac"),
+            (b"<html>", None),
+            (b"PK\x03\x04", None),
+            (b"", None),
+        ],
+    )
+    def test_sniff(self, head, expected):
+        assert sniff_audio_format(head) == expected
+
+    def test_heic_image_is_rejected(self):
+        with pytest.raises(AudioValidationError) as exc_info:
+            require_audio_format(b"\x00\x00\x00\x18ftypheic\x00\x00\x00\x00mif1heic", "photo.m4a")
+
+        assert exc_info.value.error_type == "unsupported_format"
+
+    def test_wav_fixture_is_recognised(self, short_wav_bytes):
+        assert sniff_audio_format(short_wav_bytes[:64]) == "wav"
+
+
+class TestHeaderProbe:
+    """Tests for header-only duration probing and the async prober."""
+
+    @pytest.mark.asyncio
+    async def test_wav_reads_only_headers(self, long_wav_bytes):
+        """WAV duration should come from the first HEADER_PROBE_BYTES only."""
+        file_obj = _CountingReader(long_wav_bytes)
+
+        assert await AudioProber().duration(file_obj, "a.wav") == pytest.approx(240.0)
+        assert file_obj.bytes_read <= HEADER_PROBE_BYTES < len(long_wav_bytes)
+
+    def test_wav_with_unset_data_size_uses_file_size(self):
+        wav = bytearray(create_wav_bytes(10.0))
+        wav[40:44] = b"\xff\xff\xff\xff"  # Streamed recording, size never patched
+
+        assert header_duration(bytes(wav), len(wav)) == pytest.approx(10.0)
+
+    def test_flac_streaminfo(self):
+        flac = create_flac_header(44100, 44100 * 90) + b"\x00" * 100
+
+        assert header_duration(flac, len(flac)) == pytest.approx(90.0)
+
+    def test_other_formats_fall_through(self):
+        assert header_duration(b"ID3" + b"\x00" * 100, 103) is None
+
+    @pytest.mark.asyncio
+    async def test_prober_uses_headers_without_thread(self, short_wav_bytes, monkeypatch):
+        monkeypatch.setattr(audio_module, "_mutagen_duration", pytest.fail)
+
+        assert await AudioProber().duration(io.BytesIO(short_wav_bytes), "a.wav") == pytest.approx(10.0)
+
+    @pytest.mark.asyncio
+    async def test_prober_timeout_allows_through(self, monkeypatch):
+        """A slow probe should count as unknown without blocking the loop."""
+        monkeypatch.setattr(audio_module, "_mutagen_duration", lambda f, n, fmt: time.sleep(0.5) or 60.0)
+        prober = AudioProber(concurrency=1, timeout=0.05)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.ensure_future(ticker())
+        duration = await prober.duration(io.BytesIO(b"ID3" + b"\x00" * 7 + b"slow mp3"), "a.mp3")
+        task.cancel()
+
+        assert duration is None
+        assert ticks >= 3
+
+    def test_prober_does_not_move_upload_position(self, tmp_path):
+        """The worker reads through its own handle, not the upload's offset."""
+        path = tmp_path / "upload.bin"
+        path.write_bytes(b"not audio" * 1000)
+        with open(path, "rb") as upload:
+            upload.seek(123)
+            handle = audio_module._independent_handle(upload)
+            handle.seek(0)
+            assert handle.read(9) == b"not audio"
+            assert upload.tell() == 123
+            handle.close()
+
+    @pytest.mark.asyncio
+    async def test_timed_out_probe_outlives_closed_upload(self, monkeypatch, tmp_path):
+        """Closing the upload mustn't pull the file out from under a probe that is still running."""
+        started, release = threading.Event(), threading.Event()
+        read_back = []
+
+        def slow_probe(file_obj, filename, audio_format):
+            started.set()
+            release.wait(5)
+            file_obj.seek(0)
+            read_back.append(file_obj.read(3))
+            return None
+
+        monkeypatch.setattr(audio_module, "_mutagen_duration", slow_probe)
+        path = tmp_path / "upload.mp3"
+        path.write_bytes(b"ID3" + b"\x00" * 7 + b"slow mp3")
+        upload = open(path, "rb")
+
+        assert await AudioProber(timeout=0.05).duration(upload, "a.mp3") is None
+        await asyncio.to_thread(started.wait, 5)
+        upload.close()
+        other = open(tmp_path / "other.bin", "wb+")  # Likely to get the freed fd number
+        release.set()
+        for _ in range(100):
+            if read_back:
+                break
+            await asyncio.sleep(0.01)
+        other.close()
+
+        assert read_back == [b"ID3"]
+
+    @pytest.mark.asyncio
+    async def test_prober_validate_raises_over_limit(self, long_wav_bytes):
+        with pytest.raises(AudioValidationError):
+            await AudioProber().validate(long_wav_bytes, "a.wav", 180)
+
+
+class TestAudioProbePool:
+    """Tests for probing in worker processes."""
+
+    @pytest.fixture
+    def pool(self):
+        pool = AudioProbePool(workers=1, max_queue=0, timeout=10.0)
+        yield pool
+        pool.close()
+
+    @pytest.mark.asyncio
+    async def test_probes_spooled_upload_by_path(self, pool):
+        upload = NamedSpooledTemporaryFile(max_size=1024)
+        upload.write(create_muxed_opus_bytes(500))  # Rolls over to disk
+
+        assert audio_module.upload_path(upload) is not None
+        assert await AudioProber(pool=pool).duration(upload, "a.opus") == pytest.approx(10.0)
+        assert upload.tell() == 0
+
+    @pytest.mark.asyncio
+    async def test_probes_in_memory_upload(self, pool):
+        upload = io.BytesIO(create_muxed_opus_bytes(50))
+
+        assert await AudioProber(pool=pool).duration(upload, "a.opus") == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_in_memory_spool_stays_in_memory(self, pool):
+        upload = NamedSpooledTemporaryFile(max_size=1024 * 1024)
+        upload.write(create_muxed_opus_bytes(50))
+
+        assert await AudioProber(pool=pool).duration(upload, "a.opus") == pytest.approx(1.0)
+        assert audio_module.upload_path(upload) is None
+
+    @pytest.mark.asyncio
+    async def test_full_queue_allows_through(self, pool):
+        async with pool._slots:
+            assert await pool.duration(b"anything", "a.opus", "ogg") is None
+
+    @pytest.mark.asyncio
+    async def test_stuck_probe_is_killed(self, pool, monkeypatch, tmp_path):
+        monkeypatch.setattr(audio_module, "_probe_file", _stuck_probe)
+        pool.timeout = 2.0
+        executor = pool._executor
+        path = tmp_path / "upload.opus"
+        path.write_bytes(b"stuck")
+        with open(path, "rb") as upload:
+            assert await pool.duration(upload, "a.opus", "ogg") is None
+
+        assert pool._executor is not executor
+        pid = int((tmp_path / "upload.opus.pid").read_text())
+        for _ in range(50):
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("stuck probe worker is still running")
+
+        monkeypatch.undo()
+        pool.timeout = 10.0
+        assert await pool.duration(create_muxed_opus_bytes(50), "a.opus", "ogg") == pytest.approx(1.0)
+
+
 # =============================================================================
 # Integration Tests: /api/transcribe endpoint
 # =============================================================================
@@ -230,42 +506,36 @@ class TestTranscribeEndpointDurationValidation:
         assert response.status_code == 202
         assert response.json()["entry_id"] == "entry-123"
 
-    def test_accepts_unknown_format(self, client, test_settings):
-        """Files with unknown format should be allowed through."""
+    def test_forwards_spooled_upload_intact(self, client, test_settings):
+        """Uploads spooled to disk should be streamed to Core byte-for-byte."""
         import respx
         from httpx import Response
 
-        test_settings.MAX_AUDIO_DURATION_SECONDS = 180
-
-        # Mock Core API success
-        respx.post(
+        wav = create_wav_bytes(120.0)  # ~1.9 MB, past Starlette's in-memory spool
+        route = respx.post(
             f"{test_settings.CORE_API_URL}/api/v1/upload-transcribe-cleanup"
-        ).mock(
-            return_value=Response(
-                202,
-                json={
-                    "entry_id": "entry-456",
-                    "original_filename": "test.xyz",
-                    "saved_filename": "saved-test.xyz",
-                    "duration_seconds": 0,
-                    "entry_type": "journal",
-                    "uploaded_at": "2025-01-01T00:00:00Z",
-                    "transcription_id": "trans-456",
-                    "transcription_status": "processing",
-                    "transcription_language": "sl",
-                    "cleanup_id": "cleanup-456",
-                    "cleanup_status": "pending",
-                    "cleanup_model": "llama3",
-                    "message": "Upload successful",
-                },
-            )
-        )
+        ).mock(return_value=Response(202, json={"entry_id": "entry-789"}))
 
-        # Unknown format - should be allowed through
-        files = {"file": ("test.xyz", io.BytesIO(b"unknown format"), "audio/unknown")}
+        files = {"file": ("test.wav", io.BytesIO(wav), "audio/wav")}
         response = client.post("/api/transcribe", files=files)
 
         assert response.status_code == 202
+        sent = route.calls.last.request
+        assert wav in sent.content
+        assert int(sent.headers["content-length"]) == len(sent.content)
+
+    def test_rejects_unknown_format(self, client, test_settings):
+        """Non-audio content should be rejected without reaching Core."""
+        import respx
+
+        route = respx.post(f"{test_settings.CORE_API_URL}/api/v1/upload-transcribe-cleanup")
+
+        files = {"file": ("test.mp3", io.BytesIO(b"<html>not audio</html>"), "audio/mpeg")}
+        response = client.post("/api/transcribe", files=files)
+
+        assert response.status_code == 422
+        assert "Unsupported audio format" in response.json()["detail"]
+        assert not route.called
 
 
 class TestAudioValidationErrorMessage:
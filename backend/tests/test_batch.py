@@ -0,0 +1,146 @@
+"""Tests for the batch endpoint."""
+
+import respx
+from httpx import Response
+
+from app.main import app
+from app.models import Session as SessionModel
+from app.routes.batch import match_batchable
+from app.session import SESSION_COOKIE_NAME
+
+
+def _batchable(path: str) -> bool:
+    return match_batchable(app.router, path) is not None
+
+
+class TestMatchBatchable:
+    """Tests for the batch route allowlist."""
+
+    def test_batchable_routes(self):
+        assert _batchable("/api/transcriptions/trans-1")
+        assert _batchable("/api/cleaned-entries/c-1/analyses")
+        assert _batchable("/api/entries")
+        assert _batchable("/api/entries/e-1")
+        assert _batchable("/api/options")
+
+    def test_non_batchable_routes(self):
+        assert not _batchable("/api/entries/e-1/audio")
+        assert not _batchable("/api/transcriptions/../auth/login")
+        assert not _batchable("/api/config")
+        assert not _batchable("/api/jobs/stream")
+        assert not _batchable("/api/transcribe")
+
+
+class TestBatchEndpoint:
+    """Tests for POST /api/batch."""
+
+    def test_runs_items_and_preserves_order(self, client, test_settings):
+        """Each item gets its own status and raw body, in request order."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/trans-1").mock(
+            return_value=Response(200, json={"id": "trans-1", "status": "completed"})
+        )
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/analyses/analysis-404").mock(
+            return_value=Response(404, json={"detail": "Analysis not found"})
+        )
+
+        response = client.post(
+            "/api/batch",
+            json={
+                "requests": [
+                    {"id": "t", "path": "/api/transcriptions/trans-1"},
+                    {"path": "/api/analyses/analysis-404"},
+                    {"id": "x", "path": "/api/entries/entry-1/audio"},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        items = response.json()["responses"]
+        assert items[0]["id"] == "t"
+        assert items[0]["status"] == 200
+        assert items[0]["body"] == {"id": "trans-1", "status": "completed"}
+        assert items[1]["id"] == "1"
+        assert items[1]["status"] == 404
+        assert items[1]["body"]["detail"] == '{"detail":"Analysis not found"}'
+        assert items[2]["id"] == "x"
+        assert items[2]["status"] == 404
+
+    def test_items_get_etags_and_304s(self, client, test_settings):
+        """Batched reads go through the real handlers, including conditional GETs."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/trans-1").mock(
+            return_value=Response(200, json={"id": "trans-1", "status": "completed"})
+        )
+        path = "/api/transcriptions/trans-1"
+
+        first = client.post("/api/batch", json={"requests": [{"path": path}]}).json()["responses"][0]
+        etag = first["headers"]["etag"]
+        second = client.post(
+            "/api/batch", json={"requests": [{"path": path, "if_none_match": etag}]}
+        ).json()["responses"][0]
+
+        assert second == {"id": "0", "status": 304, "headers": {"etag": etag}, "body": None}
+
+    def test_pending_job_carries_poll_hints(self, client, test_settings):
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/trans-1").mock(
+            return_value=Response(200, json={"id": "trans-1", "status": "processing"})
+        )
+
+        item = client.post(
+            "/api/batch", json={"requests": [{"path": "/api/transcriptions/trans-1"}]}
+        ).json()["responses"][0]
+
+        assert "x-poll-after" in item["headers"]
+        assert "retry-after" in item["headers"]
+
+    def test_entries_list_and_options(self, client, test_settings):
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/options").mock(
+            return_value=Response(200, json={"models": []})
+        )
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries").mock(
+            return_value=Response(200, json={"entries": [], "total": 0, "limit": 20, "offset": 0})
+        )
+
+        items = client.post(
+            "/api/batch",
+            json={"requests": [{"path": "/api/options"}, {"path": "/api/entries?limit=20"}]},
+        ).json()["responses"]
+
+        assert [item["status"] for item in items] == [200, 200]
+        assert items[0]["body"] == {"models": []}
+
+    def test_items_share_the_batch_session(self, client, test_settings, test_db):
+        """A new session is created once for the batch, not once per item."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/analysis-profiles").mock(
+            return_value=Response(200, json=[])
+        )
+
+        response = client.post("/api/batch", json={"requests": [{"path": "/api/analysis-profiles"}] * 3})
+
+        assert [item["status"] for item in response.json()["responses"]] == [200] * 3
+        assert test_db.query(SessionModel).count() == 1
+        assert response.cookies.get(SESSION_COOKIE_NAME)
+
+    def test_too_many_items(self, client, test_settings):
+        """Batches over BATCH_MAX_ITEMS should be rejected as a whole."""
+        test_settings.BATCH_MAX_ITEMS = 2
+        response = client.post(
+            "/api/batch",
+            json={"requests": [{"path": "/api/analysis-profiles"}] * 3},
+        )
+
+        assert response.status_code == 422
+
+    def test_response_size_limit(self, client, test_settings):
+        """Items past the response size budget should get 413."""
+        test_settings.BATCH_MAX_RESPONSE_BYTES = 100
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/trans-1").mock(
+            return_value=Response(200, json={"text": "x" * 60})
+        )
+
+        response = client.post(
+            "/api/batch",
+            json={"requests": [{"path": "/api/transcriptions/trans-1"}] * 2},
+        )
+
+        statuses = sorted(item["status"] for item in response.json()["responses"])
+        assert statuses == [200, 413]
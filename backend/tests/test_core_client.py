@@ -0,0 +1,266 @@
+"""Tests for CoreAPIClient request handling."""
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from app.core_client import CoreAPIClient, CoreAPIError
+
+CORE_URL = "http://core-api:8000"
+
+
+def _slow_json(payload: dict, delay: float = 0.05):
+    """Build a respx side effect that answers after a short delay."""
+
+    async def side_effect(request):
+        await asyncio.sleep(delay)
+        return Response(200, json=payload)
+
+    return side_effect
+
+
+class TestSingleFlight:
+    """Tests for coalescing identical in-flight GETs."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_share_one_call(self):
+        """Identical concurrent GETs should hit Core once and share the response."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            route = respx.get(f"{CORE_URL}/api/v1/transcriptions/trans-123").mock(
+                side_effect=_slow_json({"id": "trans-123", "status": "processing"})
+            )
+            responses = await asyncio.gather(
+                *[
+                    client.request("GET", "/api/v1/transcriptions/trans-123", "token-a")
+                    for _ in range(5)
+                ]
+            )
+
+        assert route.call_count == 1
+        assert all(r.json()["id"] == "trans-123" for r in responses)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_different_tokens_are_not_shared(self):
+        """Requests from different sessions must never share a response."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            route = respx.get(f"{CORE_URL}/api/v1/transcriptions/trans-123").mock(
+                side_effect=_slow_json({"id": "trans-123"})
+            )
+            await asyncio.gather(
+                client.request("GET", "/api/v1/transcriptions/trans-123", "token-a"),
+                client.request("GET", "/api/v1/transcriptions/trans-123", "token-b"),
+            )
+
+        assert route.call_count == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_different_params_are_not_shared(self):
+        """Query params are part of the coalescing key."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            route = respx.get(f"{CORE_URL}/api/v1/entries").mock(
+                side_effect=_slow_json({"entries": []})
+            )
+            await asyncio.gather(
+                client.request("GET", "/api/v1/entries", "token-a", params={"limit": 10}),
+                client.request("GET", "/api/v1/entries", "token-a", params={"limit": 20}),
+            )
+
+        assert route.call_count == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_sequential_gets_are_not_cached(self):
+        """Once a call completes, the next GET goes upstream again."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            route = respx.get(f"{CORE_URL}/api/v1/analyses/analysis-123").mock(
+                return_value=Response(200, json={"status": "processing"})
+            )
+            await client.request("GET", "/api/v1/analyses/analysis-123", "token-a")
+            await client.request("GET", "/api/v1/analyses/analysis-123", "token-a")
+
+        assert route.call_count == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_are_never_coalesced(self):
+        """Non-GET requests always get their own upstream call."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            route = respx.delete(f"{CORE_URL}/api/v1/entries/entry-123").mock(
+                return_value=Response(200, json={"deleted_id": "entry-123"})
+            )
+            await asyncio.gather(
+                client.request("DELETE", "/api/v1/entries/entry-123", "token-a"),
+                client.request("DELETE", "/api/v1/entries/entry-123", "token-a"),
+            )
+
+        assert route.call_count == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_error_reaches_every_waiter(self):
+        """A failed shared call should raise CoreAPIError for all callers."""
+        client = CoreAPIClient(base_url=CORE_URL)
+
+        async def fail(request):
+            await asyncio.sleep(0.05)
+            raise httpx.ConnectError("Connection refused")
+
+        with respx.mock:
+            respx.get(f"{CORE_URL}/api/v1/entries").mock(side_effect=fail)
+            results = await asyncio.gather(
+                client.request("GET", "/api/v1/entries", "token-a"),
+                client.request("GET", "/api/v1/entries", "token-a"),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(r, CoreAPIError) and r.status_code == 503 for r in results)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        """One caller going away must not cancel the request for the others."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            route = respx.get(f"{CORE_URL}/api/v1/entries").mock(
+                side_effect=_slow_json({"entries": []}, delay=0.1)
+            )
+            first = asyncio.ensure_future(client.request("GET", "/api/v1/entries", "token-a"))
+            second = asyncio.ensure_future(client.request("GET", "/api/v1/entries", "token-a"))
+            await asyncio.sleep(0.02)
+            first.cancel()
+            response = await second
+
+        assert response.status_code == 200
+        assert route.call_count == 1
+        await client.close()
+
+
+def _warm_up(client: CoreAPIClient, path: str, seconds: float, count: int = 50) -> None:
+    """Seed the latency histogram for a path so hedging has a baseline."""
+    for _ in range(count):
+        client.metrics.record("GET", path, 200, seconds)
+
+
+class TestHedging:
+    """Tests for hedged GETs."""
+
+    @pytest.mark.asyncio
+    async def test_slow_get_is_hedged_and_fast_copy_wins(self):
+        """A GET slower than the observed p95 should be resent; the first answer wins."""
+        client = CoreAPIClient(base_url=CORE_URL, hedge_gets=True, hedge_max_ratio=1.0)
+        _warm_up(client, "/api/v1/entries/e1", 0.01)
+        calls = 0
+
+        async def side_effect(request):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(1.0 if calls == 1 else 0.0)
+            return Response(200, json={"attempt": calls})
+
+        with respx.mock:
+            respx.get(f"{CORE_URL}/api/v1/entries/e1").mock(side_effect=side_effect)
+            response = await asyncio.wait_for(
+                client.request("GET", "/api/v1/entries/e1", "token-a"), timeout=0.5
+            )
+
+        assert response.json() == {"attempt": 2}
+        assert client.metrics.counters["hedged_requests"] == 1
+        assert client.metrics.counters["hedge_wins"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_losing_attempt_is_recorded(self):
+        """The cancelled slow primary must still count, or hedging lowers its own p95."""
+        client = CoreAPIClient(base_url=CORE_URL, hedge_gets=True, hedge_max_ratio=1.0)
+        _warm_up(client, "/api/v1/entries/e1", 0.01)
+        calls = 0
+
+        async def side_effect(request):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(1.0 if calls == 1 else 0.0)
+            return Response(200, json={"attempt": calls})
+
+        with respx.mock:
+            respx.get(f"{CORE_URL}/api/v1/entries/e1").mock(side_effect=side_effect)
+            await client.request("GET", "/api/v1/entries/e1", "token-a")
+
+        stats = client.metrics.snapshot()["endpoints"][0]
+        assert stats["status"] == {"2xx": 51, "cancelled": 1}
+        assert stats["latency"]["count"] == 52
+        assert stats["latency"]["max_ms"] > 10.0  # The primary outlived the 10 ms p95
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_stops_primary(self):
+        """Cancelling before the hedge delay must not leave the primary running unrecorded."""
+        # Not coalesced: a shared GET deliberately outlives any one caller
+        client = CoreAPIClient(base_url=CORE_URL, coalesce_gets=False, hedge_gets=True, hedge_max_ratio=1.0)
+        _warm_up(client, "/api/v1/entries/e1", 1.0)
+
+        with respx.mock:
+            respx.get(f"{CORE_URL}/api/v1/entries/e1").mock(side_effect=_slow_json({"id": "e1"}, delay=5.0))
+            task = asyncio.ensure_future(client.request("GET", "/api/v1/entries/e1", "token-a"))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        stats = client.metrics.snapshot()["endpoints"][0]
+        assert stats["status"] == {"2xx": 50, "cancelled": 1}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_enough_samples(self):
+        """Endpoints without a latency baseline should never be hedged."""
+        client = CoreAPIClient(base_url=CORE_URL, hedge_gets=True, hedge_max_ratio=1.0)
+        _warm_up(client, "/api/v1/entries/e1", 0.001, count=5)
+        with respx.mock:
+            route = respx.get(f"{CORE_URL}/api/v1/entries/e1").mock(
+                side_effect=_slow_json({"id": "e1"}, delay=0.05)
+            )
+            await client.request("GET", "/api/v1/entries/e1", "token-a")
+
+        assert route.call_count == 1
+        assert "hedged_requests" not in client.metrics.counters
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_budget_limits_hedges(self):
+        """With a low ratio, the budget should refuse hedges until enough GETs have run."""
+        client = CoreAPIClient(base_url=CORE_URL, hedge_gets=True, hedge_max_ratio=0.05)
+        _warm_up(client, "/api/v1/entries/e1", 0.001)
+        with respx.mock:
+            route = respx.get(f"{CORE_URL}/api/v1/entries/e1").mock(
+                side_effect=_slow_json({"id": "e1"}, delay=0.02)
+            )
+            for _ in range(3):
+                await client.request("GET", "/api/v1/entries/e1", "token-a")
+
+        assert route.call_count == 3
+        assert "hedged_requests" not in client.metrics.counters
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_are_never_hedged(self):
+        """Non-idempotent requests must be sent exactly once."""
+        client = CoreAPIClient(base_url=CORE_URL, hedge_gets=True, hedge_max_ratio=1.0)
+        client.metrics.record("POST", "/api/v1/cleaned-entries/c1/analyze", 200, 0.001)
+        with respx.mock:
+            route = respx.post(f"{CORE_URL}/api/v1/cleaned-entries/c1/analyze").mock(
+                side_effect=_slow_json({"id": "a1"}, delay=0.05)
+            )
+            await client.request("POST", "/api/v1/cleaned-entries/c1/analyze", "token-a", json={})
+
+        assert route.call_count == 1
+        await client.close()
@@ -0,0 +1,162 @@
+"""Tests for the local Core API stand-in."""
+
+import asyncio
+import io
+from dataclasses import replace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from core_standin.payloads import build_wav
+from core_standin.profiles import (
+    PROFILES,
+    JobTiming,
+    LatencyDistribution,
+    StandinProfile,
+    profile_from_env,
+)
+from core_standin.server import create_app
+
+
+def _login(client: TestClient) -> dict:
+    """Register and log in a user, returning auth headers."""
+    credentials = {"email": "load@test.example", "password": "password123"}
+    assert client.post("/api/v1/auth/register", json=credentials).status_code == 201
+    tokens = client.post("/api/v1/auth/login", json=credentials).json()
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+def _upload(client: TestClient, headers: dict, seconds: float = 30.0) -> dict:
+    files = {"file": ("test.wav", io.BytesIO(build_wav(seconds)), "audio/wav")}
+    data = {"analysis_profile": "generic-summary"}
+    response = client.post("/api/v1/upload-transcribe-cleanup", files=files, data=data, headers=headers)
+    assert response.status_code == 202
+    return response.json()
+
+
+class TestProfiles:
+    """Tests for profile parsing."""
+
+    def test_latency_spec_parsing(self):
+        assert LatencyDistribution.parse("fixed:25") == LatencyDistribution("fixed", 25.0)
+        assert LatencyDistribution.parse("lognormal:40:0.5") == LatencyDistribution("lognormal", 40.0, 0.5)
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse("gaussian:1")
+
+    def test_env_overrides_apply_to_preset(self):
+        profile = profile_from_env({
+            "STANDIN_PROFILE": "flaky",
+            "STANDIN_LATENCY": "uniform:5:10",
+            "STANDIN_AUDIO_RANGES": "false",
+        })
+        assert profile.name == "flaky"
+        assert profile.error_rate == PROFILES["flaky"].error_rate
+        assert profile.latency == LatencyDistribution("uniform", 5.0, 10.0)
+        assert profile.audio_ranges is False
+
+    def test_unknown_profile_rejected(self):
+        with pytest.raises(ValueError):
+            profile_from_env({"STANDIN_PROFILE": "nope"})
+
+
+class TestStandinEndpoints:
+    """Functional tests against the instant profile."""
+
+    def test_requires_authentication(self):
+        client = TestClient(create_app(PROFILES["instant"]))
+        assert client.get("/api/v1/entries").status_code == 401
+
+    def test_upload_flow_completes_with_word_payload(self):
+        client = TestClient(create_app(PROFILES["instant"]))
+        headers = _login(client)
+        job = _upload(client, headers, seconds=60.0)
+
+        transcription = client.get(f"/api/v1/transcriptions/{job['transcription_id']}", headers=headers).json()
+        assert transcription["status"] == "completed"
+        assert transcription["words"][-1]["end"] == pytest.approx(60.0, abs=1.0)
+
+        cleanup = client.get(f"/api/v1/cleaned-entries/{job['cleanup_id']}", headers=headers).json()
+        assert cleanup["status"] == "completed"
+        assert cleanup["voice_entry_id"] == job["entry_id"]
+
+        analysis = client.get(f"/api/v1/analyses/{job['analysis_id']}", headers=headers).json()
+        assert analysis["status"] == "completed"
+        assert "summary" in analysis["result"]
+
+        entries = client.get("/api/v1/entries", headers=headers).json()
+        assert entries["entries"][0]["latest_cleaned_entry"]["id"] == job["cleanup_id"]
+
+    def test_jobs_progress_through_states(self):
+        profile = replace(
+            PROFILES["instant"],
+            transcription=JobTiming(pending=0.05, base=0.1),
+        )
+        client = TestClient(create_app(profile))
+        headers = _login(client)
+        job = _upload(client, headers)
+        url = f"/api/v1/transcriptions/{job['transcription_id']}"
+
+        seen = [client.get(url, headers=headers).json()["status"]]
+        for _ in range(50):
+            status = client.get(url, headers=headers).json()["status"]
+            if status != seen[-1]:
+                seen.append(status)
+            if status == "completed":
+                break
+            asyncio.run(asyncio.sleep(0.01))
+
+        assert seen == ["pending", "processing", "completed"]
+
+    def test_error_injection(self):
+        profile = replace(PROFILES["instant"], error_rate=1.0, error_statuses=(503,))
+        client = TestClient(create_app(profile))
+        assert client.post("/api/v1/auth/login", json={"email": "x", "password": "y"}).status_code == 503
+
+    def test_audio_range_support(self):
+        client = TestClient(create_app(PROFILES["instant"]))
+        headers = _login(client)
+        job = _upload(client, headers, seconds=1.0)
+        url = f"/api/v1/entries/{job['entry_id']}/audio"
+
+        full = client.get(url, headers=headers)
+        partial = client.get(url, headers={**headers, "Range": "bytes=100-199"})
+
+        assert partial.status_code == 206
+        assert partial.headers["content-range"] == f"bytes 100-199/{len(full.content)}"
+        assert partial.content == full.content[100:200]
+
+    def test_audio_ranges_can_be_disabled(self):
+        client = TestClient(create_app(replace(PROFILES["instant"], audio_ranges=False)))
+        headers = _login(client)
+        job = _upload(client, headers, seconds=1.0)
+
+        response = client.get(
+            f"/api/v1/entries/{job['entry_id']}/audio",
+            headers={**headers, "Range": "bytes=100-199"},
+        )
+
+        assert response.status_code == 200
+        assert "accept-ranges" not in response.headers
+
+
+class TestWrapperAgainstStandin:
+    """The wrapper's CoreAPIClient should work unchanged against the stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_core_client_session_flow(self):
+        from app.core_client import CoreAPIClient
+
+        core_api = CoreAPIClient(base_url="http://standin")
+        core_api.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=create_app(StandinProfile())),
+            base_url="http://standin",
+        )
+
+        await core_api.register("anon@test.example", "password123")
+        tokens = await core_api.login("anon@test.example", "password123")
+        response = await core_api.request("GET", "/api/v1/entries", tokens["access_token"])
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 0
+        await core_api.close()
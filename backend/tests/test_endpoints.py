@@ -40,7 +40,7 @@ class TestTranscribeEndpoint:
         )
 
         # Create a test audio file
-        audio_content = b"fake audio content"
+        audio_content = b"ID3\x03\x00\x00\x00\x00\x00\x00fake audio content"  # ID3 tag passes format sniffing
         files = {"file": ("test.mp3", io.BytesIO(audio_content), "audio/mpeg")}
         data = {
             "language": "sl",
@@ -69,7 +69,7 @@ class TestTranscribeEndpoint:
             )
         )
 
-        files = {"file": ("test.mp3", io.BytesIO(b"fake"), "audio/mpeg")}
+        files = {"file": ("test.mp3", io.BytesIO(b"ID3\x03\x00\x00\x00\x00\x00\x00fake"), "audio/mpeg")}
         response = client.post("/api/transcribe", files=files)
 
         assert response.status_code == 400
@@ -178,6 +178,43 @@ class TestEntryEndpoints:
 
         assert response.status_code == 200
 
+    def test_list_entries_expand(self, client, test_settings):
+        """expand=cleanup,analyses should fill each entry's latest cleanup and analyses."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries").mock(
+            return_value=Response(
+                200,
+                json={
+                    "entries": [
+                        {"id": "entry-1", "latest_cleaned_entry": {"id": "cleanup-1"}},
+                        {"id": "entry-2", "latest_cleaned_entry": None},
+                    ],
+                    "total": 2,
+                },
+            )
+        )
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/cleaned-entries/cleanup-1").mock(
+            return_value=Response(200, json={"id": "cleanup-1", "status": "completed"})
+        )
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/cleaned-entries/cleanup-1/analyses").mock(
+            return_value=Response(503, json={"detail": "Unavailable"})
+        )
+
+        response = client.get("/api/entries?expand=cleanup,analyses")
+
+        assert response.status_code == 200
+        first, second = response.json()["entries"]
+        assert first["cleanup"]["id"] == "cleanup-1"
+        assert first["analyses"] == []
+        assert first["degraded"] == ["analyses"]
+        assert second["cleanup"] is None
+        assert second["analyses"] == []
+
+    def test_list_entries_expand_rejects_unknown_parts(self, client, test_settings):
+        """Unknown expand values should be rejected before calling Core."""
+        response = client.get("/api/entries?expand=cleanup,audio")
+
+        assert response.status_code == 422
+
     def test_get_entry_success(self, client, test_settings):
         """Test getting a single entry with all related resources."""
         # 1. Main entry endpoint
@@ -513,3 +550,85 @@ class TestErrorHandling:
         response = client.get("/api/entries")
 
         assert response.status_code == 500
+
+
+class TestPassthroughResponses:
+    """Tests for raw byte passthrough of Core API responses."""
+
+    def test_body_bytes_forwarded_unchanged(self, client, test_settings):
+        """Proxied bodies should reach the client byte-for-byte."""
+        raw = b'{"id":"trans-123","status":"completed","words":[{"id":0,"text":"\\u017ee"}]}'
+        respx.get(
+            f"{test_settings.CORE_API_URL}/api/v1/transcriptions/trans-123"
+        ).mock(
+            return_value=Response(
+                200,
+                content=raw,
+                headers={"content-type": "application/json"},
+            )
+        )
+
+        response = client.get("/api/transcriptions/trans-123")
+
+        assert response.status_code == 200
+        assert response.content == raw
+        assert response.headers["content-type"] == "application/json"
+
+    def test_new_session_cookie_set_on_passthrough(self, client, test_settings):
+        """A session created by a passthrough request must still set the cookie."""
+        from app.session import SESSION_COOKIE_NAME
+
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/analyses/analysis-123").mock(
+            return_value=Response(200, json={"id": "analysis-123", "status": "completed"})
+        )
+
+        response = client.get("/api/analyses/analysis-123")
+
+        assert response.status_code == 200
+        assert SESSION_COOKIE_NAME in response.cookies
+
+
+class TestConditionalGet:
+    """Tests for ETag / If-None-Match on proxied reads."""
+
+    def test_etag_and_304(self, client, test_settings):
+        """Unchanged bodies should revalidate to 304 with no body."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/analyses/analysis-123").mock(
+            return_value=Response(200, json={"id": "analysis-123", "status": "processing"})
+        )
+
+        first = client.get("/api/analyses/analysis-123")
+        etag = first.headers["etag"]
+        second = client.get("/api/analyses/analysis-123", headers={"If-None-Match": etag})
+
+        assert first.status_code == 200
+        assert etag.startswith('"')
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_changed_body_returns_200(self, client, test_settings):
+        """A stale ETag should get the new body."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/trans-123").mock(
+            side_effect=[
+                Response(200, json={"id": "trans-123", "status": "processing"}),
+                Response(200, json={"id": "trans-123", "status": "completed"}),
+            ]
+        )
+
+        etag = client.get("/api/transcriptions/trans-123").headers["etag"]
+        response = client.get("/api/transcriptions/trans-123", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+        assert response.headers["etag"] != etag
+
+    def test_upstream_strong_etag_is_reused(self, client, test_settings):
+        """Core's strong ETag should be forwarded instead of hashing."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/cleaned-entries/cleanup-123").mock(
+            return_value=Response(200, json={"id": "cleanup-123"}, headers={"ETag": '"core-v7"'})
+        )
+
+        response = client.get("/api/cleaned-entries/cleanup-123")
+
+        assert response.headers["etag"] == '"core-v7"'
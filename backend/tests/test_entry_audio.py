@@ -0,0 +1,228 @@
+"""Tests for the entry audio proxy (GET /api/entries/{id}/audio)."""
+
+import pytest
+import respx
+from httpx import Response
+
+from app.audio_cache import AudioCache
+from app.utils.byte_range import ByteRange, if_range_matches, parse_range
+
+AUDIO = bytes(range(256)) * 4096  # 1 MiB of recognisable bytes
+ETAG = '"audio-v1"'
+
+# A player scrubbing back and forth: open-ended seeks, a bounded read, a suffix read
+SEEKS = [
+    ("bytes=0-", 0, len(AUDIO) - 1),
+    ("bytes=524288-", 524288, len(AUDIO) - 1),
+    ("bytes=1000-1999", 1000, 1999),
+    ("bytes=104857-", 104857, len(AUDIO) - 1),
+    ("bytes=-4096", len(AUDIO) - 4096, len(AUDIO) - 1),
+    ("bytes=1048000-9999999", 1048000, len(AUDIO) - 1),
+]
+
+
+def core_with_ranges(request):
+    """Core that honours Range, like the standin's default profile."""
+    byte_range = parse_range(request.headers.get("range"))
+    if byte_range is None:
+        return Response(200, content=AUDIO, headers={"content-type": "audio/wav", "etag": ETAG})
+    start, end = byte_range.resolve(len(AUDIO))
+    return Response(
+        206,
+        content=AUDIO[start : end + 1],
+        headers={
+            "content-type": "audio/wav",
+            "etag": ETAG,
+            "content-range": f"bytes {start}-{end}/{len(AUDIO)}",
+        },
+    )
+
+
+def core_without_ranges(request):
+    """Core that always sends the whole file."""
+    return Response(200, content=AUDIO, headers={"content-type": "audio/wav", "etag": ETAG})
+
+
+class TestByteRange:
+    """Tests for Range header parsing."""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("bytes=0-99", (0, 99)),
+            ("bytes=100-", (100, 999)),
+            ("bytes=-10", (990, 999)),
+            ("bytes=900-5000", (900, 999)),
+            ("bytes=1000-", None),
+        ],
+    )
+    def test_resolve(self, header, expected):
+        assert parse_range(header).resolve(1000) == expected
+
+    @pytest.mark.parametrize("header", [None, "", "bytes=0-1,5-6", "items=0-1", "bytes=5-1", "bytes=-"])
+    def test_unsupported_headers_are_ignored(self, header):
+        assert parse_range(header) is None
+
+    def test_if_range(self):
+        assert if_range_matches(None, None, None)
+        assert if_range_matches(ETAG, ETAG, None)
+        assert not if_range_matches('"other"', ETAG, None)
+        assert not if_range_matches('W/"audio-v1"', 'W/"audio-v1"', None)
+        assert if_range_matches("Wed, 01 Jan 2025 00:00:00 GMT", None, "Wed, 01 Jan 2025 00:00:00 GMT")
+
+    def test_suffix_range(self):
+        assert ByteRange(None, 5000).resolve(1000) == (0, 999)
+
+
+class TestEntryAudioRanges:
+    """Tests for Range / 206 support on the audio proxy."""
+
+    @pytest.mark.parametrize("core", [core_with_ranges, core_without_ranges])
+    def test_scrubbing(self, client, test_settings, core):
+        """Every seek should get exactly the requested bytes as a 206."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries/entry-1/audio").mock(side_effect=core)
+
+        for header, start, end in SEEKS:
+            response = client.get("/api/entries/entry-1/audio", headers={"Range": header})
+
+            assert response.status_code == 206, header
+            assert response.content == AUDIO[start : end + 1], header
+            assert response.headers["content-range"] == f"bytes {start}-{end}/{len(AUDIO)}"
+            assert response.headers["content-length"] == str(end - start + 1)
+            assert response.headers["accept-ranges"] == "bytes"
+
+    def test_range_is_forwarded(self, client, test_settings):
+        route = respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries/entry-1/audio").mock(
+            side_effect=core_with_ranges
+        )
+
+        client.get("/api/entries/entry-1/audio", headers={"Range": "bytes=10-20", "If-Range": ETAG})
+
+        assert route.calls.last.request.headers["range"] == "bytes=10-20"
+        assert route.calls.last.request.headers["if-range"] == ETAG
+
+    def test_without_range_serves_whole_file(self, client, test_settings):
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries/entry-1/audio").mock(
+            side_effect=core_without_ranges
+        )
+
+        response = client.get("/api/entries/entry-1/audio")
+
+        assert response.status_code == 200
+        assert response.content == AUDIO
+        assert response.headers["etag"] == ETAG
+
+    def test_stale_if_range_serves_whole_file(self, client, test_settings):
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries/entry-1/audio").mock(
+            side_effect=core_without_ranges
+        )
+
+        response = client.get(
+            "/api/entries/entry-1/audio",
+            headers={"Range": "bytes=10-20", "If-Range": '"audio-v0"'},
+        )
+
+        assert response.status_code == 200
+        assert len(response.content) == len(AUDIO)
+
+    def test_unsatisfiable_range(self, client, test_settings):
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries/entry-1/audio").mock(
+            side_effect=core_without_ranges
+        )
+
+        response = client.get("/api/entries/entry-1/audio", headers={"Range": f"bytes={len(AUDIO)}-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(AUDIO)}"
+
+
+async def _chunks(data: bytes, size: int = 1000):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+async def _drain(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+class TestAudioCache:
+    """Tests for the disk-backed audio LRU."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = AudioCache(str(tmp_path), max_bytes=40_000)
+        yield cache
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_fill_tees_and_stores(self, cache):
+        data = AUDIO[:5000]
+
+        served = await _drain(cache.fill("s1", "e1", _chunks(data), "audio/wav", {}, expected_size=5000))
+
+        assert served == data
+        assert cache.get("s1", "e1").path.read_bytes() == data
+        assert cache.get("s2", "e1") is None  # Other sessions never see it
+
+    @pytest.mark.asyncio
+    async def test_incomplete_fill_is_discarded(self, cache):
+        stream = cache.fill("s1", "e1", _chunks(AUDIO[:5000]), "audio/wav", {}, expected_size=5000)
+        await stream.__anext__()
+        await stream.aclose()  # Client went away
+
+        assert cache.get("s1", "e1") is None
+        assert list(cache.directory.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_size_mismatch_is_discarded(self, cache):
+        await _drain(cache.fill("s1", "e1", _chunks(AUDIO[:5000]), "audio/wav", {}, expected_size=6000))
+
+        assert cache.get("s1", "e1") is None
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_bytes(self, cache):
+        for entry_id in ("e1", "e2", "e3", "e4"):
+            await _drain(cache.fill("s1", entry_id, _chunks(AUDIO[:10_000]), "audio/wav", {}))
+        cache.get("s1", "e1")  # Touch e1 so e2 is the oldest
+        await _drain(cache.fill("s1", "e5", _chunks(AUDIO[:10_000]), "audio/wav", {}))
+
+        assert cache.get("s1", "e2") is None
+        assert cache.get("s1", "e1") is not None
+        assert cache.total_bytes == 40_000
+
+    def test_large_files_are_not_cached(self, cache):
+        assert not cache.can_fill("s1", "e1", 10_001)
+        assert cache.can_fill("s1", "e1", 10_000)
+
+
+class TestEntryAudioCache:
+    """Endpoint tests for serving entry audio from the disk cache."""
+
+    def test_seeks_after_first_play_hit_the_cache(self, client, test_settings):
+        route = respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries/entry-1/audio").mock(
+            side_effect=core_without_ranges
+        )
+
+        first = client.get("/api/entries/entry-1/audio", headers={"Range": "bytes=0-"})
+        seek = client.get("/api/entries/entry-1/audio", headers={"Range": "bytes=2000-2999"})
+        replay = client.get("/api/entries/entry-1/audio")
+
+        assert first.status_code == 206
+        assert first.content == AUDIO
+        assert seek.status_code == 206
+        assert seek.content == AUDIO[2000:3000]
+        assert replay.content == AUDIO
+        assert replay.headers["etag"] == ETAG
+        assert route.call_count == 1
+
+    def test_delete_drops_cached_audio(self, client, test_settings):
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries/entry-1/audio").mock(
+            side_effect=core_without_ranges
+        )
+        respx.delete(f"{test_settings.CORE_API_URL}/api/v1/entries/entry-1").mock(return_value=Response(204))
+
+        client.get("/api/entries/entry-1/audio")
+        assert len(client.app.state.audio_cache) == 1
+        client.delete("/api/entries/entry-1")
+
+        assert len(client.app.state.audio_cache) == 0
@@ -0,0 +1,169 @@
+"""Tests for the composed entry view cache."""
+
+import respx
+from httpx import Response
+
+from app.entry_cache import EntryViewCache, is_settled
+
+
+def _view(status: str = "completed", analyses_status: str = "completed") -> dict:
+    return {
+        "id": "entry-123",
+        "primary_transcription": {"id": "trans-123", "status": "completed"},
+        "cleanup": {"id": "cleanup-123", "status": status},
+        "analyses": [{"id": "analysis-1", "status": analyses_status}],
+    }
+
+
+class TestEntryViewCache:
+    """Tests for EntryViewCache."""
+
+    def test_only_settled_views_are_settled(self):
+        """Any pending job, missing cleanup, or degraded branch prevents caching."""
+        assert is_settled(_view())
+        assert is_settled(_view(status="failed"))
+        assert is_settled(_view(analyses_status="error"))
+        assert not is_settled(_view(status="processing"))
+        assert not is_settled(_view(analyses_status="pending"))
+        assert not is_settled({**_view(), "cleanup": None})
+        assert not is_settled({**_view(), "degraded": ["analyses"]})
+
+    def test_put_and_get(self):
+        """Settled views are cached per session."""
+        cache = EntryViewCache()
+        cache.put("session-a", "entry-123", _view(), b"{}", '"etag"', cache.generation())
+
+        assert cache.get("session-a", "entry-123").etag == '"etag"'
+        assert cache.get("session-b", "entry-123") is None
+
+    def test_unsettled_put_drops_stale_copy(self):
+        """Storing an unsettled view removes any previously cached one."""
+        cache = EntryViewCache()
+        cache.put("session-a", "entry-123", _view(), b"{}", '"etag"', cache.generation())
+        cache.put("session-a", "entry-123", _view(status="processing"), b"{}", '"etag2"', cache.generation())
+
+        assert cache.get("session-a", "entry-123") is None
+
+    def test_lru_eviction(self):
+        """The least recently used view is evicted at capacity."""
+        cache = EntryViewCache(max_entries=2)
+        cache.put("s", "entry-1", _view(), b"1", '"1"', cache.generation())
+        cache.put("s", "entry-2", _view(), b"2", '"2"', cache.generation())
+        cache.get("s", "entry-1")
+        cache.put("s", "entry-3", _view(), b"3", '"3"', cache.generation())
+
+        assert cache.get("s", "entry-1") is not None
+        assert cache.get("s", "entry-2") is None
+
+    def test_ttl_expiry(self):
+        """Views older than the TTL are not served."""
+        cache = EntryViewCache(ttl_seconds=0)
+        cache.put("s", "entry-123", _view(), b"{}", '"etag"', cache.generation())
+
+        assert cache.get("s", "entry-123") is None
+
+    def test_invalidate_by_related_ids(self):
+        """Views are dropped by entry, transcription, or cleanup ID."""
+        cache = EntryViewCache()
+        for kwargs in ({"entry_id": "entry-123"}, {"transcription_id": "trans-123"}, {"cleanup_id": "cleanup-123"}):
+            cache.put("s", "entry-123", _view(), b"{}", '"etag"', cache.generation())
+            cache.invalidate("other-session", **kwargs)
+            assert cache.get("s", "entry-123") is not None
+            cache.invalidate("s", **kwargs)
+            assert cache.get("s", "entry-123") is None
+
+
+    def test_view_built_before_invalidation_is_not_stored(self):
+        """A view composed from Core's state before a write must not be cached after it."""
+        cache = EntryViewCache()
+        for kwargs in ({"entry_id": "entry-123"}, {"cleanup_id": "cleanup-123"}):
+            generation = cache.generation()  # get_entry starts building
+            cache.invalidate("s", **kwargs)  # A write lands meanwhile
+            cache.put("s", "entry-123", _view(), b"{}", '"etag"', generation)
+
+            assert cache.get("s", "entry-123") is None
+
+    def test_invalidation_of_other_entry_does_not_block_put(self):
+        cache = EntryViewCache()
+        cache.put("s", "entry-456", _view(), b"{}", '"etag"', cache.generation())
+        generation = cache.generation()
+        cache.invalidate("s", entry_id="entry-456")
+        cache.put("s", "entry-123", _view(), b"{}", '"etag"', generation)
+
+        assert cache.get("s", "entry-123") is not None
+
+
+class TestEntryViewCacheEndpoints:
+    """Tests for caching and revalidation on GET /api/entries/{id}."""
+
+    def _mock_core(self, test_settings, cleanup_status: str = "completed"):
+        base = test_settings.CORE_API_URL
+        routes = [
+            respx.get(f"{base}/api/v1/entries/entry-123").mock(
+                return_value=Response(
+                    200,
+                    json={"id": "entry-123", "primary_transcription": {"id": "trans-123", "status": "completed"}},
+                )
+            ),
+            respx.get(f"{base}/api/v1/transcriptions/trans-123").mock(
+                return_value=Response(200, json={"id": "trans-123", "status": "completed", "segments": []})
+            ),
+            respx.get(f"{base}/api/v1/entries").mock(
+                return_value=Response(
+                    200,
+                    json={"entries": [{"id": "entry-123", "latest_cleaned_entry": {"id": "cleanup-123"}}]},
+                )
+            ),
+            respx.get(f"{base}/api/v1/cleaned-entries/cleanup-123").mock(
+                return_value=Response(200, json={"id": "cleanup-123", "status": cleanup_status})
+            ),
+            respx.get(f"{base}/api/v1/cleaned-entries/cleanup-123/analyses").mock(
+                return_value=Response(200, json={"analyses": []})
+            ),
+        ]
+        return routes[0]
+
+    def test_settled_view_is_served_from_cache(self, client, test_settings):
+        """A settled view should be served again without calling Core."""
+        entry_route = self._mock_core(test_settings)
+
+        first = client.get("/api/entries/entry-123")
+        second = client.get("/api/entries/entry-123")
+
+        assert first.status_code == 200
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+        assert entry_route.call_count == 1
+
+    def test_unsettled_view_is_rebuilt(self, client, test_settings):
+        """A view with running jobs should be rebuilt on every request."""
+        entry_route = self._mock_core(test_settings, cleanup_status="processing")
+
+        client.get("/api/entries/entry-123")
+        client.get("/api/entries/entry-123")
+
+        assert entry_route.call_count == 2
+
+    def test_if_none_match_returns_304(self, client, test_settings):
+        """A matching If-None-Match should get 304 with no body."""
+        self._mock_core(test_settings)
+        etag = client.get("/api/entries/entry-123").headers["etag"]
+
+        response = client.get("/api/entries/entry-123", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_user_edit_invalidates_view(self, client, test_settings):
+        """Editing the view's cleanup should force a rebuild."""
+        entry_route = self._mock_core(test_settings)
+        respx.put(f"{test_settings.CORE_API_URL}/api/v1/cleaned-entries/cleanup-123/user-edit").mock(
+            return_value=Response(200, json={"id": "cleanup-123"})
+        )
+
+        client.get("/api/entries/entry-123")
+        client.put("/api/cleaned-entries/cleanup-123/user-edit", json={"edited_data": {"words": []}})
+        client.get("/api/entries/entry-123")
+
+        assert entry_route.call_count == 2
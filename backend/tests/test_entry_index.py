@@ -0,0 +1,81 @@
+"""Tests for the per-session entry index."""
+
+import respx
+from httpx import Response
+
+from app.entry_index import (
+    entry_id_for_transcription,
+    forget_entry,
+    lookup_cleanup_id,
+    record_cleanup,
+    record_entries,
+    record_entry,
+)
+
+
+class TestEntryIndex:
+    """Tests for entry index reads and writes."""
+
+    def test_record_and_lookup(self, test_db):
+        """Recorded cleanup IDs should be returned per session."""
+        record_entry(test_db, "session-a", "entry-1", transcription_id="trans-1", cleanup_id="cleanup-1")
+
+        assert lookup_cleanup_id(test_db, "session-a", "entry-1") == "cleanup-1"
+        assert lookup_cleanup_id(test_db, "session-b", "entry-1") is None
+        assert entry_id_for_transcription(test_db, "session-a", "trans-1") == "entry-1"
+
+    def test_missing_ids_do_not_erase_known_ones(self, test_db):
+        """A payload without cleanup info must not clear a known cleanup ID."""
+        record_entry(test_db, "session-a", "entry-1", cleanup_id="cleanup-1")
+        record_entries(test_db, "session-a", [
+            {"id": "entry-1", "primary_transcription": {"id": "trans-1"}, "latest_cleaned_entry": None},
+        ])
+
+        assert lookup_cleanup_id(test_db, "session-a", "entry-1") == "cleanup-1"
+        assert entry_id_for_transcription(test_db, "session-a", "trans-1") == "entry-1"
+
+    def test_new_cleanup_replaces_latest(self, test_db):
+        """A triggered cleanup should become the entry's latest, found via its transcription."""
+        record_entry(test_db, "session-a", "entry-1", transcription_id="trans-1", cleanup_id="cleanup-1")
+        record_cleanup(test_db, "session-a", "trans-1", {"id": "cleanup-2", "status": "pending"})
+
+        assert lookup_cleanup_id(test_db, "session-a", "entry-1") == "cleanup-2"
+
+    def test_forget_entry(self, test_db):
+        """Deleted entries should drop out of the index."""
+        record_entry(test_db, "session-a", "entry-1", cleanup_id="cleanup-1")
+        forget_entry(test_db, "session-a", "entry-1")
+
+        assert lookup_cleanup_id(test_db, "session-a", "entry-1") is None
+
+
+class TestEntryIndexEndpoints:
+    """Tests for index population through the proxy routes."""
+
+    def test_listed_entry_view_skips_entries_list(self, client, test_settings):
+        """After list_entries, get_entry should find the cleanup without listing again."""
+        list_route = respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries").mock(
+            return_value=Response(
+                200,
+                json={
+                    "entries": [{"id": "entry-123", "latest_cleaned_entry": {"id": "cleanup-123"}}],
+                    "total": 1,
+                },
+            )
+        )
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/entries/entry-123").mock(
+            return_value=Response(200, json={"id": "entry-123", "primary_transcription": None})
+        )
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/cleaned-entries/cleanup-123").mock(
+            return_value=Response(200, json={"id": "cleanup-123"})
+        )
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/cleaned-entries/cleanup-123/analyses").mock(
+            return_value=Response(200, json={"analyses": []})
+        )
+
+        assert client.get("/api/entries").status_code == 200
+        response = client.get("/api/entries/entry-123")
+
+        assert response.status_code == 200
+        assert response.json()["cleanup"]["id"] == "cleanup-123"
+        assert list_route.call_count == 1
@@ -0,0 +1,180 @@
+"""Tests for entry view composition."""
+
+import asyncio
+import time
+
+import pytest
+import respx
+from httpx import Response
+
+from app.core_client import CoreAPIClient, CoreAPIError
+from app.entry_view import compose_entry_view, expand_entries
+
+CORE_URL = "http://core-api:8000"
+
+
+def _delayed(payload: dict, delay: float, status: int = 200):
+    """Build a respx side effect that answers after a delay."""
+
+    async def side_effect(request):
+        await asyncio.sleep(delay)
+        return Response(status, json=payload)
+
+    return side_effect
+
+
+def _mock_entry(delay: float = 0.0, analyses_status: int = 200, analyses_delay: float = 0.0):
+    """Mock all five Core calls behind the entry view."""
+    respx.get(f"{CORE_URL}/api/v1/entries/entry-123").mock(
+        side_effect=_delayed(
+            {"id": "entry-123", "primary_transcription": {"id": "trans-123", "status": "completed"}},
+            delay,
+        )
+    )
+    respx.get(f"{CORE_URL}/api/v1/transcriptions/trans-123").mock(
+        side_effect=_delayed({"id": "trans-123", "segments": [{"id": "seg-1"}]}, delay)
+    )
+    respx.get(f"{CORE_URL}/api/v1/entries").mock(
+        side_effect=_delayed(
+            {"entries": [{"id": "entry-123", "latest_cleaned_entry": {"id": "cleanup-123"}}]},
+            delay,
+        )
+    )
+    respx.get(f"{CORE_URL}/api/v1/cleaned-entries/cleanup-123").mock(
+        side_effect=_delayed({"id": "cleanup-123", "cleaned_text": "Hello."}, delay)
+    )
+    respx.get(f"{CORE_URL}/api/v1/cleaned-entries/cleanup-123/analyses").mock(
+        side_effect=_delayed({"analyses": [{"id": "analysis-1"}]}, delay + analyses_delay, analyses_status)
+    )
+
+
+class TestComposeEntryView:
+    """Tests for compose_entry_view."""
+
+    @pytest.mark.asyncio
+    async def test_composes_all_parts(self):
+        """All parts should be merged into the entry payload."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            _mock_entry()
+            data = await compose_entry_view(client, "token", "entry-123", branch_timeout=1.0)
+
+        assert data["primary_transcription"]["segments"] == [{"id": "seg-1"}]
+        assert data["cleanup"]["id"] == "cleanup-123"
+        assert data["analyses"] == [{"id": "analysis-1"}]
+        assert "degraded" not in data
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_costs_two_round_trips(self):
+        """Independent calls should overlap: ~2 round trips, not 5."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            _mock_entry(delay=0.1)
+            start = time.monotonic()
+            await compose_entry_view(client, "token", "entry-123", branch_timeout=1.0)
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.35
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_branch_degrades(self):
+        """A 5xx on an optional branch should leave it empty and mark it degraded."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            _mock_entry(analyses_status=503)
+            data = await compose_entry_view(client, "token", "entry-123", branch_timeout=1.0)
+
+        assert data["cleanup"]["id"] == "cleanup-123"
+        assert data["analyses"] == []
+        assert data["degraded"] == ["analyses"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_branch_times_out(self):
+        """A branch slower than the timeout should not hold up the view."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            _mock_entry(analyses_delay=1.0)
+            start = time.monotonic()
+            data = await compose_entry_view(client, "token", "entry-123", branch_timeout=0.1)
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.5
+        assert data["cleanup"]["id"] == "cleanup-123"
+        assert data["degraded"] == ["analyses"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_missing_entry_raises(self):
+        """Errors on the entry itself should propagate, not degrade."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            _mock_entry()
+            respx.get(f"{CORE_URL}/api/v1/entries/entry-404").mock(
+                return_value=Response(404, json={"detail": "Not found"})
+            )
+            with pytest.raises(CoreAPIError) as exc_info:
+                await compose_entry_view(client, "token", "entry-404", branch_timeout=1.0)
+
+        assert exc_info.value.status_code == 404
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_index_miss_pages_through_entries(self, test_db):
+        """An entry beyond the first page should be found by paging, then indexed."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        first_page = [{"id": f"entry-{i}", "latest_cleaned_entry": None} for i in range(100)]
+        second_page = [{"id": "entry-123", "latest_cleaned_entry": {"id": "cleanup-123"}}]
+
+        def list_side_effect(request):
+            offset = int(request.url.params.get("offset", 0))
+            entries = first_page if offset == 0 else second_page
+            return Response(200, json={"entries": entries, "total": 101})
+
+        with respx.mock:
+            _mock_entry()
+            list_route = respx.get(f"{CORE_URL}/api/v1/entries").mock(side_effect=list_side_effect)
+            data = await compose_entry_view(
+                client, "token", "entry-123", branch_timeout=1.0, db=test_db, session_id="session-a"
+            )
+            assert list_route.call_count == 2
+
+            await compose_entry_view(
+                client, "token", "entry-123", branch_timeout=1.0, db=test_db, session_id="session-a"
+            )
+            assert list_route.call_count == 2
+
+        assert data["cleanup"]["id"] == "cleanup-123"
+        await client.close()
+
+
+class TestExpandEntries:
+    """Tests for expand_entries."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than `concurrency` Core calls should be in flight at once."""
+        client = CoreAPIClient(base_url=CORE_URL)
+        in_flight = 0
+        peak = 0
+
+        async def side_effect(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Response(200, json={"id": "x", "analyses": []})
+
+        entries = [{"id": f"entry-{i}", "latest_cleaned_entry": {"id": f"cleanup-{i}"}} for i in range(20)]
+        with respx.mock:
+            respx.get(url__regex=rf"{CORE_URL}/api/v1/cleaned-entries/.*").mock(side_effect=side_effect)
+            await expand_entries(
+                client, "token", entries, {"cleanup", "analyses"}, branch_timeout=1.0, concurrency=4
+            )
+
+        assert peak == 4
+        assert all(entry["cleanup"] == {"id": "x", "analyses": []} for entry in entries)
+        await client.close()
@@ -0,0 +1,353 @@
+"""Tests for server-side job watching and the SSE job stream."""
+
+import asyncio
+import json
+import time
+
+import pytest
+import respx
+from httpx import Response
+
+from app.core_client import CoreAPIClient
+from app.job_timing import JobTimingModel, LinearFit
+from app.jobs import JobRef, JobUpdate, JobWatchRegistry, parse_job_refs
+
+
+def _events(response) -> list[dict]:
+    """Parse an SSE response body into events (comments dropped)."""
+    events = []
+    for block in response.text.split("\n\n"):
+        event = {}
+        for line in block.split("\n"):
+            if line.startswith(":") or not line:
+                continue
+            field, _, value = line.partition(": ")
+            event[field] = event[field] + "\n" + value if field in event else value
+        if "event" in event:
+            events.append(event)
+    return events
+
+
+class TestJobRefs:
+    """Tests for job ID parsing and encoding."""
+
+    def test_parse(self):
+        refs = parse_job_refs("transcription:t1, analysis:a1,transcription:t1", max_jobs=5)
+        assert refs == [JobRef("transcription", "t1"), JobRef("analysis", "a1")]
+
+    @pytest.mark.parametrize("value", ["", "audio:x", "transcription", "transcription:"])
+    def test_parse_rejects_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_job_refs(value, max_jobs=5)
+
+    def test_parse_rejects_too_many(self):
+        with pytest.raises(ValueError):
+            parse_job_refs("analysis:a,analysis:b", max_jobs=1)
+
+    def test_update_splices_raw_body(self):
+        update = JobUpdate(JobRef("analysis", "a1"), "completed", b'{"id":"a1"}')
+        assert json.loads(update.to_json()) == {
+            "kind": "analysis",
+            "id": "a1",
+            "status": "completed",
+            "body": {"id": "a1"},
+        }
+
+
+class TestJobStream:
+    """Tests for GET /api/jobs/stream."""
+
+    @pytest.fixture(autouse=True)
+    def fast_polling(self, test_settings):
+        test_settings.JOB_POLL_MIN_INTERVAL_SECONDS = 0.01
+        test_settings.JOB_POLL_MAX_INTERVAL_SECONDS = 0.02
+
+    def test_streams_transitions_and_final_payload(self, client, test_settings):
+        """Each status change is pushed once; the terminal event carries the body."""
+        route = respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/t1").mock(
+            side_effect=[
+                Response(200, json={"id": "t1", "status": "pending"}),
+                Response(200, json={"id": "t1", "status": "processing"}),
+                Response(200, json={"id": "t1", "status": "processing"}),
+                Response(200, json={"id": "t1", "status": "completed", "text": "Hello"}),
+            ]
+        )
+
+        response = client.get("/api/jobs/stream?ids=transcription:t1")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _events(response)
+        statuses = [json.loads(e["data"])["status"] for e in events if e["event"] == "job"]
+        assert statuses == ["pending", "processing", "completed"]
+        assert json.loads(events[-2]["data"])["body"]["text"] == "Hello"
+        assert events[-1]["event"] == "done"
+        assert events[-1]["id"] == "completed"
+        assert route.call_count == 4
+
+    def test_last_event_id_skips_seen_statuses(self, client, test_settings):
+        """A reconnecting client should only get transitions it hasn't seen."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/t1").mock(
+            side_effect=[
+                Response(200, json={"id": "t1", "status": "processing"}),
+                Response(200, json={"id": "t1", "status": "completed"}),
+            ]
+        )
+        analysis_route = respx.get(f"{test_settings.CORE_API_URL}/api/v1/analyses/a1").mock(
+            return_value=Response(200, json={"id": "a1", "status": "completed"})
+        )
+
+        response = client.get(
+            "/api/jobs/stream?ids=transcription:t1,analysis:a1",
+            headers={"Last-Event-ID": "processing,completed"},
+        )
+
+        jobs = [json.loads(e["data"]) for e in _events(response) if e["event"] == "job"]
+        assert [(j["kind"], j["status"]) for j in jobs] == [("transcription", "completed")]
+        assert analysis_route.call_count == 0
+
+    def test_missing_job_ends_with_error(self, client, test_settings):
+        """A job Core doesn't know should end with status "error"."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/analyses/missing").mock(
+            return_value=Response(404, json={"detail": "Analysis not found"})
+        )
+
+        response = client.get("/api/jobs/stream?ids=analysis:missing")
+
+        job = json.loads(_events(response)[0]["data"])
+        assert job["status"] == "error"
+        assert job["body"] == {"detail": "Analysis not found"}
+
+    def test_non_json_error_body_is_a_json_string(self, client, test_settings):
+        """A text/HTML error page from Core or a proxy must still yield valid JSON events."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/analyses/missing").mock(
+            return_value=Response(404, text="<html>Not Found</html>", headers={"content-type": "text/html"})
+        )
+
+        response = client.get("/api/jobs/stream?ids=analysis:missing")
+
+        job = json.loads(_events(response)[0]["data"])
+        assert job["status"] == "error"
+        assert job["body"] == "<html>Not Found</html>"
+
+    def test_invalid_ids(self, client):
+        response = client.get("/api/jobs/stream?ids=audio:x")
+        assert response.status_code == 422
+
+
+class TestJobWatchRegistry:
+    """Tests for shared upstream polling."""
+
+    CORE_URL = "http://core-api:8000"
+
+    @pytest.mark.asyncio
+    async def test_watchers_share_one_poll_loop(self):
+        """Many watchers of one job should cause one Core poll per interval, not one each."""
+        client = CoreAPIClient(base_url=self.CORE_URL, coalesce_gets=False)
+        registry = JobWatchRegistry(client, min_interval=0.01, max_interval=0.01)
+        job = JobRef("analysis", "a1")
+        with respx.mock:
+            route = respx.get(f"{self.CORE_URL}/api/v1/analyses/a1").mock(
+                side_effect=[
+                    Response(200, json={"id": "a1", "status": "processing"}),
+                    Response(200, json={"id": "a1", "status": "completed"}),
+                ]
+            )
+            queues = [asyncio.Queue() for _ in range(5)]
+            for queue in queues:
+                registry.subscribe("session-a", "token", job, queue)
+            assert registry.active == 1
+
+            for queue in queues:
+                first = await asyncio.wait_for(queue.get(), timeout=1)
+                second = await asyncio.wait_for(queue.get(), timeout=1)
+                assert (first.status, second.status) == ("processing", "completed")
+
+        assert route.call_count == 2
+        assert registry.active == 0
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_non_json_200_is_retried(self):
+        """A proxy page with a 200 must not kill the poll loop."""
+        client = CoreAPIClient(base_url=self.CORE_URL, coalesce_gets=False)
+        registry = JobWatchRegistry(client, min_interval=0.01, max_interval=0.01)
+        queue = asyncio.Queue()
+        with respx.mock:
+            respx.get(f"{self.CORE_URL}/api/v1/analyses/a1").mock(
+                side_effect=[
+                    Response(200, text="<html>Bad gateway</html>", headers={"content-type": "text/html"}),
+                    Response(200, json={"id": "a1", "status": "completed"}),
+                ]
+            )
+            registry.subscribe("session-a", "token", JobRef("analysis", "a1"), queue)
+
+            update = await asyncio.wait_for(queue.get(), timeout=1)
+
+        assert update.status == "completed"
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_late_watcher_gets_latest_status(self):
+        """A watcher joining a running loop should immediately get the last known status."""
+        client = CoreAPIClient(base_url=self.CORE_URL)
+        registry = JobWatchRegistry(client, min_interval=10, max_interval=10)
+        job = JobRef("transcription", "t1")
+        with respx.mock:
+            respx.get(f"{self.CORE_URL}/api/v1/transcriptions/t1").mock(
+                return_value=Response(200, json={"id": "t1", "status": "processing"})
+            )
+            early = asyncio.Queue()
+            registry.subscribe("session-a", "token", job, early)
+            await asyncio.wait_for(early.get(), timeout=1)
+
+            late = asyncio.Queue()
+            registry.subscribe("session-a", "token", job, late)
+            assert late.get_nowait().status == "processing"
+
+            registry.unsubscribe("session-a", job, early)
+            registry.unsubscribe("session-a", job, late)
+
+        assert registry.active == 0
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_sessions_do_not_share_loops(self):
+        """The same job ID watched by two sessions gets a loop per session token."""
+        client = CoreAPIClient(base_url=self.CORE_URL)
+        registry = JobWatchRegistry(client, min_interval=10, max_interval=10)
+        job = JobRef("transcription", "t1")
+        with respx.mock:
+            respx.get(f"{self.CORE_URL}/api/v1/transcriptions/t1").mock(
+                return_value=Response(200, json={"id": "t1", "status": "processing"})
+            )
+            queue_a, queue_b = asyncio.Queue(), asyncio.Queue()
+            registry.subscribe("session-a", "token-a", job, queue_a)
+            registry.subscribe("session-b", "token-b", job, queue_b)
+            assert registry.active == 2
+            await registry.close()
+
+        assert registry.active == 0
+        await client.close()
+
+
+class TestLongPoll:
+    """Tests for ?wait=N on job status endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def fast_polling(self, test_settings):
+        test_settings.JOB_POLL_MIN_INTERVAL_SECONDS = 0.01
+        test_settings.JOB_POLL_MAX_INTERVAL_SECONDS = 0.02
+
+    def test_wait_returns_on_status_change(self, client, test_settings):
+        """A held request should return as soon as the job finishes."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/t1").mock(
+            side_effect=[
+                Response(200, json={"id": "t1", "status": "processing"}),
+                Response(200, json={"id": "t1", "status": "processing"}),
+                Response(200, json={"id": "t1", "status": "completed", "text": "Hello"}),
+            ]
+        )
+
+        response = client.get("/api/transcriptions/t1?wait=5")
+
+        assert response.status_code == 200
+        assert response.json() == {"id": "t1", "status": "completed", "text": "Hello"}
+
+    def test_wait_times_out_with_current_state(self, client, test_settings):
+        """Without a change, the current state comes back after the wait."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/analyses/a1").mock(
+            return_value=Response(200, json={"id": "a1", "status": "processing"})
+        )
+
+        response = client.get("/api/analyses/a1?wait=0.1")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "processing"
+
+    def test_terminal_job_is_not_held(self, client, test_settings):
+        """A finished job should be returned without waiting or extra polls."""
+        route = respx.get(f"{test_settings.CORE_API_URL}/api/v1/cleaned-entries/c1").mock(
+            return_value=Response(200, json={"id": "c1", "status": "completed"})
+        )
+
+        response = client.get("/api/cleaned-entries/c1?wait=30")
+
+        assert response.json()["status"] == "completed"
+        assert route.call_count == 1
+
+    def test_hold_limit_returns_immediately(self, client, test_settings):
+        """Past LONG_POLL_MAX_HELD, requests are answered without holding."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/analyses/a1").mock(
+            return_value=Response(200, json={"id": "a1", "status": "processing"})
+        )
+        client.app.state.job_watches.max_held = 0
+
+        response = client.get("/api/analyses/a1?wait=30")
+
+        assert response.json()["status"] == "processing"
+
+
+class TestJobTiming:
+    """Tests for learned job durations and poll hints."""
+
+    def test_fit_uses_prior_until_enough_observations(self):
+        fit = LinearFit(5.0, 0.2)
+        fit.add(100.0, 50.0)
+        assert fit.predict(100.0) == pytest.approx(25.0)
+
+    def test_fit_learns_linear_relation(self):
+        fit = LinearFit(5.0, 0.2, decay=1.0)
+        for x in (10.0, 60.0, 120.0, 180.0):
+            fit.add(x, 2.0 + 0.5 * x)
+        assert fit.coefficients == pytest.approx((2.0, 0.5))
+
+    def test_hint_scales_with_audio_length(self):
+        timing = JobTimingModel(min_hint=1.0, max_hint=15.0)
+        timing.submitted("transcription", "short", 10.0)
+        timing.submitted("transcription", "long", 180.0)
+        assert timing.poll_after("short") < timing.poll_after("long")
+        assert timing.poll_after("long") == 15.0
+
+    def test_unknown_and_overdue_jobs(self, monkeypatch):
+        timing = JobTimingModel(min_hint=1.0, default_hint=2.0)
+        assert timing.poll_after("unknown") == 2.0
+
+        timing.submitted("transcription", "t1", 10.0)
+        now = time.monotonic()
+        monkeypatch.setattr("app.job_timing.time.monotonic", lambda: now + 600)
+        assert timing.poll_after("t1") == 1.0
+
+    def test_follow_up_jobs_inherit_audio_length(self):
+        timing = JobTimingModel()
+        timing.submitted("transcription", "t1", 120.0)
+        timing.observed("t1", "completed")
+        timing.submitted("cleanup", "c1", parent_id="t1")
+        assert timing.expected_remaining("c1") is not None
+
+    def test_completion_trains_model(self):
+        timing = JobTimingModel()
+        for i in range(3):
+            timing.submitted("analysis", f"a{i}", 60.0)
+            timing.observed(f"a{i}", "completed")
+        # Instant completions pull the estimate far below the prior
+        assert timing.fits["analysis"].predict(60.0) < 1.0
+        assert timing.expected_remaining("a0") is None
+
+    def test_status_response_carries_hints(self, client, test_settings):
+        """Non-terminal job GETs get Retry-After and X-Poll-After."""
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/t1").mock(
+            side_effect=[
+                Response(200, json={"id": "t1", "status": "processing"}),
+                Response(200, json={"id": "t1", "status": "completed"}),
+            ]
+        )
+        client.app.state.job_timing.submitted("transcription", "t1", 180.0)
+
+        processing = client.get("/api/transcriptions/t1")
+        completed = client.get("/api/transcriptions/t1")
+
+        assert processing.headers["Retry-After"] == "15"
+        assert processing.headers["X-Poll-After"] == "15.0"
+        assert "Retry-After" not in completed.headers
+        assert client.app.state.job_timing.fits["transcription"].count == 1
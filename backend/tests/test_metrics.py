@@ -0,0 +1,143 @@
+"""Tests for Core API call metrics."""
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from app.core_client import CoreAPIClient, CoreAPIError
+from app.metrics import CoreMetrics, LatencyHistogram, normalize_path, status_class
+
+CORE_URL = "http://core-api:8000"
+
+
+class TestNormalizePath:
+    """Tests for path template normalisation."""
+
+    def test_strips_ids(self):
+        assert normalize_path("/api/v1/transcriptions/trans-123") == "/api/v1/transcriptions/{id}"
+        assert (
+            normalize_path("/api/v1/cleaned-entries/9f2c4b8a-1d3e-4a6b-8c7d-5e0f1a2b3c4d/analyses")
+            == "/api/v1/cleaned-entries/{id}/analyses"
+        )
+
+    def test_keeps_static_paths(self):
+        assert normalize_path("/api/v1/entries") == "/api/v1/entries"
+        assert normalize_path("/api/v1/auth/login") == "/api/v1/auth/login"
+
+    def test_drops_query_string(self):
+        assert normalize_path("/api/v1/entries?limit=100") == "/api/v1/entries"
+
+    def test_status_class(self):
+        assert status_class(200) == "2xx"
+        assert status_class(503) == "5xx"
+        assert status_class(None) == "error"
+
+
+class TestLatencyHistogram:
+    """Tests for the HDR-style histogram."""
+
+    def test_percentiles_within_relative_error(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        for p, expected in ((50, 0.5), (95, 0.95), (99, 0.99)):
+            assert histogram.percentile(p) == pytest.approx(expected, rel=0.07)
+
+    def test_max_is_exact(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.010)
+        histogram.record(1.234567)
+        assert histogram.percentile(100) == pytest.approx(1.234567)
+
+    def test_empty_histogram(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) is None
+        assert histogram.summary()["count"] == 0
+
+
+class TestCoreMetrics:
+    """Tests for the metrics registry."""
+
+    def test_snapshot_sorted_by_p99(self):
+        metrics = CoreMetrics()
+        metrics.record("GET", "/api/v1/entries", 200, 0.010)
+        metrics.record("GET", "/api/v1/transcriptions/a", 200, 0.500)
+        metrics.record("GET", "/api/v1/transcriptions/b", 404, 0.400)
+
+        snapshot = metrics.snapshot()
+
+        slowest = snapshot["endpoints"][0]
+        assert slowest["path"] == "/api/v1/transcriptions/{id}"
+        assert slowest["latency"]["count"] == 2
+        assert slowest["status"] == {"2xx": 1, "4xx": 1}
+
+
+class TestClientInstrumentation:
+    """Every upstream call should be recorded."""
+
+    @pytest.mark.asyncio
+    async def test_auth_and_requests_are_recorded(self):
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            respx.post(f"{CORE_URL}/api/v1/auth/login").mock(
+                return_value=Response(200, json={"access_token": "a", "refresh_token": "r"})
+            )
+            respx.get(f"{CORE_URL}/api/v1/transcriptions/trans-123").mock(
+                return_value=Response(200, content=b'{"id":"trans-123"}')
+            )
+            await client.login("user@test.example", "password123")
+            await client.request("GET", "/api/v1/transcriptions/trans-123", "a")
+
+        endpoints = {(e["method"], e["path"]): e for e in client.metrics.snapshot()["endpoints"]}
+        login = endpoints[("POST", "/api/v1/auth/login")]
+        assert login["bytes_out"] > 0
+        transcription = endpoints[("GET", "/api/v1/transcriptions/{id}")]
+        assert transcription["bytes_in"] == len(b'{"id":"trans-123"}')
+        assert transcription["status"] == {"2xx": 1}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_errors_are_recorded(self):
+        client = CoreAPIClient(base_url=CORE_URL)
+        with respx.mock:
+            respx.post(f"{CORE_URL}/api/v1/auth/register").mock(
+                side_effect=httpx.ConnectError("Connection refused")
+            )
+            with pytest.raises(CoreAPIError):
+                await client.register("user@test.example", "password123")
+
+        (endpoint,) = client.metrics.snapshot()["endpoints"]
+        assert endpoint["status"] == {"error": 1}
+        await client.close()
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics/core."""
+
+    def test_exposes_raw_options_call(self, client, test_settings):
+        test_settings.ENVIRONMENT = "development"
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/options").mock(
+            return_value=Response(200, json={"models": []})
+        )
+
+        client.get("/api/options")
+        response = client.get("/metrics/core")
+
+        assert response.status_code == 200
+        paths = {e["path"] for e in response.json()["endpoints"]}
+        assert "/api/v1/options" in paths
+
+    def test_token_required_when_configured(self, client, test_settings):
+        test_settings.METRICS_TOKEN = "secret"
+
+        assert client.get("/metrics/core").status_code == 401
+        response = client.get("/metrics/core", headers={"Authorization": "Bearer secret"})
+        assert response.status_code == 200
+
+    def test_disabled_without_token_outside_development(self, client, test_settings):
+        test_settings.METRICS_TOKEN = ""
+        test_settings.ENVIRONMENT = "production"
+
+        assert client.get("/metrics/core").status_code == 404
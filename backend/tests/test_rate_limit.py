@@ -41,6 +41,8 @@ def rate_limit_settings():
         RATE_LIMIT_LLM_DAY=30,
         RATE_LIMIT_LLM_IP_DAY=40,
         RATE_LIMIT_LLM_GLOBAL_DAY=50,
+        # These tests upload the same file repeatedly to count slots
+        UPLOAD_DEDUP_ENABLED=False,
         DATABASE_URL="sqlite://",
     )
 
@@ -183,7 +185,7 @@ def mock_analyze_success(settings):
 
 def do_transcribe(client):
     """Helper to make a transcribe request."""
-    files = {"file": ("test.mp3", io.BytesIO(b"fake audio"), "audio/mpeg")}
+    files = {"file": ("test.mp3", io.BytesIO(b"ID3\x03\x00\x00\x00\x00\x00\x00fake audio"), "audio/mpeg")}
     return client.post("/api/transcribe", files=files)
 
 
@@ -45,7 +45,7 @@ class TestSessionCreation:
                 })
             )
 
-            session = asyncio.get_event_loop().run_until_complete(
+            session = asyncio.run(
                 _create_anonymous_session(
                     core_api=mock_core_api_client,
                     db=test_db,
@@ -91,7 +91,7 @@ class TestSessionCreation:
             )
 
             now = datetime.utcnow()
-            session = asyncio.get_event_loop().run_until_complete(
+            session = asyncio.run(
                 _create_anonymous_session(
                     core_api=mock_core_api_client,
                     db=test_db,
@@ -136,7 +136,7 @@ class TestTokenRefresh:
                 })
             )
 
-            updated_session = asyncio.get_event_loop().run_until_complete(
+            updated_session = asyncio.run(
                 _refresh_session_tokens(
                     session=session,
                     core_api=mock_core_api_client,
@@ -170,7 +170,7 @@ class TestTokenRefresh:
             )
 
             with pytest.raises(HTTPException) as exc_info:
-                asyncio.get_event_loop().run_until_complete(
+                asyncio.run(
                     _refresh_session_tokens(
                         session=session,
                         core_api=mock_core_api_client,
@@ -195,7 +195,7 @@ class TestCoreAPIErrors:
             )
 
             with pytest.raises(HTTPException) as exc_info:
-                asyncio.get_event_loop().run_until_complete(
+                asyncio.run(
                     _create_anonymous_session(
                         core_api=mock_core_api_client,
                         db=test_db,
@@ -214,7 +214,7 @@ class TestCoreAPIErrors:
             )
 
             with pytest.raises(HTTPException) as exc_info:
-                asyncio.get_event_loop().run_until_complete(
+                asyncio.run(
                     _create_anonymous_session(
                         core_api=mock_core_api_client,
                         db=test_db,
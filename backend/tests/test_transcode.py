@@ -0,0 +1,153 @@
+"""Tests for re-encoding uploads to Opus before forwarding them to Core."""
+
+import io
+import shutil
+
+import pytest
+import respx
+from httpx import Response
+from python_multipart import MultipartParser
+
+from app.transcode import AudioTranscoder, opus_filename
+from app.upload import NamedSpooledTemporaryFile
+from app.utils.multipart import multipart_body
+from tests.test_audio_validation import create_wav_bytes
+
+FAKE_OPUS = b"OggS fake opus"
+
+
+def fake_ffmpeg(tmp_path, script: str) -> str:
+    """An executable standing in for ffmpeg."""
+    path = tmp_path / "ffmpeg"
+    path.write_text(f"#!/bin/sh\n{script}\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def upload(client, wav: bytes, filename: str = "a.wav"):
+    files = {"file": (filename, io.BytesIO(wav), "audio/wav")}
+    return client.post("/api/transcribe", files=files, data={"language": "en"})
+
+
+@pytest.fixture
+def core_upload(test_settings):
+    return respx.post(f"{test_settings.CORE_API_URL}/api/v1/upload-transcribe-cleanup").mock(
+        return_value=Response(202, json={"entry_id": "entry-1", "transcription_id": "trans-1"})
+    )
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestMultipartBody:
+    """Tests for the streamed multipart body."""
+
+    @pytest.mark.asyncio
+    async def test_parses_back(self):
+        raw = b"".join([chunk async for chunk in multipart_body(
+            "test-boundary", {"language": "en"}, "file", 'my "clip".opus', "audio/ogg", _chunks(b"ab", b"cd")
+        )])
+
+        parts = []
+        parser = MultipartParser("test-boundary", {
+            "on_part_begin": lambda: parts.append(b""),
+            "on_part_data": lambda data, start, end: parts.__setitem__(-1, parts[-1] + data[start:end]),
+        })
+        parser.write(raw)
+        parser.finalize()
+
+        assert parts == [b"en", b"abcd"]
+        assert b'filename="my %22clip%22.opus"' in raw
+
+    def test_opus_filename(self):
+        assert opus_filename("recording.wav") == "recording.opus"
+        assert opus_filename(None) == "upload.opus"
+
+
+class TestTranscribeTranscoding:
+    """Endpoint tests for the optional ffmpeg stage."""
+
+    def test_streams_opus_to_core(self, client, core_upload, tmp_path):
+        client.app.state.audio_transcoder = AudioTranscoder(
+            ffmpeg=fake_ffmpeg(tmp_path, f"cat > /dev/null\nprintf '{FAKE_OPUS.decode()}'"), min_bytes=0
+        )
+        wav = create_wav_bytes(30.0)  # Spooled to disk, so ffmpeg gets a path
+
+        response = upload(client, wav)
+
+        assert response.status_code == 202
+        assert response.headers["x-transcode-bytes-saved"] == str(len(wav) - len(FAKE_OPUS))
+        sent = core_upload.calls.last.request.content
+        assert b'filename="a.opus"' in sent
+        assert b"Content-Type: audio/ogg\r\n\r\n" + FAKE_OPUS + b"\r\n" in sent
+        assert b'name="language"\r\n\r\nen' in sent
+        counters = client.app.state.core_api.metrics.snapshot()["counters"]
+        assert counters["transcode_bytes_saved"] == len(wav) - len(FAKE_OPUS)
+
+    def test_small_upload_is_fed_through_stdin(self, client, core_upload, tmp_path):
+        # Echo stdin back, so the output proves what ffmpeg was fed
+        client.app.state.audio_transcoder = AudioTranscoder(ffmpeg=fake_ffmpeg(tmp_path, "cat"), min_bytes=0)
+        wav = create_wav_bytes(1.0)
+
+        response = upload(client, wav)
+
+        assert response.status_code == 202
+        assert wav in core_upload.calls.last.request.content
+
+    def test_no_output_forwards_original(self, client, core_upload, tmp_path):
+        client.app.state.audio_transcoder = AudioTranscoder(
+            ffmpeg=fake_ffmpeg(tmp_path, "echo 'Invalid data' >&2\nexit 1"), min_bytes=0
+        )
+        wav = create_wav_bytes(1.0)
+
+        response = upload(client, wav)
+
+        assert response.status_code == 202
+        assert "x-transcode-bytes-saved" not in response.headers
+        sent = core_upload.calls.last.request.content
+        assert b'filename="a.wav"' in sent
+        assert wav in sent
+
+    def test_failure_mid_stream_returns_502(self, client, core_upload, tmp_path):
+        client.app.state.audio_transcoder = AudioTranscoder(
+            ffmpeg=fake_ffmpeg(tmp_path, "cat > /dev/null\nprintf 'OggS partial'\nexit 1"), min_bytes=0
+        )
+
+        response = upload(client, create_wav_bytes(1.0))
+
+        assert response.status_code == 502
+
+    def test_compressed_formats_are_forwarded(self, client, core_upload, tmp_path):
+        client.app.state.audio_transcoder = AudioTranscoder(ffmpeg=fake_ffmpeg(tmp_path, "exit 1"), min_bytes=0)
+        mp3 = b"ID3\x03\x00\x00\x00\x00\x00\x00fake audio"
+
+        files = {"file": ("a.mp3", io.BytesIO(mp3), "audio/mpeg")}
+        response = client.post("/api/transcribe", files=files)
+
+        assert response.status_code == 202
+        assert mp3 in core_upload.calls.last.request.content
+
+    def test_missing_ffmpeg(self):
+        transcoder = AudioTranscoder(ffmpeg="definitely-not-ffmpeg")
+
+        assert not transcoder.should_transcode("wav", 10**9)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+class TestRealFfmpeg:
+    """Transcoding with the real ffmpeg, when it is installed."""
+
+    @pytest.mark.asyncio
+    async def test_wav_to_opus(self):
+        wav = create_wav_bytes(20.0, sample_rate=44100)
+        spooled = NamedSpooledTemporaryFile(max_size=1024)
+        spooled.write(wav)
+
+        transcode = await AudioTranscoder(min_bytes=0).start(spooled, "a.wav", len(wav))
+        opus = b"".join([chunk async for chunk in transcode.chunks()])
+
+        assert opus.startswith(b"OggS")
+        assert b"OpusHead" in opus[:100]
+        assert transcode.saved_bytes > len(wav) * 0.9
@@ -0,0 +1,140 @@
+"""Tests for the streaming upload receiver."""
+
+import io
+
+import pytest
+import respx
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from httpx import Response
+from starlette.datastructures import Headers
+
+from app.upload import receive_upload
+from app.utils.audio import AudioValidationError
+from tests.test_audio_validation import create_wav_bytes
+
+BOUNDARY = "test-boundary"
+
+
+def multipart_body(fields: dict[str, str], file: bytes | None, filename: str = "a.wav") -> bytes:
+    parts = []
+    if file is not None:
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            "Content-Type: audio/wav\r\n\r\n".encode() + file + b"\r\n"
+        )
+    for name, value in fields.items():
+        parts.append(f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+class ChunkedBody:
+    """Async body stream that records how much of it was consumed."""
+
+    def __init__(self, body: bytes, chunk_size: int = 16 * 1024):
+        self.chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+        self.consumed = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+
+def headers(content_length: int | None = None) -> Headers:
+    raw = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+    if content_length is not None:
+        raw["content-length"] = str(content_length)
+    return Headers(raw)
+
+
+class TestReceiveUpload:
+    """Tests for receive_upload limits and parsing."""
+
+    @pytest.mark.asyncio
+    async def test_receives_file_and_fields(self):
+        wav = create_wav_bytes(10.0)
+        body = ChunkedBody(multipart_body({"language": "en"}, wav))
+
+        upload = await receive_upload(headers(), body, max_bytes=10**6, max_duration_seconds=180)
+
+        assert upload.fields == {"language": "en"}
+        assert upload.file.filename == "a.wav"
+        assert upload.file.file.read() == wav
+        assert upload.duration == pytest.approx(10.0)
+        await upload.close()
+
+    @pytest.mark.asyncio
+    async def test_content_length_over_limit_reads_nothing(self):
+        body = ChunkedBody(multipart_body({}, b"x" * 100_000))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await receive_upload(headers(10**9), body, max_bytes=1000, max_duration_seconds=180)
+
+        assert exc_info.value.status_code == 413
+        assert body.consumed == 0
+
+    @pytest.mark.asyncio
+    async def test_stops_reading_past_size_limit(self):
+        """Without Content-Length, the limit trips mid-stream."""
+        body = ChunkedBody(multipart_body({}, b"ID3" + b"\x00" * 1_000_000))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await receive_upload(headers(), body, max_bytes=100_000, max_duration_seconds=180)
+
+        assert exc_info.value.status_code == 413
+        assert body.consumed < len(body.chunks) / 2
+
+    @pytest.mark.asyncio
+    async def test_stops_reading_when_header_shows_too_long(self):
+        """An over-long WAV is rejected from its first 64 KB."""
+        body = ChunkedBody(multipart_body({}, create_wav_bytes(600.0)))
+
+        with pytest.raises(AudioValidationError):
+            await receive_upload(headers(), body, max_bytes=10**8, max_duration_seconds=180)
+
+        assert body.consumed <= 6
+        assert len(body.chunks) > 500
+
+    @pytest.mark.asyncio
+    async def test_missing_file(self):
+        body = ChunkedBody(multipart_body({"language": "en"}, None))
+
+        with pytest.raises(RequestValidationError):
+            await receive_upload(headers(), body, max_bytes=1000, max_duration_seconds=180)
+
+
+class TestTranscribeUploadLimits:
+    """Endpoint tests for upload limits on POST /api/transcribe."""
+
+    def test_oversized_upload_returns_413(self, client, test_settings):
+        test_settings.MAX_UPLOAD_BYTES = 1000
+        route = respx.post(f"{test_settings.CORE_API_URL}/api/v1/upload-transcribe-cleanup")
+
+        files = {"file": ("a.wav", io.BytesIO(b"x" * 200_000), "audio/wav")}
+        response = client.post("/api/transcribe", files=files)
+
+        assert response.status_code == 413
+        assert not route.called
+
+    def test_invalid_form_field_returns_422(self, client):
+        files = {"file": ("a.wav", io.BytesIO(create_wav_bytes(1.0)), "audio/wav")}
+        response = client.post("/api/transcribe", files=files, data={"speaker_count": "two"})
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "speaker_count"]
+
+    def test_form_fields_are_forwarded(self, client, test_settings):
+        route = respx.post(f"{test_settings.CORE_API_URL}/api/v1/upload-transcribe-cleanup").mock(
+            return_value=Response(202, json={"entry_id": "entry-1"})
+        )
+
+        files = {"file": ("a.wav", io.BytesIO(create_wav_bytes(1.0)), "audio/wav")}
+        data = {"language": "en", "enable_analysis": "false", "llm_model": ""}
+        response = client.post("/api/transcribe", files=files, data=data)
+
+        assert response.status_code == 202
+        sent = route.calls.last.request.content
+        assert b'name="language"\r\n\r\nen' in sent
+        assert b"analysis_profile" not in sent
+        assert b"llm_model" not in sent
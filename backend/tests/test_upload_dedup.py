@@ -0,0 +1,168 @@
+"""Tests for per-session upload deduplication."""
+
+import hashlib
+import io
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+from sqlalchemy.orm import sessionmaker
+
+from app.models import RateLimitEntry
+from app.session import SESSION_COOKIE_NAME
+from app.upload import receive_upload
+from app.upload_dedup import lookup_upload, options_hash
+from tests.test_audio_validation import create_wav_bytes
+from tests.test_upload import ChunkedBody, headers, multipart_body
+
+CREATED = {
+    "entry_id": "entry-1",
+    "transcription_id": "trans-1",
+    "cleanup_id": "cleanup-1",
+    "analysis_id": "analysis-1",
+    "transcription_status": "pending",
+}
+
+
+@pytest.fixture
+def core(test_settings):
+    """Core upload and transcription status routes."""
+    upload = respx.post(f"{test_settings.CORE_API_URL}/api/v1/upload-transcribe-cleanup").mock(
+        return_value=Response(202, json=CREATED)
+    )
+    status = respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/trans-1").mock(
+        return_value=Response(200, json={"id": "trans-1", "status": "processing"})
+    )
+    return upload, status
+
+
+def upload(client, data=None, wav=None):
+    files = {"file": ("a.wav", io.BytesIO(wav or create_wav_bytes(1.0)), "audio/wav")}
+    return client.post("/api/transcribe", files=files, data=data or {})
+
+
+def committed_rate_limit_entries(test_engine) -> int:
+    db = sessionmaker(bind=test_engine)()
+    try:
+        return db.query(RateLimitEntry).filter_by(action="transcribe").count()
+    finally:
+        db.close()
+
+
+class TestUploadHash:
+    """Tests for hashing uploads while they stream in."""
+
+    @pytest.mark.asyncio
+    async def test_hash_covers_file_bytes_only(self):
+        wav = create_wav_bytes(2.0)
+        first = await receive_upload(
+            headers(), ChunkedBody(multipart_body({"language": "en"}, wav)), max_bytes=10**6, max_duration_seconds=180
+        )
+        second = await receive_upload(
+            headers(), ChunkedBody(multipart_body({}, wav, filename="b.wav"), chunk_size=1000),
+            max_bytes=10**6, max_duration_seconds=180,
+        )
+
+        assert first.content_hash == hashlib.blake2b(wav).hexdigest()
+        assert second.content_hash == first.content_hash
+        await first.close()
+        await second.close()
+
+    def test_options_hash_is_order_independent(self):
+        assert options_hash({"a": "1", "b": "2"}) == options_hash({"b": "2", "a": "1"})
+        assert options_hash({"a": "1"}) != options_hash({"a": "2"})
+
+
+class TestTranscribeDedup:
+    """Endpoint tests for duplicate uploads."""
+
+    def test_duplicate_returns_existing_jobs(self, client, core, test_engine):
+        core_upload, core_status = core
+
+        first = upload(client)
+        second = upload(client)
+
+        assert first.status_code == 202
+        assert second.status_code == 200
+        assert second.json() == CREATED
+        assert core_upload.call_count == 1
+        assert core_status.called
+        assert client.app.state.core_api.metrics.snapshot()["counters"]["dedup_hits"] == 1
+        assert committed_rate_limit_entries(test_engine) == 1
+
+    def test_different_options_upload_again(self, client, core):
+        core_upload, _ = core
+
+        upload(client, data={"language": "sl"})
+        response = upload(client, data={"language": "en"})
+
+        assert response.status_code == 202
+        assert core_upload.call_count == 2
+
+    def test_different_file_uploads_again(self, client, core):
+        core_upload, _ = core
+
+        upload(client, wav=create_wav_bytes(1.0))
+        response = upload(client, wav=create_wav_bytes(2.0))
+
+        assert response.status_code == 202
+        assert core_upload.call_count == 2
+
+    def test_failed_transcription_is_retried(self, client, core, test_engine):
+        core_upload, core_status = core
+        core_status.mock(return_value=Response(200, json={"id": "trans-1", "status": "failed"}))
+
+        upload(client)
+        response = upload(client)
+
+        assert response.status_code == 202
+        assert core_upload.call_count == 2
+        assert committed_rate_limit_entries(test_engine) == 2
+
+    def test_deleted_entry_is_forgotten(self, client, core, test_settings, test_db):
+        core_upload, _ = core
+        respx.delete(f"{test_settings.CORE_API_URL}/api/v1/entries/entry-1").mock(return_value=Response(204))
+
+        upload(client)
+        client.delete("/api/entries/entry-1")
+        response = upload(client)
+
+        assert response.status_code == 202
+        assert core_upload.call_count == 2
+
+    def test_disabled(self, client, core, test_settings):
+        core_upload, _ = core
+        test_settings.UPLOAD_DEDUP_ENABLED = False
+
+        upload(client)
+        response = upload(client)
+
+        assert response.status_code == 202
+        assert core_upload.call_count == 2
+
+    def test_rows_are_per_session(self, client, core, test_db):
+        upload(client)
+        session_id = client.cookies.get(SESSION_COOKIE_NAME)
+        options = options_hash({
+            "language": "sl",
+            "enable_diarization": "true",
+            "speaker_count": "2",
+            "cleanup_type": "clean",
+            "cleanup_temperature": "0.0",
+            "analysis_profile": "generic-summary",
+        })
+        content_hash = hashlib.blake2b(create_wav_bytes(1.0)).hexdigest()
+
+        assert lookup_upload(test_db, session_id, content_hash, options).entry_id == "entry-1"
+        assert lookup_upload(test_db, "other-session", content_hash, options) is None
+
+    def test_unreachable_core_uploads_again(self, client, core):
+        core_upload, core_status = core
+        upload(client)
+        core_status.side_effect = httpx.ConnectError("down")
+
+        response = upload(client)
+
+        assert response.status_code == 202
+        assert core_upload.call_count == 2
@@ -0,0 +1,152 @@
+"""Tests for forwarding uploads to Core while they are still arriving."""
+
+import io
+
+import httpx
+import pytest
+import respx
+from fastapi import HTTPException
+from httpx import Response
+
+from app.upload import receive_upload
+from app.upload_tee import UploadTee
+from app.utils.audio import AudioValidationError
+from tests.test_audio_validation import create_wav_bytes
+from tests.test_upload import ChunkedBody, headers, multipart_body
+
+CREATED = {"entry_id": "entry-1", "transcription_id": "trans-1"}
+
+
+class FakeCore:
+    """Stands in for CoreAPIClient, reading the streamed body like httpx would."""
+
+    def __init__(self, body: ChunkedBody | None = None):
+        self.body = body
+        self.received = b""
+        self.consumed_at_first_chunk = None
+        self.completed = False
+
+    async def request(self, method, path, token, content, headers):
+        async for chunk in content:
+            if self.consumed_at_first_chunk is None and self.received and self.body is not None:
+                self.consumed_at_first_chunk = self.body.consumed
+            self.received += chunk
+        self.completed = True
+        return Response(202, json=CREATED)
+
+
+@pytest.fixture
+def core_upload(test_settings):
+    test_settings.UPLOAD_STREAM_THROUGH_ENABLED = True
+    return respx.post(f"{test_settings.CORE_API_URL}/api/v1/upload-transcribe-cleanup").mock(
+        return_value=Response(202, json=CREATED)
+    )
+
+
+def upload(client, wav: bytes, data=None):
+    files = {"file": ("a.wav", io.BytesIO(wav), "audio/wav")}
+    return client.post("/api/transcribe", files=files, data=data or {})
+
+
+class TestUploadTee:
+    """Tests for UploadTee with receive_upload."""
+
+    @pytest.mark.asyncio
+    async def test_forwards_while_receiving(self):
+        wav = create_wav_bytes(10.0)
+        body = ChunkedBody(multipart_body({"language": "en"}, wav))
+        core = FakeCore(body)
+        tee = UploadTee(core, "/upload", "token")
+
+        upload = await receive_upload(headers(), body, max_bytes=10**6, max_duration_seconds=180, sink=tee)
+        response = await tee.finish(upload.fields)
+        await upload.close()
+
+        assert response.status_code == 202
+        assert core.consumed_at_first_chunk < len(body.chunks)
+        assert tee.bytes_sent == len(wav)
+        assert wav in core.received
+        assert core.received.index(wav) < core.received.index(b'name="language"\r\n\r\nen')
+
+    @pytest.mark.asyncio
+    async def test_limit_exceeded_mid_stream_aborts(self):
+        body = ChunkedBody(multipart_body({}, create_wav_bytes(10.0)))
+        core = FakeCore()
+        tee = UploadTee(core, "/upload", "token")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await receive_upload(headers(), body, max_bytes=100_000, max_duration_seconds=180, sink=tee)
+        await tee.abort()
+
+        assert exc_info.value.status_code == 413
+        assert tee.started
+        assert core.received
+        assert not core.completed
+
+    @pytest.mark.asyncio
+    async def test_nothing_sent_for_rejected_format(self):
+        body = ChunkedBody(multipart_body({}, b"not audio at all" * 100, filename="a.txt"))
+        core = FakeCore()
+        tee = UploadTee(core, "/upload", "token")
+
+        with pytest.raises(AudioValidationError):
+            await receive_upload(headers(), body, max_bytes=10**6, max_duration_seconds=180, sink=tee)
+        await tee.abort()
+
+        assert not tee.started
+
+    @pytest.mark.asyncio
+    async def test_core_failure_is_reported_at_finish(self):
+        class DownCore:
+            async def request(self, method, path, token, content, headers):
+                raise httpx.ConnectError("down")
+
+        body = ChunkedBody(multipart_body({}, create_wav_bytes(10.0)))
+        tee = UploadTee(DownCore(), "/upload", "token")
+
+        upload = await receive_upload(headers(), body, max_bytes=10**6, max_duration_seconds=180, sink=tee)
+
+        with pytest.raises(httpx.ConnectError):
+            await tee.finish(upload.fields)
+        await upload.close()
+
+
+class TestTranscribeStreamThrough:
+    """Endpoint tests with UPLOAD_STREAM_THROUGH_ENABLED."""
+
+    def test_forwards_file_and_fields(self, client, core_upload):
+        wav = create_wav_bytes(5.0)
+
+        response = upload(client, wav, data={"language": "en"})
+
+        assert response.status_code == 202
+        sent = core_upload.calls.last.request.content
+        assert b'filename="a.wav"' in sent
+        assert wav in sent
+        assert b'name="language"\r\n\r\nen' in sent
+
+    def test_too_large_is_not_completed(self, client, core_upload, test_settings):
+        test_settings.MAX_UPLOAD_BYTES = 100_000
+
+        response = upload(client, create_wav_bytes(10.0))
+
+        assert response.status_code == 413
+        assert not core_upload.called
+
+    def test_invalid_field_is_not_completed(self, client, core_upload):
+        response = upload(client, create_wav_bytes(1.0), data={"speaker_count": "many"})
+
+        assert response.status_code == 422
+        assert not core_upload.called
+
+    def test_duplicate_is_not_completed(self, client, core_upload, test_settings):
+        respx.get(f"{test_settings.CORE_API_URL}/api/v1/transcriptions/trans-1").mock(
+            return_value=Response(200, json={"id": "trans-1", "status": "processing"})
+        )
+        wav = create_wav_bytes(1.0)
+
+        upload(client, wav)
+        response = upload(client, wav)
+
+        assert response.status_code == 200
+        assert core_upload.call_count == 1